@@ -2,7 +2,7 @@
 AlgoPy: A library for many different algorithms and other utilities.
 """
 
-from . import find, log, validate, convert, faker, sort, binary_tree
+from . import find, log, validate, convert, faker, sort, binary_tree, heap
 
 find = find.Find
 log = log.Log
@@ -11,3 +11,4 @@ convert = convert.Convert
 faker = faker.Faker
 sort = sort.Sort
 bt = binary_tree.BinaryTree
+heap = heap.Heap
@@ -0,0 +1,315 @@
+import argparse
+import csv
+import json
+import math
+import random
+import sys
+import time
+from typing import Callable
+
+from .sort import Sort
+
+
+class Bench:
+    """
+    Benchmarks every Sort algorithm over generated data distributions.
+
+    Run it from the command line with `python -m algopy.bench sort`.
+    """
+
+    DISTRIBUTIONS = ("random", "sorted", "reversed", "sawtooth", "few_unique", "organ_pipe", "zipf")
+    SIZES = (10, 100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+    FIELDS = (
+        "algorithm",
+        "distribution",
+        "size",
+        "status",
+        "seconds",
+        "ops_per_sec",
+        "comparisons",
+        "writes",
+        "peak_memory",
+        "correct",
+    )
+    ALGORITHMS = (
+        "BubbleSort.default",
+        "BubbleSort.with_flag",
+        "QuickSort.default",
+        "QuickSort.dual_pivot",
+        "QuickSort.iterative",
+        "MergeSort.default",
+        "MergeSort.way3",
+        "MergeSort.bottom_up",
+        "BogoSort.default",
+        "BogoSort.duo",
+        "selection_sort",
+        "insertion_sort",
+        "heap_sort",
+        "radix_sort",
+        "counting_sort",
+        "bucket_sort",
+        "sample_sort",
+        "shell_sort",
+        "cocktail_sort",
+        "comb_sort",
+        "gnome_sort",
+        "pancake_sort",
+        "stooge_sort",
+        "cycle_sort",
+        "library_sort",
+        "strand_sort",
+        "tim_sort",
+        "block_sort",
+        "tournament_sort",
+        "intro_sort",
+        "un_shuffle_sort",
+        "sleep_sort",
+        "stupid_sort",
+        "slow_sort",
+        "odd_even_sort",
+        "bingo_sort",
+        "pigeonhole_sort",
+        "tag_sort",
+        "auto",
+        "parallel",
+        "external",
+    )
+    # Algorithms whose running time explodes (or depends on the values) are capped regardless of the budget.
+    MAX_SIZE = {
+        "BogoSort.default": 8,
+        "BogoSort.duo": 8,
+        "stooge_sort": 300,
+        "slow_sort": 64,
+        "sleep_sort": 0,
+    }
+
+    @staticmethod
+    def generate(distribution: str, n: int, seed: int = 0) -> list[int]:
+        """
+        Generates a list of non-negative integers following a named distribution.
+
+        Args:
+            distribution (str): One of Bench.DISTRIBUTIONS.
+            n (int): The length of the list.
+            seed (int): The seed of the random generator.
+
+        Returns:
+            list[int]: The generated list.
+
+        Raises:
+            ValueError: If the distribution is unknown.
+        """
+        rng = random.Random(seed)
+        if distribution == "random":
+            return [rng.randrange(max(n, 1)) for _ in range(n)]
+        if distribution == "sorted":
+            return list(range(n))
+        if distribution == "reversed":
+            return list(range(n, 0, -1))
+        if distribution == "sawtooth":
+            tooth = max(1, math.isqrt(n))
+            return [i % tooth for i in range(n)]
+        if distribution == "few_unique":
+            return [rng.randrange(8) for _ in range(n)]
+        if distribution == "organ_pipe":
+            half = n // 2
+            return list(range(half)) + list(range(n - half, 0, -1))
+        if distribution == "zipf":
+            weights = [1 / k ** 1.2 for k in range(1, max(n, 1) + 1)]
+            return rng.choices(range(max(n, 1)), weights=weights, k=n)
+        raise ValueError(f"Unknown distribution: {distribution}")
+
+    @staticmethod
+    def algorithm(name: str) -> Callable[[list], list]:
+        """
+        Returns a one-argument callable running the named Sort algorithm.
+
+        Args:
+            name (str): One of Bench.ALGORITHMS.
+
+        Returns:
+            Callable[[list], list]: A function taking the list to sort and returning the result.
+        """
+        if name == "QuickSort.dual_pivot":
+            return lambda arr: Sort.QuickSort.dual_pivot(arr, 0, len(arr) - 1)
+        if name == "external":
+            return lambda arr: list(Sort.external(arr))
+        return Sort._resolve(name)
+
+    @staticmethod
+    def _measure(func: Callable[[list], list], data: list[int]) -> dict:
+        """
+        Counts the comparisons, writes and peak memory of one run of an algorithm with Sort.Stats.
+
+        Algorithms doing arithmetic on the elements (counting, radix, bucket sort...) cannot run on
+        tracked elements and report None for comparisons and writes.
+
+        Args:
+            func (Callable[[list], list]): The algorithm.
+            data (list[int]): The input, left untouched.
+
+        Returns:
+            dict: The comparisons, writes and peak_memory (in bytes) of the run.
+        """
+        stats = Sort.Stats(depth=False)
+        stats.run(func, data[:])
+        return {"comparisons": stats.comparisons, "writes": stats.writes, "peak_memory": stats.memory}
+
+    @staticmethod
+    def _predict(runs: list[tuple[int, float]], n: int) -> float:
+        """
+        Predicts the running time at size n from the previous runs of the same algorithm.
+
+        The growth exponent is measured between the last two sizes, clamped between 1 (linear) and
+        3 so that timer noise on tiny inputs cannot make it absurd; with a single run it is 1.
+
+        Args:
+            runs (list[tuple[int, float]]): The (size, seconds) of the previous runs, by increasing size.
+            n (int): The size to predict.
+
+        Returns:
+            float: The predicted seconds.
+        """
+        size, seconds = runs[-1]
+        exponent = 1.0
+        if len(runs) > 1:
+            previous_size, previous_seconds = runs[-2]
+            if previous_seconds > 0 and seconds > 0 and size > previous_size:
+                exponent = math.log(seconds / previous_seconds) / math.log(size / previous_size)
+                exponent = min(max(exponent, 1.0), 3.0)
+        return seconds * (n / size) ** exponent
+
+    @classmethod
+    def sort(
+            cls,
+            sizes: tuple[int, ...] = SIZES,
+            distributions: tuple[str, ...] = DISTRIBUTIONS,
+            algorithms: tuple[str, ...] = ALGORITHMS,
+            budget: float = 1.0,
+            count_limit: int = 1_000,
+            seed: int = 0,
+    ) -> list[dict]:
+        """
+        Runs every algorithm over every distribution and size.
+
+        Sizes are visited in increasing order. Once the growth measured over the last two sizes
+        (see Bench._predict) would put the next size over the per-size time budget, the larger
+        sizes are skipped; algorithms in Bench.MAX_SIZE are skipped past their cap. Comparisons, writes and
+        peak memory need an extra, much slower instrumented run, so they are only measured up to
+        count_limit elements and when the timed run stayed within the budget.
+
+        Args:
+            sizes (tuple[int, ...]): The list lengths to benchmark.
+            distributions (tuple[str, ...]): The distributions from Bench.DISTRIBUTIONS.
+            algorithms (tuple[str, ...]): The algorithms from Bench.ALGORITHMS.
+            budget (float): The time budget in seconds for one run.
+            count_limit (int): The largest size for which counters and memory are measured.
+            seed (int): The seed used to generate the data.
+
+        Returns:
+            list[dict]: One row per run (or skipped run), keyed by Bench.FIELDS.
+        """
+        rows = []
+        for name in algorithms:
+            func = cls.algorithm(name)
+            for distribution in distributions:
+                runs = []
+                for n in sorted(sizes):
+                    row = dict.fromkeys(cls.FIELDS)
+                    row.update(algorithm=name, distribution=distribution, size=n)
+                    if n > cls.MAX_SIZE.get(name, n):
+                        row["status"] = "skipped: size cap"
+                        rows.append(row)
+                        continue
+                    if runs and cls._predict(runs, n) > budget:
+                        row["status"] = "skipped: budget"
+                        rows.append(row)
+                        continue
+
+                    data = cls.generate(distribution, n, seed)
+                    work = data[:]
+                    try:
+                        start = time.perf_counter()
+                        result = func(work)
+                        seconds = time.perf_counter() - start
+                    except Exception as error:
+                        row["status"] = f"error: {type(error).__name__}"
+                        rows.append(row)
+                        runs.append((max(n, 1), math.inf))
+                        continue
+                    if isinstance(result, tuple):
+                        result = result[0]
+                    row.update(
+                        status="ok",
+                        seconds=seconds,
+                        ops_per_sec=n / seconds if seconds else None,
+                        correct=list(result) == sorted(data),
+                    )
+                    if n <= count_limit and seconds <= budget:
+                        row.update(cls._measure(func, data))
+                    rows.append(row)
+                    runs.append((max(n, 1), seconds))
+        return rows
+
+    @classmethod
+    def write(cls, rows: list[dict], file, output_format: str = "json") -> None:
+        """
+        Writes benchmark rows as JSON or CSV.
+
+        Args:
+            rows (list[dict]): The rows returned by Bench.sort.
+            file: The text file to write to.
+            output_format (str): Either "json" or "csv".
+        """
+        if output_format == "csv":
+            writer = csv.DictWriter(file, fieldnames=cls.FIELDS)
+            writer.writeheader()
+            writer.writerows(rows)
+        else:
+            json.dump(rows, file, indent=2)
+            file.write("\n")
+
+    @classmethod
+    def main(cls, argv: list[str] | None = None) -> int:
+        """
+        Command line entry point, see `python -m algopy.bench sort --help`.
+
+        Args:
+            argv (list[str] | None): The arguments, defaults to sys.argv[1:].
+
+        Returns:
+            int: The exit code.
+        """
+        parser = argparse.ArgumentParser(prog="python -m algopy.bench")
+        commands = parser.add_subparsers(dest="command", required=True)
+        sort_parser = commands.add_parser("sort", help="benchmark the Sort algorithms")
+        sort_parser.add_argument("--sizes", type=int, nargs="+", default=list(cls.SIZES))
+        sort_parser.add_argument(
+            "--distributions", nargs="+", choices=cls.DISTRIBUTIONS, default=list(cls.DISTRIBUTIONS)
+        )
+        sort_parser.add_argument("--algorithms", nargs="+", choices=cls.ALGORITHMS, default=list(cls.ALGORITHMS))
+        sort_parser.add_argument("--budget", type=float, default=1.0, help="seconds allowed per run")
+        sort_parser.add_argument("--count-limit", type=int, default=1_000)
+        sort_parser.add_argument("--seed", type=int, default=0)
+        sort_parser.add_argument("--format", choices=("json", "csv"), default="json")
+        sort_parser.add_argument("--output", help="file to write to, defaults to stdout")
+        args = parser.parse_args(argv)
+
+        rows = cls.sort(
+            sizes=tuple(args.sizes),
+            distributions=tuple(args.distributions),
+            algorithms=tuple(args.algorithms),
+            budget=args.budget,
+            count_limit=args.count_limit,
+            seed=args.seed,
+        )
+        if args.output:
+            with open(args.output, "w", newline="", encoding="utf-8") as file:
+                cls.write(rows, file, args.format)
+        else:
+            cls.write(rows, sys.stdout, args.format)
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(Bench.main())
@@ -1,7 +1,31 @@
+import contextlib
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
 from typing import Optional, List
 
 
 class BinaryTree:
+    @staticmethod
+    def _make_lock(lock=None):
+        """
+        Returns the context manager guarding the mutations of one tree instance.
+
+        Args:
+            lock (bool | ContextManager | None): True for a private threading.RLock, an existing lock to
+                share between several trees, or None/False for no locking (the single-threaded default).
+
+        Returns:
+            ContextManager: The lock, or a no-op context when locking is disabled.
+        """
+        if lock is None or lock is False:
+            return contextlib.nullcontext()
+        if lock is True:
+            return threading.RLock()
+        if not hasattr(lock, "__enter__") or not hasattr(lock, "__exit__"):
+            raise TypeError("lock must be a bool or a context manager such as threading.Lock")
+        return lock
+
     class _Node:
         """
         Represents a node in a binary tree.
@@ -10,14 +34,23 @@ class BinaryTree:
             value (int): The value stored in the node.
             left (Optional[BinaryTree._Node]): The left child of the node.
             right (Optional[BinaryTree._Node]): The right child of the node.
-            key (int): The key of the node, same as value.
+            key (int): The key of the node, an alias of value.
         """
 
+        __slots__ = ("value", "left", "right")
+
         def __init__(self, value: int) -> None:
             self.value: int = value
             self.left: Optional[BinaryTree._Node] = None
             self.right: Optional[BinaryTree._Node] = None
-            self.key: int = value
+
+        @property
+        def key(self) -> int:
+            return self.value
+
+        @key.setter
+        def key(self, key: int) -> None:
+            self.value = key
 
     class _AVLNode:
         """
@@ -30,6 +63,8 @@ class BinaryTree:
             height (int): The height of the node.
         """
 
+        __slots__ = ("key", "left", "right", "height")
+
         def __init__(self, key: int) -> None:
             self.key: int = key
             self.left: Optional[BinaryTree._AVLNode] = None
@@ -42,35 +77,644 @@ class BinaryTree:
 
         Attributes:
             data (Optional[int]): The data stored in the node.
-            color (str): The color of the node, either "red" or "black".
+            red (bool): True for a red node, False for a black one.
+            color (str): The color of the node, either "red" or "black", derived from red.
             left (Optional[BinaryTree._RBNode]): The left child of the node.
             right (Optional[BinaryTree._RBNode]): The right child of the node.
             parent (Optional[BinaryTree._RBNode]): The parent of the node.
+            value: The value attached to the data when the tree is used as a map.
         """
 
-        def __init__(self, data: Optional[int], color: str = "red") -> None:
+        __slots__ = ("data", "red", "left", "right", "parent", "value")
+
+        def __init__(self, data: Optional[int], color: str = "red", value=None) -> None:
             self.data: Optional[int] = data
-            self.color: str = color
+            self.value = value
+            self.color = color
             self.left: Optional[BinaryTree._RBNode] = None
             self.right: Optional[BinaryTree._RBNode] = None
             self.parent: Optional[BinaryTree._RBNode] = None
 
+        @property
+        def color(self) -> str:
+            return "red" if self.red else "black"
+
+        @color.setter
+        def color(self, color: str) -> None:
+            if color not in ("red", "black"):
+                raise ValueError("color must be 'red' or 'black'")
+            self.red = color == "red"
+
     class _BPlusTreeNode:
         """
         Represents a node in a B+ tree.
 
+        Internal nodes hold separator keys and children; leaves hold the keys with their values and
+        are chained to their neighbours.
+
         Attributes:
             is_leaf (bool): Indicates if the node is a leaf.
             keys (List[int]): The keys stored in the node.
             children (List[BinaryTree._BPlusTreeNode]): The children of the node.
+            values (list): The values of the keys of a leaf.
+            prev (Optional[BinaryTree._BPlusTreeNode]): The previous leaf.
+            next (Optional[BinaryTree._BPlusTreeNode]): The next leaf.
         """
 
+        __slots__ = ("is_leaf", "keys", "children", "values", "prev", "next")
+
         def __init__(self, is_leaf: bool = False) -> None:
             self.is_leaf: bool = is_leaf
             self.keys: List[int] = []
             self.children: List[BinaryTree._BPlusTreeNode] = []
+            self.values: list = []
+            self.prev: Optional[BinaryTree._BPlusTreeNode] = None
+            self.next: Optional[BinaryTree._BPlusTreeNode] = None
+
+    class _Arena:
+        """
+        Struct-of-arrays storage for the nodes of an arena tree.
+
+        Node i is keys[i], left[i], right[i] and meta[i] (the height of an AVL node, 1 for a red
+        red-black node), about 25 bytes per node against well over 100 for a node object. Index 0 is
+        the shared nil node with height 0 and colour black; freed slots are reused by later inserts.
+
+        Attributes:
+            keys (array): The signed 64-bit keys.
+            left (array): The index of the left child of each node, 0 for none.
+            right (array): The index of the right child of each node, 0 for none.
+            meta (array): The height or colour bit of each node.
+        """
+
+        __slots__ = ("keys", "left", "right", "meta", "_free")
+
+        def __init__(self) -> None:
+            self.keys = array("q", [0])
+            self.left = array("q", [0])
+            self.right = array("q", [0])
+            self.meta = array("b", [0])
+            self._free: List[int] = []
+
+        def new(self, key: int, meta: int) -> int:
+            """
+            Allocates a childless node.
+
+            Args:
+                key (int): The key of the node.
+                meta (int): The initial height or colour bit.
+
+            Returns:
+                int: The index of the node.
+
+            Raises:
+                OverflowError: If the key does not fit in a signed 64-bit integer.
+            """
+            if self._free:
+                node = self._free.pop()
+                self.keys[node] = key
+                self.left[node] = self.right[node] = 0
+                self.meta[node] = meta
+                return node
+            self.keys.append(key)
+            self.left.append(0)
+            self.right.append(0)
+            self.meta.append(meta)
+            return len(self.keys) - 1
+
+        def free(self, node: int) -> None:
+            """
+            Releases a node so that its slot can be reused.
+
+            Args:
+                node (int): The index of the node.
+            """
+            self._free.append(node)
+
+        def rotate(self, node: int, left: bool) -> int:
+            """
+            Rotates the subtree rooted at node, left when left is True and right otherwise.
+
+            Args:
+                node (int): The index of the root of the subtree.
+                left (bool): The direction of the rotation.
+
+            Returns:
+                int: The index of the new root of the subtree.
+            """
+            if left:
+                child = self.right[node]
+                self.right[node] = self.left[child]
+                self.left[child] = node
+            else:
+                child = self.left[node]
+                self.left[node] = self.right[child]
+                self.right[child] = node
+            return child
+
+        def in_order(self, root: int):
+            """
+            Yields the keys of the subtree rooted at root in order, without recursion.
+
+            Args:
+                root (int): The index of the root of the subtree.
+
+            Yields:
+                int: The keys in ascending order.
+            """
+            stack: List[int] = []
+            node = root
+            while stack or node:
+                while node:
+                    stack.append(node)
+                    node = self.left[node]
+                node = stack.pop()
+                yield self.keys[node]
+                node = self.right[node]
+
+        @property
+        def nbytes(self) -> int:
+            """
+            Returns the number of bytes held by the arrays, free slots included.
+
+            Returns:
+                int: The size of the storage in bytes.
+            """
+            return sum(
+                column.itemsize * len(column)
+                for column in (self.keys, self.left, self.right, self.meta)
+            )
+
+    class AVLArena:
+        """
+        An AVL tree of 64-bit integer keys stored in a BinaryTree._Arena instead of node objects.
+
+        It balances exactly like BinaryTree.AVL (duplicates go right), so pre_order gives the same
+        shape, while using a fraction of the memory and no recursion. Reads and writes run under the
+        instance lock since rotations relink several nodes.
+        """
+
+        def __init__(self, keys=(), lock=None) -> None:
+            """
+            Initializes the tree, inserting the given keys.
+
+            Args:
+                keys (Iterable[int]): The keys to insert.
+                lock (bool | ContextManager | None): See BinaryTree._make_lock. Defaults to no locking.
+            """
+            self._lock = BinaryTree._make_lock(lock)
+            self.arena = BinaryTree._Arena()
+            self.root: int = 0
+            self._len: int = 0
+            for key in keys:
+                self.insert(key)
+
+        def _rebalance(self, node: int) -> int:
+            """
+            Updates the height of node and rotates it back into balance.
+
+            Args:
+                node (int): The index of the node.
+
+            Returns:
+                int: The index of the root of the balanced subtree.
+            """
+            arena = self.arena
+            left, right, height = arena.left, arena.right, arena.meta
+            balance = height[left[node]] - height[right[node]]
+            if balance > 1:
+                child = left[node]
+                if height[left[child]] < height[right[child]]:
+                    left[node] = self._rotate(child, True)
+                return self._rotate(node, False)
+            if balance < -1:
+                child = right[node]
+                if height[right[child]] < height[left[child]]:
+                    right[node] = self._rotate(child, False)
+                return self._rotate(node, True)
+            height[node] = 1 + max(height[left[node]], height[right[node]])
+            return node
+
+        def _rotate(self, node: int, left: bool) -> int:
+            """
+            Rotates like BinaryTree._Arena.rotate and updates the two heights that changed.
+
+            Args:
+                node (int): The index of the root of the subtree.
+                left (bool): The direction of the rotation.
+
+            Returns:
+                int: The index of the new root of the subtree.
+            """
+            arena = self.arena
+            child = arena.rotate(node, left)
+            height, lefts, rights = arena.meta, arena.left, arena.right
+            height[node] = 1 + max(height[lefts[node]], height[rights[node]])
+            height[child] = 1 + max(height[lefts[child]], height[rights[child]])
+            return child
+
+        def _relink(self, path: List[tuple], child: int) -> None:
+            """
+            Walks back up a search path, attaching each subtree to its parent and rebalancing.
+
+            Args:
+                path (List[tuple]): The (node, went_left) pairs from the root down.
+                child (int): The new subtree hanging below the last node of the path.
+            """
+            arena = self.arena
+            while path:
+                parent, went_left = path.pop()
+                if went_left:
+                    arena.left[parent] = child
+                else:
+                    arena.right[parent] = child
+                child = self._rebalance(parent)
+            self.root = child
+
+        def insert(self, key: int) -> None:
+            """
+            Inserts a key into the tree.
+
+            Args:
+                key (int): The key to insert.
+            """
+            with self._lock:
+                arena = self.arena
+                keys, left, right = arena.keys, arena.left, arena.right
+                path: List[tuple] = []
+                node = self.root
+                while node:
+                    went_left = key < keys[node]
+                    path.append((node, went_left))
+                    node = left[node] if went_left else right[node]
+                node = arena.new(key, 1)
+                self._len += 1
+                self._relink(path, node)
+
+        def delete(self, key: int) -> bool:
+            """
+            Deletes one occurrence of a key from the tree.
+
+            Args:
+                key (int): The key to delete.
+
+            Returns:
+                bool: True if the key was found and deleted, False otherwise.
+            """
+            with self._lock:
+                arena = self.arena
+                keys, left, right = arena.keys, arena.left, arena.right
+                path: List[tuple] = []
+                node = self.root
+                while node and keys[node] != key:
+                    went_left = key < keys[node]
+                    path.append((node, went_left))
+                    node = left[node] if went_left else right[node]
+                if not node:
+                    return False
+                if left[node] and right[node]:
+                    path.append((node, False))
+                    successor = right[node]
+                    while left[successor]:
+                        path.append((successor, True))
+                        successor = left[successor]
+                    keys[node] = keys[successor]
+                    node, child = successor, right[successor]
+                else:
+                    child = left[node] or right[node]
+                arena.free(node)
+                self._len -= 1
+                self._relink(path, child)
+                return True
+
+        def __contains__(self, key: int) -> bool:
+            with self._lock:
+                keys, left, right = self.arena.keys, self.arena.left, self.arena.right
+                node = self.root
+                while node:
+                    if key == keys[node]:
+                        return True
+                    node = left[node] if key < keys[node] else right[node]
+                return False
+
+        def __len__(self) -> int:
+            return self._len
+
+        def __iter__(self):
+            with self._lock:
+                return iter(list(self.arena.in_order(self.root)))
+
+        def pre_order(self) -> str:
+            """
+            Returns a string representation of the pre-order traversal of the tree.
+
+            Returns:
+                str: The pre-order traversal, in the format of BinaryTree.AVL.pre_order.
+            """
+            with self._lock:
+                result: List[str] = []
+                stack = [self.root] if self.root else []
+                while stack:
+                    node = stack.pop()
+                    result.append(str(self.arena.keys[node]))
+                    if self.arena.right[node]:
+                        stack.append(self.arena.right[node])
+                    if self.arena.left[node]:
+                        stack.append(self.arena.left[node])
+                return " ".join(result)
+
+        @property
+        def height(self) -> int:
+            return self.arena.meta[self.root]
+
+    class RedBlackArena:
+        """
+        A Red-Black Tree of 64-bit integer keys stored in a BinaryTree._Arena instead of node objects.
+
+        There are no parent links: insertion and deletion keep the search path on a stack and fix
+        colours walking back up it. Like the keys of BinaryTree.RedBlackTree, the keys are unique:
+        inserting a key already present does nothing. Reads and writes run under the instance lock
+        since rotations relink several nodes.
+        """
+
+        def __init__(self, keys=(), lock=None) -> None:
+            """
+            Initializes the tree, inserting the given keys.
+
+            Args:
+                keys (Iterable[int]): The keys to insert.
+                lock (bool | ContextManager | None): See BinaryTree._make_lock. Defaults to no locking.
+            """
+            self._lock = BinaryTree._make_lock(lock)
+            self.arena = BinaryTree._Arena()
+            self.root: int = 0
+            self._len: int = 0
+            for key in keys:
+                self.insert(key)
+
+        def insert(self, key: int) -> None:
+            """
+            Inserts a key into the tree, unless it is already present.
+
+            Args:
+                key (int): The key to insert.
+            """
+            with self._lock:
+                arena = self.arena
+                keys, left, right, red = arena.keys, arena.left, arena.right, arena.meta
+                path: List[tuple] = []
+                node = self.root
+                while node:
+                    if key == keys[node]:
+                        return
+                    went_left = key < keys[node]
+                    path.append((node, went_left))
+                    node = left[node] if went_left else right[node]
+                node = arena.new(key, 1)
+                self._len += 1
+                if path:
+                    parent, went_left = path[-1]
+                    if went_left:
+                        left[parent] = node
+                    else:
+                        right[parent] = node
+                else:
+                    self.root = node
+
+                while len(path) > 1:
+                    parent, node_is_left = path[-1]
+                    if not red[parent]:
+                        break
+                    grandparent, parent_is_left = path[-2]
+                    uncle = right[grandparent] if parent_is_left else left[grandparent]
+                    if red[uncle]:
+                        red[parent] = red[uncle] = 0
+                        red[grandparent] = 1
+                        node = grandparent
+                        del path[-2:]
+                        continue
+                    if parent_is_left:
+                        if not node_is_left:
+                            left[grandparent] = arena.rotate(parent, True)
+                        top = arena.rotate(grandparent, False)
+                    else:
+                        if node_is_left:
+                            right[grandparent] = arena.rotate(parent, False)
+                        top = arena.rotate(grandparent, True)
+                    red[top] = 0
+                    red[grandparent] = 1
+                    del path[-2:]
+                    if path:
+                        ancestor, went_left = path[-1]
+                        if went_left:
+                            left[ancestor] = top
+                        else:
+                            right[ancestor] = top
+                    else:
+                        self.root = top
+                    break
+                red[self.root] = 0
+
+        def _link(self, entry, child: int) -> None:
+            """
+            Hangs child below the node of a path entry, or makes it the root when there is none.
+
+            Args:
+                entry (Optional[tuple]): The (node, went_left) pair of the new parent, or None.
+                child (int): The index of the child.
+            """
+            if entry is None:
+                self.root = child
+            elif entry[1]:
+                self.arena.left[entry[0]] = child
+            else:
+                self.arena.right[entry[0]] = child
+
+        def delete(self, key: int) -> bool:
+            """
+            Deletes a key from the tree and restores its properties.
+
+            Like insert, the fixup walks back up the search path kept on a stack instead of parent links.
+
+            Args:
+                key (int): The key to delete.
+
+            Returns:
+                bool: True if the key was found and deleted, False otherwise.
+            """
+            with self._lock:
+                arena = self.arena
+                keys, left, right, red = arena.keys, arena.left, arena.right, arena.meta
+                path: List[tuple] = []
+                node = self.root
+                while node and keys[node] != key:
+                    went_left = key < keys[node]
+                    path.append((node, went_left))
+                    node = left[node] if went_left else right[node]
+                if not node:
+                    return False
+                if left[node] and right[node]:
+                    path.append((node, False))
+                    successor = right[node]
+                    while left[successor]:
+                        path.append((successor, True))
+                        successor = left[successor]
+                    keys[node] = keys[successor]
+                    node = successor
+                child = left[node] or right[node]
+                self._link(path[-1] if path else None, child)
+                removed_red = red[node]
+                arena.free(node)
+                self._len -= 1
+                if removed_red:
+                    return True
+                if red[child]:
+                    red[child] = 0
+                    return True
+
+                # child carries an extra black; path[-1] is its parent and the side it hangs on.
+                while path:
+                    parent, is_left = path[-1]
+                    sibling = right[parent] if is_left else left[parent]
+                    if red[sibling]:
+                        red[sibling], red[parent] = 0, 1
+                        top = arena.rotate(parent, is_left)
+                        self._link(path[-2] if len(path) > 1 else None, top)
+                        path[-1:] = [(top, is_left), (parent, is_left)]
+                        sibling = right[parent] if is_left else left[parent]
+                    near = left[sibling] if is_left else right[sibling]
+                    far = right[sibling] if is_left else left[sibling]
+                    if not red[near] and not red[far]:
+                        red[sibling] = 1
+                        path.pop()
+                        if red[parent]:
+                            red[parent] = 0
+                            return True
+                        continue
+                    if not red[far]:
+                        red[near], red[sibling] = 0, 1
+                        sibling = arena.rotate(sibling, not is_left)
+                        if is_left:
+                            right[parent] = sibling
+                        else:
+                            left[parent] = sibling
+                        far = right[sibling] if is_left else left[sibling]
+                    red[sibling], red[parent], red[far] = red[parent], 0, 0
+                    top = arena.rotate(parent, is_left)
+                    self._link(path[-2] if len(path) > 1 else None, top)
+                    break
+                red[self.root] = 0
+                return True
+
+        def __contains__(self, key: int) -> bool:
+            with self._lock:
+                keys, left, right = self.arena.keys, self.arena.left, self.arena.right
+                node = self.root
+                while node:
+                    if key == keys[node]:
+                        return True
+                    node = left[node] if key < keys[node] else right[node]
+                return False
+
+        def __len__(self) -> int:
+            return self._len
+
+        def __iter__(self):
+            with self._lock:
+                return iter(list(self.arena.in_order(self.root)))
+
+        def __repr__(self) -> str:
+            """
+            Returns a string representation of the tree.
+
+            Returns:
+                str: The keys in order, in the format of BinaryTree.RedBlackTree.
+            """
+            return str(list(self))
 
     class AVL:
+        """
+        Functions over AVL trees built from BinaryTree._AVLNode, each taking and returning the root.
+
+        insert and delete walk down once, keeping the visited nodes on a stack, and rebalance on the
+        way back up without recursion. from_sorted and bulk_insert build whole trees in linear time.
+        """
+
+        @staticmethod
+        def _rotate(z, left: bool):
+            """
+            Rotates the subtree rooted at z and updates the heights of the two nodes that moved.
+
+            Args:
+                z (BinaryTree._AVLNode): The root of the subtree to rotate.
+                left (bool): True for a left rotation, False for a right one.
+
+            Returns:
+                BinaryTree._AVLNode: The new root of the rotated subtree.
+            """
+            if left:
+                y = z.right
+                z.right = y.left
+                y.left = z
+            else:
+                y = z.left
+                z.left = y.right
+                y.right = z
+            z.height = 1 + max(z.left.height if z.left else 0, z.right.height if z.right else 0)
+            y.height = 1 + max(y.left.height if y.left else 0, y.right.height if y.right else 0)
+            return y
+
+        @classmethod
+        def _rebalance(cls, node):
+            """
+            Updates the height of node and rotates it back into balance if needed.
+
+            Args:
+                node (BinaryTree._AVLNode): A node whose subtrees are balanced.
+
+            Returns:
+                BinaryTree._AVLNode: The root of the balanced subtree.
+            """
+            left_height = node.left.height if node.left else 0
+            right_height = node.right.height if node.right else 0
+            if left_height - right_height > 1:
+                child = node.left
+                if (child.left.height if child.left else 0) < (child.right.height if child.right else 0):
+                    node.left = cls._rotate(child, True)
+                return cls._rotate(node, False)
+            if right_height - left_height > 1:
+                child = node.right
+                if (child.right.height if child.right else 0) < (child.left.height if child.left else 0):
+                    node.right = cls._rotate(child, False)
+                return cls._rotate(node, True)
+            node.height = 1 + max(left_height, right_height)
+            return node
+
+        @classmethod
+        def _relink(cls, path: list, child):
+            """
+            Walks back up a search path, attaching each subtree to its parent and rebalancing.
+
+            Stops early once a node keeps both its height and its place, since nothing above it changes.
+
+            Args:
+                path (list): The (node, went_left) pairs from the root down.
+                child (Optional[BinaryTree._AVLNode]): The new subtree below the last node of the path.
+
+            Returns:
+                BinaryTree._AVLNode: The root of the tree.
+            """
+            while path:
+                parent, went_left = path.pop()
+                if went_left:
+                    parent.left = child
+                else:
+                    parent.right = child
+                height = parent.height
+                child = cls._rebalance(parent)
+                if child is parent and child.height == height:
+                    return path[0][0] if path else child
+            return child
+
         @classmethod
         def insert(cls, root, key: int):
             """
@@ -87,135 +731,141 @@ class BinaryTree:
                 raise TypeError(
                     "Root must be an instance of BinaryTree._AVLNode"
                 )
-            if not root:
-                return BinaryTree._AVLNode(key)
-            if key < root.key:
-                root.left = cls.insert(root.left, key)
-            else:
-                root.right = cls.insert(root.right, key)
-
-            root.height = 1 + max(
-                cls._Get.height(root.left), cls._Get.height(root.right)
-            )
-            balance = cls._Get.balance(root)
-
-            if balance > 1:
-                if key < root.left.key:
-                    return cls.__right_rotate(root)
-                root.left = cls.__left_rotate(root.left)
-                return cls.__right_rotate(root)
-            if balance < -1:
-                if key > root.right.key:
-                    return cls.__left_rotate(root)
-                root.right = cls.__right_rotate(root.right)
-                return cls.__left_rotate(root)
-
-            return root
+            path = []
+            node = root
+            while node:
+                went_left = key < node.key
+                path.append((node, went_left))
+                node = node.left if went_left else node.right
+            return cls._relink(path, BinaryTree._AVLNode(key))
 
         @classmethod
         def delete(cls, root, key: int):
             """
             Deletes a key from the AVL tree and balances the tree if necessary.
 
+            A node with two children takes the key of its in-order successor, which is removed instead.
+
             Args:
-                root (BinaryTree._AVLNode): The root of the AVL tree.
+                root (Optional[BinaryTree._AVLNode]): The root of the AVL tree.
                 key (int): The key to delete.
 
             Returns:
-                BinaryTree._AVLNode: The new root of the AVL tree.
+                Optional[BinaryTree._AVLNode]: The new root of the AVL tree, unchanged if the key is absent.
             """
-            if not isinstance(root, BinaryTree._AVLNode):
+            if not isinstance(root, BinaryTree._AVLNode) and root is not None:
                 raise TypeError(
                     "Root must be an instance of BinaryTree._AVLNode"
                 )
-            if not root:
+            path = []
+            node = root
+            while node and node.key != key:
+                went_left = key < node.key
+                path.append((node, went_left))
+                node = node.left if went_left else node.right
+            if not node:
                 return root
-            if key < root.key:
-                root.left = cls.delete(root.left, key)
-            elif key > root.key:
-                root.right = cls.delete(root.right, key)
+            if node.left and node.right:
+                path.append((node, False))
+                successor = node.right
+                while successor.left:
+                    path.append((successor, True))
+                    successor = successor.left
+                node.key = successor.key
+                child = successor.right
             else:
-                if not root.left:
-                    return root.right
-                if not root.right:
-                    return root.left
-
-                temp = cls.__min_value_node(root.right)
-                root.key = temp.key
-                root.right = cls.delete(root.right, temp.key)
-
-            root.height = 1 + max(
-                cls._Get.height(root.left), cls._Get.height(root.right)
-            )
-            balance = cls._Get.balance(root)
-
-            if balance > 1:
-                if cls._Get.balance(root.left) >= 0:
-                    return cls.__right_rotate(root)
-                root.left = cls.__left_rotate(root.left)
-                return cls.__right_rotate(root)
-            if balance < -1:
-                if cls._Get.balance(root.right) <= 0:
-                    return cls.__left_rotate(root)
-                root.right = cls.__right_rotate(root.right)
-                return cls.__left_rotate(root)
-
-            return root
+                child = node.left or node.right
+            return cls._relink(path, child)
 
         @classmethod
-        def __rotate(cls, z, direction: str):
+        def from_sorted(cls, keys):
             """
-            Rotates the subtree rooted at z in the specified direction.
+            Builds a perfectly balanced AVL tree from keys in ascending order in O(n).
 
             Args:
-                z (BinaryTree._AVLNode): The root of the subtree to rotate.
-                direction (str): The direction to rotate ('left' or 'right').
+                keys (Sequence[int]): The keys, sorted in ascending order.
 
             Returns:
-                BinaryTree._AVLNode: The new root of the rotated subtree.
-            """
-            if not isinstance(z, BinaryTree._AVLNode):
-                raise TypeError("Z must be an instance of BinaryTree._AVLNode")
-            y = getattr(z, direction)
-            setattr(
-                z,
-                direction,
-                getattr(y, "left" if direction == "right" else "right"),
-            )
-            setattr(y, "left" if direction == "right" else "right", z)
-            z.height = 1 + max(cls._Get.height(z.left), cls._Get.height(z.right))
-            y.height = 1 + max(cls._Get.height(y.left), cls._Get.height(y.right))
-            return y
+                Optional[BinaryTree._AVLNode]: The root of the tree, None for no keys.
+
+            Raises:
+                ValueError: If the keys are not sorted.
+            """
+            keys = list(keys)
+            if any(keys[i] > keys[i + 1] for i in range(len(keys) - 1)):
+                raise ValueError("keys must be sorted in ascending order")
+
+            def build(lo: int, hi: int):
+                if lo >= hi:
+                    return None
+                mid = (lo + hi) // 2
+                node = BinaryTree._AVLNode(keys[mid])
+                node.left = build(lo, mid)
+                node.right = build(mid + 1, hi)
+                node.height = 1 + max(
+                    node.left.height if node.left else 0, node.right.height if node.right else 0
+                )
+                return node
+
+            return build(0, len(keys))
 
         @classmethod
-        def __left_rotate(cls, z):
+        def bulk_insert(cls, root, keys):
             """
-            Performs a left rotation on the subtree rooted at z.
+            Inserts many keys at once.
+
+            A batch that is small next to the tree is inserted key by key. Otherwise the batch is
+            sorted, merged with the in-order keys of the tree and the result rebuilt with from_sorted,
+            in O(n + m log m) for n keys in the tree and m new ones.
 
             Args:
-                z (BinaryTree._AVLNode): The root of the subtree to rotate.
+                root (Optional[BinaryTree._AVLNode]): The root of the AVL tree.
+                keys (Iterable[int]): The keys to insert.
 
             Returns:
-                BinaryTree._AVLNode: The new root of the rotated subtree.
+                Optional[BinaryTree._AVLNode]: The new root of the AVL tree.
             """
-            if not isinstance(z, BinaryTree._AVLNode):
-                raise TypeError("Z must be an instance of BinaryTree._AVLNode")
-            return cls.__rotate(z, "right")
+            if not isinstance(root, BinaryTree._AVLNode) and root is not None:
+                raise TypeError(
+                    "Root must be an instance of BinaryTree._AVLNode"
+                )
+            keys = sorted(keys)
+            # An AVL tree of height h holds at least about 2 ** (h / 2) keys.
+            if root and len(keys) < 2 ** (root.height // 2):
+                for key in keys:
+                    root = cls.insert(root, key)
+                return root
+            merged = cls.in_order(root) + keys
+            # Two sorted runs: the sort is a single linear merge.
+            merged.sort()
+            return cls.from_sorted(merged)
 
         @classmethod
-        def __right_rotate(cls, z):
+        def in_order(cls, root) -> List[int]:
             """
-            Performs a right rotation on the subtree rooted at z.
+            Returns the keys of the AVL tree in ascending order, without recursion.
 
             Args:
-                z (BinaryTree._AVLNode): The root of the subtree to rotate.
+                root (Optional[BinaryTree._AVLNode]): The root of the AVL tree.
 
             Returns:
-                BinaryTree._AVLNode: The new root of the rotated subtree.
+                List[int]: The keys in order.
             """
-            if not isinstance(z, BinaryTree._AVLNode):
-                raise TypeError("Z must be an instance of BinaryTree._AVLNode")
-            return cls.__rotate(z, "left")
+            if not isinstance(root, BinaryTree._AVLNode) and root is not None:
+                raise TypeError(
+                    "Root must be an instance of BinaryTree._AVLNode"
+                )
+            result: List[int] = []
+            stack = []
+            node = root
+            while stack or node:
+                while node:
+                    stack.append(node)
+                    node = node.left
+                node = stack.pop()
+                result.append(node.key)
+                node = node.right
+            return result
 
         @classmethod
         def pre_order(cls, root) -> str:
@@ -254,25 +904,6 @@ class BinaryTree:
                 cls._pre_order_helper(root.left, result)
                 cls._pre_order_helper(root.right, result)
 
-        @classmethod
-        def __min_value_node(cls, root):
-            """
-            Finds the node with the minimum key in the subtree rooted at root.
-
-            Args:
-                root (BinaryTree._AVLNode): The root of the subtree.
-
-            Returns:
-                BinaryTree._AVLNode: The node with the minimum key.
-            """
-            if not isinstance(root, BinaryTree._AVLNode):
-                raise TypeError(
-                    "Root must be an instance of BinaryTree._AVLNode"
-                )
-            while root.left:
-                root = root.left
-            return root
-
         class _Get:
             @staticmethod
             def height(root) -> int:
@@ -314,33 +945,39 @@ class BinaryTree:
     class Degenerate:
         """
         Represents a degenerate (linked list-like) binary tree.
+
+        Every instance holds its own nodes. insert and delete run under the instance lock; search and
+        traverse are lock-free: a node is fully built before it is linked and both mutations change a
+        single reference, so a reader sees the chain either before or after a concurrent write.
         """
 
-        @classmethod
-        def __init__(cls) -> None:
+        def __init__(self, lock=None) -> None:
             """
             Initializes the Degenerate tree with an empty root.
+
+            Args:
+                lock (bool | ContextManager | None): See BinaryTree._make_lock. Defaults to no locking.
             """
-            cls.root: Optional[BinaryTree._Node] = None
+            self.root: Optional[BinaryTree._Node] = None
+            self._lock = BinaryTree._make_lock(lock)
 
-        @classmethod
-        def insert(cls, key: int) -> None:
+        def insert(self, key: int) -> None:
             """
             Inserts a key into the degenerate tree.
 
             Args:
                 key (int): The key to insert.
             """
-            if not cls.root:
-                cls.root = BinaryTree._Node(key)
-            else:
-                current = cls.root
-                while current.right:
-                    current = current.right
-                current.right = BinaryTree._Node(key)
+            with self._lock:
+                if not self.root:
+                    self.root = BinaryTree._Node(key)
+                else:
+                    current = self.root
+                    while current.right:
+                        current = current.right
+                    current.right = BinaryTree._Node(key)
 
-        @classmethod
-        def search(cls, key: int) -> bool:
+        def search(self, key: int) -> bool:
             """
             Searches for a key in the degenerate tree.
 
@@ -350,35 +987,34 @@ class BinaryTree:
             Returns:
                 bool: True if the key is found, False otherwise.
             """
-            current = cls.root
+            current = self.root
             while current:
-                if current.key == key:
+                if current.value == key:
                     return True
                 current = current.right
             return False
 
-        @classmethod
-        def delete(cls, key: int) -> None:
+        def delete(self, key: int) -> None:
             """
             Deletes a key from the degenerate tree.
 
             Args:
                 key (int): The key to delete.
             """
-            if not cls.root:
-                return
-            if cls.root.key == key:
-                cls.root = cls.root.right
-                return
-            current = cls.root
-            while current.right:
-                if current.right.key == key:
-                    current.right = current.right.right
+            with self._lock:
+                if not self.root:
                     return
-                current = current.right
+                if self.root.value == key:
+                    self.root = self.root.right
+                    return
+                current = self.root
+                while current.right:
+                    if current.right.value == key:
+                        current.right = current.right.right
+                        return
+                    current = current.right
 
-        @classmethod
-        def traverse(cls) -> str:
+        def traverse(self) -> str:
             """
             Traverses the degenerate tree and returns a string representation.
 
@@ -386,9 +1022,9 @@ class BinaryTree:
                 str: A string representation of the tree.
             """
             result: List[str] = []
-            current = cls.root
+            current = self.root
             while current:
-                result.append(str(current.key))
+                result.append(str(current.value))
                 current = current.right
             result.append("None")
             return " -> ".join(result)
@@ -396,43 +1032,45 @@ class BinaryTree:
     class Perfect:
         """
         Represents a perfect binary tree.
+
+        Every instance holds its own nodes. create runs under the instance lock; return_list and
+        return_tree are lock-free, each slot being written once by a single assignment.
         """
 
-        @classmethod
-        def __init__(cls, height: int) -> None:
+        def __init__(self, height: int, lock=None) -> None:
             """
             Initializes the Perfect binary tree with a given height.
 
             Args:
                 height (int): The height of the perfect binary tree.
+                lock (bool | ContextManager | None): See BinaryTree._make_lock. Defaults to no locking.
             """
-            cls.height: int = height
-            cls.nodes: List[Optional[BinaryTree._Node]] = [None] * (
+            self._lock = BinaryTree._make_lock(lock)
+            self.height: int = height
+            self.nodes: List[Optional[BinaryTree._Node]] = [None] * (
                     2 ** height - 1
             )
 
-        @classmethod
-        def create(cls) -> None:
+        def create(self) -> None:
             """
             Creates the perfect binary tree.
             """
-            cls.__create(0)
+            with self._lock:
+                self.__create(0)
 
-        @classmethod
-        def __create(cls, index: int) -> None:
+        def __create(self, index: int) -> None:
             """
             Recursively creates nodes for the perfect binary tree.
 
             Args:
                 index (int): The current index in the nodes list.
             """
-            if index < len(cls.nodes):
-                cls.__create(2 * index + 1)
-                cls.nodes[index] = BinaryTree._Node(index)
-                cls.__create(2 * index + 2)
+            if index < len(self.nodes):
+                self.__create(2 * index + 1)
+                self.nodes[index] = BinaryTree._Node(index)
+                self.__create(2 * index + 2)
 
-        @classmethod
-        def return_tree(cls) -> str:
+        def return_tree(self) -> str:
             """
             Returns a string representation of the perfect binary tree.
 
@@ -440,8 +1078,8 @@ class BinaryTree:
                 str: The string representation of the tree.
             """
             levels: List[List[Optional[BinaryTree._Node]]] = []
-            cls.__print_tree(0, 0, levels)
-            return cls.__format_tree(levels)
+            self.__print_tree(0, 0, levels)
+            return self.__format_tree(levels)
 
         @staticmethod
         def __format_tree(levels) -> str:
@@ -473,18 +1111,16 @@ class BinaryTree:
                 tree_str += level_str.center(max_width) + "\n"
             return tree_str.replace("None", " ")
 
-        @classmethod
-        def return_list(cls) -> List[Optional[int]]:
+        def return_list(self) -> List[Optional[int]]:
             """
             Returns a list of node values in the perfect binary tree.
 
             Returns:
                 list[Optional[int]]: The list of node values.
             """
-            return [node.value if node else None for node in cls.nodes]
+            return [node.value if node else None for node in self.nodes]
 
-        @classmethod
-        def __print_tree(cls, index: int, level: int, levels) -> None:
+        def __print_tree(self, index: int, level: int, levels) -> None:
             """
             Recursively prints the tree levels.
 
@@ -493,62 +1129,410 @@ class BinaryTree:
                 level (int): The current level in the tree.
                 levels (list): The list to store the levels of the tree.
             """
-            if index < len(cls.nodes):
+            if index < len(self.nodes):
                 if len(levels) == level:
                     levels.append([])
-                levels[level].append(cls.nodes[index])
-                cls.__print_tree(2 * index + 1, level + 1, levels)
-                cls.__print_tree(2 * index + 2, level + 1, levels)
+                levels[level].append(self.nodes[index])
+                self.__print_tree(2 * index + 1, level + 1, levels)
+                self.__print_tree(2 * index + 2, level + 1, levels)
 
     class RedBlackTree:
         """
-        Represents a Red-Black Tree.
+        Represents a Red-Black Tree, used as an ordered map from keys to values.
+
+        Every instance holds its own root and NIL sentinel and tracks its size, minimum and maximum,
+        so len, min and max are O(1). Rotations briefly detach subtrees, so readers take the instance
+        lock as well as writers. The lazy iterators (iter, range, items) take it one step at a time
+        and, like a dict, must not be used across a mutation of the tree.
         """
 
-        @classmethod
-        def __init__(cls) -> None:
+        def __init__(self, lock=None) -> None:
             """
             Initializes the Red-Black Tree with a NIL node.
+
+            Args:
+                lock (bool | ContextManager | None): See BinaryTree._make_lock. Defaults to no locking.
             """
-            cls.NIL: BinaryTree._RBNode = BinaryTree._RBNode(
+            self._lock = BinaryTree._make_lock(lock)
+            self.NIL: BinaryTree._RBNode = BinaryTree._RBNode(
                 data=None, color="black"
             )
-            cls.root: BinaryTree._RBNode = cls.NIL
+            self.root: BinaryTree._RBNode = self.NIL
+            self._min: BinaryTree._RBNode = self.NIL
+            self._max: BinaryTree._RBNode = self.NIL
+            self._len: int = 0
 
-        @classmethod
-        def insert(cls, key: int) -> None:
+        def insert(self, key: int, value=None) -> None:
             """
-            Inserts a new node with the given key into the Red-Black Tree.
+            Inserts a key into the Red-Black Tree, or replaces the value of an existing key.
 
             Args:
                 key (int): The key to insert.
+                value: The value attached to the key. Defaults to None.
+            """
+            with self._lock:
+                parent: Optional[BinaryTree._RBNode] = None
+                current: BinaryTree._RBNode = self.root
+
+                while current is not self.NIL:
+                    if key == current.data:
+                        current.value = value
+                        return
+                    parent = current
+                    if key < current.data:
+                        current = current.left
+                    else:
+                        current = current.right
+
+                new_node = BinaryTree._RBNode(key, value=value)
+                new_node.left = self.NIL
+                new_node.right = self.NIL
+                new_node.parent = parent
+                if not parent:
+                    self.root = new_node
+                elif key < parent.data:
+                    parent.left = new_node
+                else:
+                    parent.right = new_node
+
+                if self._min is self.NIL or key < self._min.data:
+                    self._min = new_node
+                if self._max is self.NIL or key > self._max.data:
+                    self._max = new_node
+                self._len += 1
+                self.insert_fixup(new_node)
+
+        def _find(self, key: int) -> "BinaryTree._RBNode":
             """
-            new_node = BinaryTree._RBNode(key)
-            new_node.left = cls.NIL
-            new_node.right = cls.NIL
-            parent: Optional[BinaryTree._RBNode] = None
-            current: BinaryTree._RBNode = cls.root
+            Returns the node holding key, or NIL.
 
-            while current != cls.NIL:
-                parent = current
-                if new_node.data < current.data:
-                    current = current.left
-                else:
-                    current = current.right
+            Args:
+                key (int): The key to look for.
 
-            new_node.parent = parent
-            if not parent:
-                cls.root = new_node
-            elif new_node.data < parent.data:
-                parent.left = new_node
+            Returns:
+                BinaryTree._RBNode: The node, NIL if the key is absent.
+            """
+            node = self.root
+            while node is not self.NIL and key != node.data:
+                node = node.left if key < node.data else node.right
+            return node
+
+        def _step(self, node, forward: bool = True) -> "BinaryTree._RBNode":
+            """
+            Returns the in-order successor (or predecessor) of node through the parent links.
+
+            Args:
+                node (BinaryTree._RBNode): A node of the tree.
+                forward (bool): True for the successor, False for the predecessor.
+
+            Returns:
+                BinaryTree._RBNode: The next node, NIL at the end of the tree.
+            """
+            near, far = ("left", "right") if forward else ("right", "left")
+            child = getattr(node, far)
+            if child is not self.NIL:
+                while getattr(child, near) is not self.NIL:
+                    child = getattr(child, near)
+                return child
+            parent = node.parent
+            while parent is not None and node is getattr(parent, far):
+                node, parent = parent, parent.parent
+            return parent if parent is not None else self.NIL
+
+        def _transplant(self, old, new) -> None:
+            """
+            Puts the subtree rooted at new in the place of the subtree rooted at old.
+
+            Args:
+                old (BinaryTree._RBNode): The subtree to replace.
+                new (BinaryTree._RBNode): The replacement, possibly NIL.
+            """
+            if old.parent is None:
+                self.root = new
+            elif old is old.parent.left:
+                old.parent.left = new
             else:
-                parent.right = new_node
+                old.parent.right = new
+            new.parent = old.parent
 
-            new_node.color = "red"
-            cls.insert_fixup(new_node)
+        def delete(self, key: int) -> bool:
+            """
+            Deletes a key from the Red-Black Tree and restores its properties.
 
-        @classmethod
-        def insert_fixup(cls, node) -> None:
+            Nodes are relinked rather than having their keys copied, so nodes stay attached to their keys.
+
+            Args:
+                key (int): The key to delete.
+
+            Returns:
+                bool: True if the key was found and deleted, False otherwise.
+            """
+            with self._lock:
+                node = self._find(key)
+                if node is self.NIL:
+                    return False
+                if node is self._min:
+                    self._min = self._step(node, True)
+                if node is self._max:
+                    self._max = self._step(node, False)
+                self._len -= 1
+
+                removed_red = node.red
+                if node.left is self.NIL:
+                    child = node.right
+                    self._transplant(node, child)
+                elif node.right is self.NIL:
+                    child = node.left
+                    self._transplant(node, child)
+                else:
+                    successor = node.right
+                    while successor.left is not self.NIL:
+                        successor = successor.left
+                    removed_red = successor.red
+                    child = successor.right
+                    if successor.parent is node:
+                        child.parent = successor
+                    else:
+                        self._transplant(successor, child)
+                        successor.right = node.right
+                        successor.right.parent = successor
+                    self._transplant(node, successor)
+                    successor.left = node.left
+                    successor.left.parent = successor
+                    successor.red = node.red
+                if not removed_red:
+                    self.delete_fixup(child)
+                self.NIL.parent = None
+                return True
+
+        def delete_fixup(self, node) -> None:
+            """
+            Fixes the Red-Black Tree after deletion to maintain its properties.
+
+            Args:
+                node (BinaryTree._RBNode): The node that took the place of the removed black node.
+            """
+            if not isinstance(node, BinaryTree._RBNode):
+                raise TypeError(
+                    "node must be an instance of BinaryTree._RBNode"
+                )
+            while node is not self.root and not node.red:
+                parent = node.parent
+                if node is parent.left:
+                    sibling = parent.right
+                    if sibling.red:
+                        sibling.red = False
+                        parent.red = True
+                        self.left_rotate(parent)
+                        sibling = parent.right
+                    if not sibling.left.red and not sibling.right.red:
+                        sibling.red = True
+                        node = parent
+                    else:
+                        if not sibling.right.red:
+                            sibling.left.red = False
+                            sibling.red = True
+                            self.right_rotate(sibling)
+                            sibling = parent.right
+                        sibling.red = parent.red
+                        parent.red = False
+                        sibling.right.red = False
+                        self.left_rotate(parent)
+                        node = self.root
+                else:
+                    sibling = parent.left
+                    if sibling.red:
+                        sibling.red = False
+                        parent.red = True
+                        self.right_rotate(parent)
+                        sibling = parent.left
+                    if not sibling.right.red and not sibling.left.red:
+                        sibling.red = True
+                        node = parent
+                    else:
+                        if not sibling.left.red:
+                            sibling.right.red = False
+                            sibling.red = True
+                            self.left_rotate(sibling)
+                            sibling = parent.left
+                        sibling.red = parent.red
+                        parent.red = False
+                        sibling.left.red = False
+                        self.right_rotate(parent)
+                        node = self.root
+            node.red = False
+
+        def search(self, key: int) -> bool:
+            """
+            Searches for a key in the Red-Black Tree.
+
+            Args:
+                key (int): The key to search for.
+
+            Returns:
+                bool: True if the key is found, False otherwise.
+            """
+            with self._lock:
+                return self._find(key) is not self.NIL
+
+        def __contains__(self, key: int) -> bool:
+            return self.search(key)
+
+        def get(self, key: int, default=None):
+            """
+            Returns the value attached to a key.
+
+            Args:
+                key (int): The key to look up.
+                default: The value returned when the key is absent. Defaults to None.
+
+            Returns:
+                The value of the key, or default.
+            """
+            with self._lock:
+                node = self._find(key)
+                return default if node is self.NIL else node.value
+
+        def floor(self, key: int) -> Optional[int]:
+            """
+            Returns the largest key less than or equal to key.
+
+            Args:
+                key (int): The bound.
+
+            Returns:
+                Optional[int]: The floor key, None if every key is greater.
+            """
+            with self._lock:
+                node, best = self.root, None
+                while node is not self.NIL:
+                    if node.data == key:
+                        return key
+                    if node.data < key:
+                        best = node.data
+                        node = node.right
+                    else:
+                        node = node.left
+                return best
+
+        def ceiling(self, key: int) -> Optional[int]:
+            """
+            Returns the smallest key greater than or equal to key.
+
+            Args:
+                key (int): The bound.
+
+            Returns:
+                Optional[int]: The ceiling key, None if every key is smaller.
+            """
+            with self._lock:
+                node, best = self.root, None
+                while node is not self.NIL:
+                    if node.data == key:
+                        return key
+                    if node.data > key:
+                        best = node.data
+                        node = node.left
+                    else:
+                        node = node.right
+                return best
+
+        def min(self) -> int:
+            """
+            Returns the smallest key in O(1).
+
+            Returns:
+                int: The smallest key.
+
+            Raises:
+                ValueError: If the tree is empty.
+            """
+            if self._min is self.NIL:
+                raise ValueError("min() of an empty tree")
+            return self._min.data
+
+        def max(self) -> int:
+            """
+            Returns the largest key in O(1).
+
+            Returns:
+                int: The largest key.
+
+            Raises:
+                ValueError: If the tree is empty.
+            """
+            if self._max is self.NIL:
+                raise ValueError("max() of an empty tree")
+            return self._max.data
+
+        def __len__(self) -> int:
+            return self._len
+
+        def _nodes(self, lo=None, hi=None, inclusive: tuple = (True, True)):
+            """
+            Yields the nodes whose keys lie between lo and hi, in order, following successor links.
+
+            Args:
+                lo (Optional[int]): The lower bound, None for no lower bound.
+                hi (Optional[int]): The upper bound, None for no upper bound.
+                inclusive (tuple[bool, bool]): Whether each bound is included.
+
+            Yields:
+                BinaryTree._RBNode: The nodes in range.
+            """
+            with self._lock:
+                if lo is None:
+                    node = self._min
+                else:
+                    node, candidate = self.root, self.NIL
+                    while node is not self.NIL:
+                        if node.data > lo or (inclusive[0] and node.data == lo):
+                            candidate = node
+                            node = node.left
+                        else:
+                            node = node.right
+                    node = candidate
+            while node is not self.NIL:
+                if hi is not None and (node.data > hi or (not inclusive[1] and node.data == hi)):
+                    return
+                yield node
+                with self._lock:
+                    node = self._step(node)
+
+        def range(self, lo=None, hi=None, inclusive: tuple = (True, True)):
+            """
+            Iterates lazily over the keys between lo and hi, in order.
+
+            Finding the first key takes O(log n), every further key O(1) amortized.
+
+            Args:
+                lo (Optional[int]): The lower bound, None for no lower bound.
+                hi (Optional[int]): The upper bound, None for no upper bound.
+                inclusive (tuple[bool, bool]): Whether each bound is included.
+
+            Returns:
+                Iterator[int]: The keys in range.
+            """
+            return (node.data for node in self._nodes(lo, hi, inclusive))
+
+        def items(self, lo=None, hi=None, inclusive: tuple = (True, True)):
+            """
+            Iterates lazily over the (key, value) pairs between lo and hi, in order.
+
+            Args:
+                lo (Optional[int]): The lower bound, None for no lower bound.
+                hi (Optional[int]): The upper bound, None for no upper bound.
+                inclusive (tuple[bool, bool]): Whether each bound is included.
+
+            Returns:
+                Iterator[tuple]: The pairs in range.
+            """
+            return ((node.data, node.value) for node in self._nodes(lo, hi, inclusive))
+
+        def __iter__(self):
+            return self.range()
+
+        def insert_fixup(self, node) -> None:
             """
             Fixes the Red-Black Tree after insertion to maintain its properties.
 
@@ -559,39 +1543,38 @@ class BinaryTree:
                 raise TypeError(
                     "node must be an instance of BinaryTree._RBNode"
                 )
-            while node != cls.root and node.parent.color == "red":
+            while node != self.root and node.parent.red:
                 if node.parent == node.parent.parent.left:
                     uncle = node.parent.parent.right
-                    if uncle.color == "red":
-                        node.parent.color = "black"
-                        uncle.color = "black"
-                        node.parent.parent.color = "red"
+                    if uncle.red:
+                        node.parent.red = False
+                        uncle.red = False
+                        node.parent.parent.red = True
                         node = node.parent.parent
                     else:
                         if node == node.parent.right:
                             node = node.parent
-                            cls.left_rotate(node)
-                        node.parent.color = "black"
-                        node.parent.parent.color = "red"
-                        cls.right_rotate(node.parent.parent)
+                            self.left_rotate(node)
+                        node.parent.red = False
+                        node.parent.parent.red = True
+                        self.right_rotate(node.parent.parent)
                 else:
                     uncle = node.parent.parent.left
-                    if uncle.color == "red":
-                        node.parent.color = "black"
-                        uncle.color = "black"
-                        node.parent.parent.color = "red"
+                    if uncle.red:
+                        node.parent.red = False
+                        uncle.red = False
+                        node.parent.parent.red = True
                         node = node.parent.parent
                     else:
                         if node == node.parent.left:
                             node = node.parent
-                            cls.right_rotate(node)
-                        node.parent.color = "black"
-                        node.parent.parent.color = "red"
-                        cls.left_rotate(node.parent.parent)
-            cls.root.color = "black"
+                            self.right_rotate(node)
+                        node.parent.red = False
+                        node.parent.parent.red = True
+                        self.left_rotate(node.parent.parent)
+            self.root.red = False
 
-        @classmethod
-        def rotate(cls, node, direction: str) -> None:
+        def rotate(self, node, direction: str) -> None:
             """
             Rotates the subtree rooted at the given node in the specified direction.
 
@@ -606,11 +1589,11 @@ class BinaryTree:
             opposite = "left" if direction == "right" else "right"
             child = getattr(node, direction)
             setattr(node, direction, getattr(child, opposite))
-            if getattr(child, opposite) != cls.NIL:
+            if getattr(child, opposite) != self.NIL:
                 getattr(child, opposite).parent = node
             child.parent = node.parent
             if not node.parent:
-                cls.root = child
+                self.root = child
             elif node == getattr(node.parent, opposite):
                 setattr(node.parent, opposite, child)
             else:
@@ -618,8 +1601,7 @@ class BinaryTree:
             setattr(child, opposite, node)
             node.parent = child
 
-        @classmethod
-        def left_rotate(cls, x) -> None:
+        def left_rotate(self, x) -> None:
             """
             Performs a left rotation on the subtree rooted at the given node.
 
@@ -628,10 +1610,9 @@ class BinaryTree:
             """
             if not isinstance(x, BinaryTree._RBNode):
                 raise TypeError("x must be an instance of BinaryTree._RBNode")
-            cls.rotate(x, "right")
+            self.rotate(x, "right")
 
-        @classmethod
-        def right_rotate(cls, y) -> None:
+        def right_rotate(self, y) -> None:
             """
             Performs a right rotation on the subtree rooted at the given node.
 
@@ -640,96 +1621,189 @@ class BinaryTree:
             """
             if not isinstance(y, BinaryTree._RBNode):
                 raise TypeError("y must be an instance of BinaryTree._RBNode")
-            cls.rotate(y, "left")
+            self.rotate(y, "left")
 
-        @classmethod
-        def __repr__(cls) -> str:
+        def __repr__(self) -> str:
             """
             Returns a string representation of the Red-Black Tree.
 
             Returns:
-                str: A string representation of the tree.
+                str: The keys in order.
             """
-
-            def recurse(node: BinaryTree._RBNode) -> List[Optional[int]]:
-                if node == cls.NIL:
-                    return []
-                return recurse(node.left) + [node.data] + recurse(node.right)
-
-            return str(recurse(cls.root))
+            return str(list(self))
 
     class BPlusTree:
         """
-        Represents a B+ Tree.
+        Represents a B+ Tree, used as an ordered map from keys to values.
+
+        Keys and values live in the leaves, which form a doubly linked list, so a range scan costs
+        O(log n + k). Internal nodes only route: keys smaller than a separator go to its left, the
+        others to its right. Nodes hold at most fanout - 1 keys and are searched with bisect.
+
+        Every instance holds its own nodes. Splits and merges move keys between nodes, so readers
+        take the instance lock as well as writers. The lazy iterators take it one leaf at a time and,
+        like a dict, must not be used across a mutation of the tree.
 
         Attributes:
             root (BinaryTree._BPlusTreeNode): The root node of the B+ tree.
             t (int): The minimum degree of the B+ tree.
+            fanout (int): The maximum number of children of a node.
         """
 
-        @classmethod
-        def __init__(cls, t: int = 3) -> None:
+        def __init__(self, t: int = 3, lock=None, fanout: Optional[int] = None) -> None:
             """
-            Initializes the B+ tree with a given minimum degree.
+            Initializes the B+ tree with a given minimum degree or fanout.
 
             Args:
-                t (int): The minimum degree of the B+ tree. Default is 3.
-            """
-            cls.root: BinaryTree._BPlusTreeNode = (
+                t (int): The minimum degree of the B+ tree, giving a fanout of 2 * t. Default is 3.
+                lock (bool | ContextManager | None): See BinaryTree._make_lock. Defaults to no locking.
+                fanout (Optional[int]): The maximum number of children of a node, overriding t.
+
+            Raises:
+                ValueError: If t is below 2 or fanout below 4.
+            """
+            if fanout is None:
+                if t < 2:
+                    raise ValueError("t must be at least 2")
+                fanout = 2 * t
+            elif fanout < 4:
+                raise ValueError("fanout must be at least 4")
+            self._lock = BinaryTree._make_lock(lock)
+            self.root: BinaryTree._BPlusTreeNode = (
                 BinaryTree._BPlusTreeNode(is_leaf=True)
             )
-            cls.t: int = t
+            self.t: int = fanout // 2
+            self.fanout: int = fanout
+            self._max_keys: int = fanout - 1
+            self._min_leaf: int = (fanout - 1) // 2
+            self._min_internal: int = (fanout - 2) // 2
+            self._len: int = 0
 
         @classmethod
-        def insert(cls, key: int) -> None:
+        def bulk_load(cls, keys, values=None, t: int = 3, lock=None, fanout: Optional[int] = None):
             """
-            Inserts a key into the B+ tree.
+            Builds a B+ tree bottom-up from sorted keys in O(n), with full leaves.
 
             Args:
-                key (int): The key to insert.
+                keys (Iterable[int]): The keys, in strictly ascending order.
+                values (Optional[Iterable]): The values of the keys. Defaults to None for every key.
+                t (int): The minimum degree of the B+ tree. Default is 3.
+                lock (bool | ContextManager | None): See BinaryTree._make_lock. Defaults to no locking.
+                fanout (Optional[int]): The maximum number of children of a node, overriding t.
+
+            Returns:
+                BinaryTree.BPlusTree: The new tree.
+
+            Raises:
+                ValueError: If the keys are not strictly ascending or the values do not match them.
+            """
+            tree = cls(t=t, lock=lock, fanout=fanout)
+            keys = list(keys)
+            values = [None] * len(keys) if values is None else list(values)
+            if len(values) != len(keys):
+                raise ValueError("values must have one value per key")
+            if any(keys[i] >= keys[i + 1] for i in range(len(keys) - 1)):
+                raise ValueError("keys must be sorted in strictly ascending order")
+            if not keys:
+                return tree
+
+            level = []
+            previous = None
+            for lo, hi in cls._chunks(len(keys), tree._max_keys, tree._min_leaf):
+                leaf = BinaryTree._BPlusTreeNode(is_leaf=True)
+                leaf.keys = keys[lo:hi]
+                leaf.values = values[lo:hi]
+                leaf.prev = previous
+                if previous:
+                    previous.next = leaf
+                previous = leaf
+                level.append((leaf.keys[0], leaf))
+            while len(level) > 1:
+                parents = []
+                for lo, hi in cls._chunks(len(level), tree.fanout, tree._min_internal + 1):
+                    node = BinaryTree._BPlusTreeNode()
+                    node.keys = [first for first, _ in level[lo + 1:hi]]
+                    node.children = [child for _, child in level[lo:hi]]
+                    parents.append((level[lo][0], node))
+                level = parents
+            tree.root = level[0][1]
+            tree._len = len(keys)
+            return tree
+
+        @staticmethod
+        def _chunks(n: int, size: int, minimum: int):
             """
-            root = cls.root
-            if len(root.keys) == (2 * cls.t) - 1:
-                temp = BinaryTree._BPlusTreeNode()
-                cls.root = temp
-                temp.children.append(root)
-                cls.split_child(temp, 0)
-                cls.insert_non_full(temp, key)
-            else:
-                cls.insert_non_full(root, key)
+            Splits range(n) into runs of size items, evening out the last two if the last is too small.
 
-        @classmethod
-        def insert_non_full(cls, node, key: int) -> None:
+            Args:
+                n (int): The number of items.
+                size (int): The size of a full run.
+                minimum (int): The smallest size allowed for a run when there are several.
+
+            Returns:
+                List[tuple]: The (start, stop) bounds of the runs.
+            """
+            bounds = [(lo, min(lo + size, n)) for lo in range(0, n, size)]
+            if len(bounds) > 1 and bounds[-1][1] - bounds[-1][0] < minimum:
+                lo, hi = bounds[-2][0], n
+                mid = (lo + hi) // 2
+                bounds[-2:] = [(lo, mid), (mid, hi)]
+            return bounds
+
+        def insert(self, key: int, value=None) -> None:
+            """
+            Inserts a key into the B+ tree, or replaces the value of an existing key.
+
+            Args:
+                key (int): The key to insert.
+                value: The value attached to the key. Defaults to None.
+            """
+            with self._lock:
+                root = self.root
+                if len(root.keys) == self._max_keys:
+                    temp = BinaryTree._BPlusTreeNode()
+                    self.root = temp
+                    temp.children.append(root)
+                    self.split_child(temp, 0)
+                    self.insert_non_full(temp, key, value)
+                else:
+                    self.insert_non_full(root, key, value)
+
+        def insert_non_full(self, node, key: int, value=None) -> None:
             """
-            Inserts a key into a non-full node of the B+ tree.
+            Inserts a key below a non-full node of the B+ tree, splitting full nodes on the way down.
 
             Args:
                 node (BinaryTree._BPlusTreeNode): The node to insert the key into.
                 key (int): The key to insert.
+                value: The value attached to the key. Defaults to None.
             """
             if not isinstance(node, BinaryTree._BPlusTreeNode):
                 raise TypeError(
                     "node must be an instance of BinaryTree._BPlusTreeNode"
                 )
-            if node.is_leaf:
-                node.keys.append(key)
-                node.keys.sort()
-            else:
-                i = len(node.keys) - 1
-                while i >= 0 and key < node.keys[i]:
-                    i -= 1
-                i += 1
-                if len(node.children[i].keys) == (2 * cls.t) - 1:
-                    cls.split_child(node, i)
-                    if key > node.keys[i]:
+            while not node.is_leaf:
+                i = bisect_right(node.keys, key)
+                if len(node.children[i].keys) == self._max_keys:
+                    self.split_child(node, i)
+                    if key >= node.keys[i]:
                         i += 1
-                cls.insert_non_full(node.children[i], key)
+                node = node.children[i]
+            i = bisect_left(node.keys, key)
+            if i < len(node.keys) and node.keys[i] == key:
+                node.values[i] = value
+                return
+            node.keys.insert(i, key)
+            node.values.insert(i, value)
+            self._len += 1
 
-        @classmethod
-        def split_child(cls, node, i: int) -> None:
+        def split_child(self, node, i: int) -> None:
             """
             Splits a child node of the B+ tree.
 
+            A leaf keeps its lower half and its first key of the upper half is copied up as the
+            separator; an internal node moves its middle key up.
+
             Args:
                 node (BinaryTree._BPlusTreeNode): The node whose child is to be split.
                 i (int): The index of the child to split.
@@ -738,19 +1812,121 @@ class BinaryTree:
                 raise TypeError(
                     "node must be an instance of BinaryTree._BPlusTreeNode"
                 )
-            t = cls.t
             y = node.children[i]
             z = BinaryTree._BPlusTreeNode(is_leaf=y.is_leaf)
+            mid = len(y.keys) // 2
+            if y.is_leaf:
+                z.keys, y.keys = y.keys[mid:], y.keys[:mid]
+                z.values, y.values = y.values[mid:], y.values[:mid]
+                separator = z.keys[0]
+                z.prev, z.next = y, y.next
+                if y.next:
+                    y.next.prev = z
+                y.next = z
+            else:
+                separator = y.keys[mid]
+                z.keys, y.keys = y.keys[mid + 1:], y.keys[:mid]
+                z.children, y.children = y.children[mid + 1:], y.children[:mid + 1]
+            node.keys.insert(i, separator)
             node.children.insert(i + 1, z)
-            node.keys.insert(i, y.keys[t - 1])
-            z.keys = y.keys[t: (2 * t) - 1]
-            y.keys = y.keys[0: t - 1]
-            if not y.is_leaf:
-                z.children = y.children[t: (2 * t)]
-                y.children = y.children[0:t]
 
-        @classmethod
-        def search(cls, key: int, node=None) -> bool:
+        def delete(self, key: int) -> bool:
+            """
+            Deletes a key from the B+ tree, borrowing from or merging with a sibling on underflow.
+
+            Args:
+                key (int): The key to delete.
+
+            Returns:
+                bool: True if the key was found and deleted, False otherwise.
+            """
+            with self._lock:
+                path = []
+                node = self.root
+                while not node.is_leaf:
+                    i = bisect_right(node.keys, key)
+                    path.append((node, i))
+                    node = node.children[i]
+                i = bisect_left(node.keys, key)
+                if i == len(node.keys) or node.keys[i] != key:
+                    return False
+                del node.keys[i]
+                del node.values[i]
+                self._len -= 1
+
+                while path:
+                    minimum = self._min_leaf if node.is_leaf else self._min_internal
+                    if len(node.keys) >= minimum:
+                        break
+                    parent, i = path.pop()
+                    self._rebalance(parent, i)
+                    node = parent
+                if not self.root.is_leaf and not self.root.keys:
+                    self.root = self.root.children[0]
+                return True
+
+        def _rebalance(self, parent, i: int) -> None:
+            """
+            Refills the underfull child i of parent from a sibling, or merges it with one.
+
+            Args:
+                parent (BinaryTree._BPlusTreeNode): The parent of the underfull node.
+                i (int): The index of the underfull node among the children of parent.
+            """
+            node = parent.children[i]
+            minimum = self._min_leaf if node.is_leaf else self._min_internal
+            left = parent.children[i - 1] if i > 0 else None
+            right = parent.children[i + 1] if i + 1 < len(parent.children) else None
+            if left and len(left.keys) > minimum:
+                if node.is_leaf:
+                    node.keys.insert(0, left.keys.pop())
+                    node.values.insert(0, left.values.pop())
+                    parent.keys[i - 1] = node.keys[0]
+                else:
+                    node.keys.insert(0, parent.keys[i - 1])
+                    parent.keys[i - 1] = left.keys.pop()
+                    node.children.insert(0, left.children.pop())
+            elif right and len(right.keys) > minimum:
+                if node.is_leaf:
+                    node.keys.append(right.keys.pop(0))
+                    node.values.append(right.values.pop(0))
+                    parent.keys[i] = right.keys[0]
+                else:
+                    node.keys.append(parent.keys[i])
+                    parent.keys[i] = right.keys.pop(0)
+                    node.children.append(right.children.pop(0))
+            else:
+                if left:
+                    i -= 1
+                    node, right = left, node
+                if node.is_leaf:
+                    node.keys += right.keys
+                    node.values += right.values
+                    node.next = right.next
+                    if right.next:
+                        right.next.prev = node
+                else:
+                    node.keys += [parent.keys[i]] + right.keys
+                    node.children += right.children
+                del parent.keys[i]
+                del parent.children[i + 1]
+
+        def _leaf(self, key: int):
+            """
+            Returns the leaf whose key range covers key.
+
+            Args:
+                key (int): The key to look for.
+
+            Returns:
+                BinaryTree._BPlusTreeNode: The leaf.
+            """
+            node = self.root
+            while not node.is_leaf:
+                node = node.children[bisect_right(node.keys, key)]
+            return node
+
+        def search(self, key: int, node=None) -> bool:
             """
             Searches for a key in the B+ tree.
 
@@ -761,26 +1937,113 @@ class BinaryTree:
             Returns:
                 bool: True if the key is found, False otherwise.
             """
-            if (
-                    not isinstance(node, BinaryTree._BPlusTreeNode)
-                    and node is not None
-            ):
-                raise TypeError(
-                    "node must be an instance of BinaryTree._BPlusTreeNode"
-                )
-            if not node:
-                node = cls.root
-            i = 0
-            while i < len(node.keys) and key > node.keys[i]:
-                i += 1
-            if i < len(node.keys) and key == node.keys[i]:
-                return True
-            if node.is_leaf:
-                return False
-            return cls.search(key, node.children[i])
+            with self._lock:
+                if (
+                        not isinstance(node, BinaryTree._BPlusTreeNode)
+                        and node is not None
+                ):
+                    raise TypeError(
+                        "node must be an instance of BinaryTree._BPlusTreeNode"
+                    )
+                if not node:
+                    node = self.root
+                while not node.is_leaf:
+                    node = node.children[bisect_right(node.keys, key)]
+                i = bisect_left(node.keys, key)
+                return i < len(node.keys) and node.keys[i] == key
 
-        @classmethod
-        def traverse(cls, node=None, level: int = 0) -> List[str]:
+        def __contains__(self, key: int) -> bool:
+            return self.search(key)
+
+        def get(self, key: int, default=None):
+            """
+            Returns the value attached to a key.
+
+            Args:
+                key (int): The key to look up.
+                default: The value returned when the key is absent. Defaults to None.
+
+            Returns:
+                The value of the key, or default.
+            """
+            with self._lock:
+                leaf = self._leaf(key)
+                i = bisect_left(leaf.keys, key)
+                if i < len(leaf.keys) and leaf.keys[i] == key:
+                    return leaf.values[i]
+                return default
+
+        def __len__(self) -> int:
+            return self._len
+
+        def items(self, lo=None, hi=None, inclusive: tuple = (True, True), reverse: bool = False):
+            """
+            Iterates lazily over the (key, value) pairs between lo and hi along the leaf chain.
+
+            Args:
+                lo (Optional[int]): The lower bound, None for no lower bound.
+                hi (Optional[int]): The upper bound, None for no upper bound.
+                inclusive (tuple[bool, bool]): Whether each bound is included.
+                reverse (bool): Iterate from hi down to lo instead.
+
+            Yields:
+                tuple: The pairs in range.
+            """
+            with self._lock:
+                if reverse:
+                    if hi is None:
+                        leaf = self.root
+                        while not leaf.is_leaf:
+                            leaf = leaf.children[-1]
+                        i = None
+                    else:
+                        leaf = self._leaf(hi)
+                        i = (bisect_right if inclusive[1] else bisect_left)(leaf.keys, hi)
+                else:
+                    if lo is None:
+                        leaf = self.root
+                        while not leaf.is_leaf:
+                            leaf = leaf.children[0]
+                        i = None
+                    else:
+                        leaf = self._leaf(lo)
+                        i = (bisect_left if inclusive[0] else bisect_right)(leaf.keys, lo)
+            while leaf:
+                with self._lock:
+                    keys, values = leaf.keys[:], leaf.values[:]
+                    leaf = leaf.prev if reverse else leaf.next
+                if reverse:
+                    for j in range(len(keys) - 1 if i is None else i - 1, -1, -1):
+                        if lo is not None and (keys[j] < lo or (not inclusive[0] and keys[j] == lo)):
+                            return
+                        yield keys[j], values[j]
+                else:
+                    for j in range(i or 0, len(keys)):
+                        if hi is not None and (keys[j] > hi or (not inclusive[1] and keys[j] == hi)):
+                            return
+                        yield keys[j], values[j]
+                # Past the first leaf, the whole leaf is in range up to the far bound.
+                i = None
+
+        def range(self, lo=None, hi=None, inclusive: tuple = (True, True), reverse: bool = False):
+            """
+            Iterates lazily over the keys between lo and hi along the leaf chain, in O(log n + k).
+
+            Args:
+                lo (Optional[int]): The lower bound, None for no lower bound.
+                hi (Optional[int]): The upper bound, None for no upper bound.
+                inclusive (tuple[bool, bool]): Whether each bound is included.
+                reverse (bool): Iterate from hi down to lo instead.
+
+            Returns:
+                Iterator[int]: The keys in range.
+            """
+            return (key for key, _ in self.items(lo, hi, inclusive, reverse))
+
+        def __iter__(self):
+            return self.range()
+
+        def traverse(self, node=None, level: int = 0) -> List[str]:
             """
             Traverses the B+ tree and returns a list of strings representing the keys at each level.
 
@@ -791,57 +2054,63 @@ class BinaryTree:
             Returns:
                 List[str]: A list of strings representing the keys at each level.
             """
-            if (
-                    not isinstance(node, BinaryTree._BPlusTreeNode)
-                    and node is not None
-            ):
-                raise TypeError(
-                    "node must be an instance of BinaryTree._BPlusTreeNode"
-                )
-            if not node:
-                node = cls.root
-            result = [f"Level {level}: " + " ".join(str(key) for key in node.keys)]
-            if not node.is_leaf:
-                for child in node.children:
-                    result.extend(cls.traverse(child, level + 1))
-            return result
+            with self._lock:
+                if (
+                        not isinstance(node, BinaryTree._BPlusTreeNode)
+                        and node is not None
+                ):
+                    raise TypeError(
+                        "node must be an instance of BinaryTree._BPlusTreeNode"
+                    )
+                if not node:
+                    node = self.root
+                result = []
+                stack = [(node, level)]
+                while stack:
+                    node, level = stack.pop()
+                    result.append(f"Level {level}: " + " ".join(str(key) for key in node.keys))
+                    if not node.is_leaf:
+                        stack.extend((child, level + 1) for child in reversed(node.children))
+                return result
 
     class SegmentTree:
         """
         Represents a Segment Tree.
 
+        Every instance holds its own array. An update rewrites a whole path of partial sums, so
+        queries take the instance lock as well as updates.
+
         Attributes:
             n (int): The size of the input data.
             tree (List[int]): The segment tree represented as a list.
         """
 
-        @classmethod
-        def __init__(cls, data: List[int]) -> None:
+        def __init__(self, data: List[int], lock=None) -> None:
             """
             Initializes the Segment Tree with the given data.
 
             Args:
                 data (List[int]): The input data to build the segment tree from.
+                lock (bool | ContextManager | None): See BinaryTree._make_lock. Defaults to no locking.
             """
-            cls.n: int = len(data)
-            cls.tree: List[int] = [0] * (2 * cls.n)
-            cls.__build(data)
+            self._lock = BinaryTree._make_lock(lock)
+            self.n: int = len(data)
+            self.tree: List[int] = [0] * (2 * self.n)
+            self.__build(data)
 
-        @classmethod
-        def __build(cls, data: List[int]) -> None:
+        def __build(self, data: List[int]) -> None:
             """
             Builds the segment tree from the given data.
 
             Args:
                 data (List[int]): The input data to build the segment tree from.
             """
-            for i in range(cls.n):
-                cls.tree[cls.n + i] = data[i]
-            for i in range(cls.n - 1, 0, -1):
-                cls.tree[i] = cls.tree[i * 2] + cls.tree[i * 2 + 1]
+            for i in range(self.n):
+                self.tree[self.n + i] = data[i]
+            for i in range(self.n - 1, 0, -1):
+                self.tree[i] = self.tree[i * 2] + self.tree[i * 2 + 1]
 
-        @classmethod
-        def update(cls, pos: int, value: int) -> None:
+        def update(self, pos: int, value: int) -> None:
             """
             Updates the value at the given position in the segment tree.
 
@@ -849,14 +2118,14 @@ class BinaryTree:
                 pos (int): The position to update.
                 value (int): The new value to set.
             """
-            pos += cls.n
-            cls.tree[pos] = value
-            while pos > 1:
-                pos //= 2
-                cls.tree[pos] = cls.tree[2 * pos] + cls.tree[2 * pos + 1]
+            with self._lock:
+                pos += self.n
+                self.tree[pos] = value
+                while pos > 1:
+                    pos //= 2
+                    self.tree[pos] = self.tree[2 * pos] + self.tree[2 * pos + 1]
 
-        @classmethod
-        def query(cls, left: int, right: int) -> int:
+        def query(self, left: int, right: int) -> int:
             """
             Queries the sum of the values in the given range [left, right] in the segment tree.
 
@@ -867,19 +2136,20 @@ class BinaryTree:
             Returns:
                 int: The sum of the values in the given range.
             """
-            left += cls.n
-            right += cls.n
-            sum_query = 0
-            while left <= right:
-                if left % 2 == 1:
-                    sum_query += cls.tree[left]
-                    left += 1
-                if right % 2 == 0:
-                    sum_query += cls.tree[right]
-                    right -= 1
-                left //= 2
-                right //= 2
-            return sum_query
+            with self._lock:
+                left += self.n
+                right += self.n
+                sum_query = 0
+                while left <= right:
+                    if left % 2 == 1:
+                        sum_query += self.tree[left]
+                        left += 1
+                    if right % 2 == 0:
+                        sum_query += self.tree[right]
+                        right -= 1
+                    left //= 2
+                    right //= 2
+                return sum_query
 
     class Default:
         def insert(self, root, key: int):
@@ -1,20 +1,24 @@
 class Find:
     class InArray:
         @staticmethod
-        def __sort(List: list) -> list[int | float]:
+        def __extreme(List: list, pick) -> int | float | None:
             """
-            Sort a list of integers and floats.
+            Pick the largest or smallest of the integers and floats in a list in a single pass.
 
-            :param List: The list to sort.
-            :return: A sorted list of integers and floats.
+            :param List: The list to search.
+            :param pick: Either max or min.
+            :return: The picked number, or None if the list holds no numbers.
             :raises Exception: If the input list is None.
             """
             if List is None:
                 raise Exception("No input given.")
-            converted_list = sorted(
-                float(item) for item in List if isinstance(item, (int, float))
+            value = pick(
+                (float(item) for item in List if isinstance(item, (int, float))),
+                default=None,
             )
-            return [int(item) if item.is_integer() else item for item in converted_list]
+            if value is None:
+                return None
+            return int(value) if value.is_integer() else value
 
         @classmethod
         def largest_number(cls, List: list[int | float]) -> int | float:
@@ -27,8 +31,7 @@ class Find:
             """
             if List is None:
                 raise Exception("No input given.")
-            sorted_list = cls.__sort(List)
-            return sorted_list[-1] if sorted_list else None
+            return cls.__extreme(List, max)
 
         @classmethod
         def smallest_number(cls, List: list[int | float]) -> int | float:
@@ -41,8 +44,7 @@ class Find:
             """
             if List is None:
                 raise Exception("No input given.")
-            sorted_list = cls.__sort(List)
-            return sorted_list[0] if sorted_list else None
+            return cls.__extreme(List, min)
 
         class Objects:
             @staticmethod
@@ -0,0 +1,463 @@
+import operator
+from itertools import count
+from typing import Any, Callable, Hashable, Iterable, Iterator
+
+
+class Heap:
+    @staticmethod
+    def _less(reverse: bool) -> Callable[[Any, Any], bool]:
+        """
+        Returns the comparison placing a value above another in a min-heap, or a max-heap when reverse is True.
+        """
+        return (lambda a, b: b < a) if reverse else operator.lt
+
+    @classmethod
+    def sift_down(cls, arr: list, i: int, n: int | None = None, d: int = 2, reverse: bool = False) -> None:
+        """
+        Moves arr[i] down a d-ary heap until none of its children belongs above it.
+
+        The value is held aside and the children are moved up into the hole, so each level costs
+        one write instead of a swap, and the loop is iterative.
+
+        Args:
+            arr (list): The heap.
+            i (int): The index of the value to move.
+            n (int | None): The size of the heap, defaults to the length of arr.
+            d (int): The number of children of each node.
+            reverse (bool): If True, arr is a max-heap.
+        """
+        less = cls._less(reverse)
+        n = len(arr) if n is None else n
+        value = arr[i]
+        while True:
+            first = d * i + 1
+            if first >= n:
+                break
+            best = first
+            for child in range(first + 1, min(first + d, n)):
+                if less(arr[child], arr[best]):
+                    best = child
+            if not less(arr[best], value):
+                break
+            arr[i] = arr[best]
+            i = best
+        arr[i] = value
+
+    @classmethod
+    def sift_up(cls, arr: list, i: int, d: int = 2, reverse: bool = False) -> None:
+        """
+        Moves arr[i] up a d-ary heap until its parent does not belong below it.
+
+        Args:
+            arr (list): The heap.
+            i (int): The index of the value to move.
+            d (int): The number of children of each node.
+            reverse (bool): If True, arr is a max-heap.
+        """
+        less = cls._less(reverse)
+        value = arr[i]
+        while i > 0:
+            parent = (i - 1) // d
+            if not less(value, arr[parent]):
+                break
+            arr[i] = arr[parent]
+            i = parent
+        arr[i] = value
+
+    @classmethod
+    def heapify(cls, arr: list, d: int = 2, reverse: bool = False) -> list:
+        """
+        Turns a list into a d-ary heap in place in O(n), sifting down every internal node bottom-up.
+
+        Args:
+            arr (list): The list to turn into a heap.
+            d (int): The number of children of each node.
+            reverse (bool): If True, builds a max-heap instead of a min-heap.
+
+        Returns:
+            list: The heap.
+
+        Raises:
+            ValueError: If d is less than 2.
+        """
+        if d < 2:
+            raise ValueError("d must be at least 2")
+        n = len(arr)
+        for i in range((n - 2) // d, -1, -1):
+            cls.sift_down(arr, i, n, d, reverse)
+        return arr
+
+    @classmethod
+    def merge(cls, *iterables: Iterable, key: Callable | None = None, reverse: bool = False) -> Iterator:
+        """
+        Lazily merges sorted iterables into one sorted iterator.
+
+        The current head of every iterable sits in a heap; the smallest head is yielded and
+        replaced by the next value of its iterable with a single sift down. Equal values come out
+        in the order of their iterables, so the merge is stable.
+
+        Args:
+            *iterables (Iterable): The sorted iterables.
+            key (Callable | None): Computes the sort key of each value, once per value.
+            reverse (bool): If True, the iterables are sorted in descending order.
+
+        Returns:
+            Iterator: The merged values.
+        """
+        # Entries are [key, order, value, iterator] lists, compared on the key then on the order of
+        # their iterable; the order is negated for a max-heap so ties still favour the first iterable.
+        heap = []
+        for index, iterable in enumerate(iterables):
+            iterator = iter(iterable)
+            for value in iterator:
+                heap.append([value if key is None else key(value), -index if reverse else index, value, iterator])
+                break
+        cls.heapify(heap, reverse=reverse)
+        while heap:
+            entry = heap[0]
+            yield entry[2]
+            for value in entry[3]:
+                entry[0] = value if key is None else key(value)
+                entry[2] = value
+                break
+            else:
+                entry = heap.pop()
+                if not heap:
+                    return
+                heap[0] = entry
+            cls.sift_down(heap, 0, reverse=reverse)
+
+    class DAry:
+        """
+        A priority queue stored in a d-ary array heap.
+
+        A wider node makes the tree shallower: pushes compare with fewer ancestors and pops touch
+        fewer, more cache friendly levels, at the price of d comparisons per level. d = 4 is a good
+        default for priority queues. The smallest value (or the largest one when reverse is True)
+        is popped first; with a key, values with equal keys are popped in insertion order.
+
+        Attributes:
+            d (int): The number of children of each node.
+        """
+
+        def __init__(
+                self,
+                iterable: Iterable = (),
+                d: int = 4,
+                key: Callable | None = None,
+                reverse: bool = False,
+        ) -> None:
+            """
+            Initializes the heap with the values of an iterable in O(n).
+
+            Args:
+                iterable (Iterable): The initial values.
+                d (int): The number of children of each node.
+                key (Callable | None): Computes the priority of each value, once per value.
+                reverse (bool): If True, pops the largest value first.
+
+            Raises:
+                ValueError: If d is less than 2.
+            """
+            if d < 2:
+                raise ValueError("d must be at least 2")
+            self.d: int = d
+            self._key = key
+            self._reverse = reverse
+            self._counter = count()
+            self._heap: list = [self._entry(value) for value in iterable]
+            Heap.heapify(self._heap, d, reverse)
+
+        def _entry(self, value):
+            """
+            Wraps a value with its key and an insertion counter when a key function is used.
+            """
+            if self._key is None:
+                return value
+            order = next(self._counter)
+            return self._key(value), -order if self._reverse else order, value
+
+        def _value(self, entry):
+            return entry if self._key is None else entry[2]
+
+        def push(self, value) -> None:
+            """
+            Adds a value.
+
+            Args:
+                value: The value to add.
+            """
+            self._heap.append(self._entry(value))
+            Heap.sift_up(self._heap, len(self._heap) - 1, self.d, self._reverse)
+
+        def pop(self):
+            """
+            Removes and returns the first value.
+
+            Returns:
+                The smallest value, or the largest one for a reversed heap.
+
+            Raises:
+                IndexError: If the heap is empty.
+            """
+            if not self._heap:
+                raise IndexError("pop from an empty heap")
+            last = self._heap.pop()
+            if not self._heap:
+                return self._value(last)
+            first = self._heap[0]
+            self._heap[0] = last
+            Heap.sift_down(self._heap, 0, None, self.d, self._reverse)
+            return self._value(first)
+
+        def peek(self):
+            """
+            Returns the first value without removing it.
+
+            Raises:
+                IndexError: If the heap is empty.
+            """
+            if not self._heap:
+                raise IndexError("peek at an empty heap")
+            return self._value(self._heap[0])
+
+        def replace(self, value):
+            """
+            Pops the first value and pushes a new one with a single sift, the new value may come out next.
+
+            Args:
+                value: The value to push.
+
+            Returns:
+                The popped value.
+
+            Raises:
+                IndexError: If the heap is empty.
+            """
+            if not self._heap:
+                raise IndexError("replace on an empty heap")
+            first = self._heap[0]
+            self._heap[0] = self._entry(value)
+            Heap.sift_down(self._heap, 0, None, self.d, self._reverse)
+            return self._value(first)
+
+        def pushpop(self, value):
+            """
+            Pushes a value then pops the first value, faster than push followed by pop.
+
+            Args:
+                value: The value to push.
+
+            Returns:
+                The popped value, which is the pushed one if it comes first.
+            """
+            entry = self._entry(value)
+            less = Heap._less(self._reverse)
+            if self._heap and less(self._heap[0], entry):
+                entry, self._heap[0] = self._heap[0], entry
+                Heap.sift_down(self._heap, 0, None, self.d, self._reverse)
+            return self._value(entry)
+
+        def __len__(self) -> int:
+            return len(self._heap)
+
+        def __bool__(self) -> bool:
+            return bool(self._heap)
+
+        def __iter__(self) -> Iterator:
+            """
+            Iterates over the values in heap order, not in sorted order.
+            """
+            return (self._value(entry) for entry in self._heap)
+
+    class Indexed:
+        """
+        A priority queue of distinct hashable items whose priorities can be changed in place.
+
+        Alongside the d-ary heap of priorities, a dictionary maps every item to its index in the
+        heap, so an update finds the item in O(1) and sifts it up or down in O(log n) instead of
+        pushing a duplicate entry. The item with the smallest priority is popped first.
+
+            queue = heap.Indexed()
+            queue.push("job", 5)
+            queue.decrease_key("job", 1)
+            queue.pop()  # ("job", 1)
+
+        Attributes:
+            d (int): The number of children of each node.
+        """
+
+        def __init__(self, items: Iterable[tuple[Hashable, Any]] = (), d: int = 4) -> None:
+            """
+            Initializes the queue with (item, priority) pairs in O(n).
+
+            Args:
+                items (Iterable[tuple[Hashable, Any]]): The initial items and priorities, a later
+                                                        pair for the same item replaces the earlier.
+                d (int): The number of children of each node.
+
+            Raises:
+                ValueError: If d is less than 2.
+            """
+            if d < 2:
+                raise ValueError("d must be at least 2")
+            self.d: int = d
+            self._priorities: list = []
+            self._items: list = []
+            self._position: dict = {}
+            for item, priority in items:
+                if item in self._position:
+                    self._priorities[self._position[item]] = priority
+                else:
+                    self._position[item] = len(self._items)
+                    self._items.append(item)
+                    self._priorities.append(priority)
+            for i in range((len(self._items) - 2) // d, -1, -1):
+                self._down(i)
+
+        def _move(self, i: int, item, priority) -> None:
+            self._items[i] = item
+            self._priorities[i] = priority
+            self._position[item] = i
+
+        def _up(self, i: int) -> None:
+            item, priority = self._items[i], self._priorities[i]
+            while i > 0:
+                parent = (i - 1) // self.d
+                if not priority < self._priorities[parent]:
+                    break
+                self._move(i, self._items[parent], self._priorities[parent])
+                i = parent
+            self._move(i, item, priority)
+
+        def _down(self, i: int) -> None:
+            item, priority = self._items[i], self._priorities[i]
+            priorities = self._priorities
+            n = len(priorities)
+            while True:
+                first = self.d * i + 1
+                if first >= n:
+                    break
+                best = first
+                for child in range(first + 1, min(first + self.d, n)):
+                    if priorities[child] < priorities[best]:
+                        best = child
+                if not priorities[best] < priority:
+                    break
+                self._move(i, self._items[best], priorities[best])
+                i = best
+            self._move(i, item, priority)
+
+        def push(self, item: Hashable, priority) -> None:
+            """
+            Adds an item, or changes its priority when it is already queued.
+
+            Args:
+                item (Hashable): The item.
+                priority: Its priority.
+            """
+            if item in self._position:
+                self.update(item, priority)
+                return
+            self._items.append(item)
+            self._priorities.append(priority)
+            self._position[item] = len(self._items) - 1
+            self._up(len(self._items) - 1)
+
+        def update(self, item: Hashable, priority) -> None:
+            """
+            Changes the priority of a queued item, in either direction.
+
+            Args:
+                item (Hashable): The item.
+                priority: Its new priority.
+
+            Raises:
+                KeyError: If the item is not queued.
+            """
+            i = self._position[item]
+            old = self._priorities[i]
+            self._priorities[i] = priority
+            if priority < old:
+                self._up(i)
+            else:
+                self._down(i)
+
+        def decrease_key(self, item: Hashable, priority) -> None:
+            """
+            Lowers the priority of a queued item.
+
+            Args:
+                item (Hashable): The item.
+                priority: Its new priority, not greater than the current one.
+
+            Raises:
+                KeyError: If the item is not queued.
+                ValueError: If the new priority is greater than the current one.
+            """
+            if self._priorities[self._position[item]] < priority:
+                raise ValueError("decrease_key cannot increase a priority")
+            self.update(item, priority)
+
+        def pop(self) -> tuple[Hashable, Any]:
+            """
+            Removes and returns the item with the smallest priority.
+
+            Returns:
+                tuple[Hashable, Any]: The item and its priority.
+
+            Raises:
+                IndexError: If the queue is empty.
+            """
+            if not self._items:
+                raise IndexError("pop from an empty heap")
+            result = self._items[0], self._priorities[0]
+            self._remove_at(0)
+            return result
+
+        def peek(self) -> tuple[Hashable, Any]:
+            """
+            Returns the item with the smallest priority and its priority without removing it.
+
+            Raises:
+                IndexError: If the queue is empty.
+            """
+            if not self._items:
+                raise IndexError("peek at an empty heap")
+            return self._items[0], self._priorities[0]
+
+        def remove(self, item: Hashable) -> None:
+            """
+            Removes a queued item.
+
+            Args:
+                item (Hashable): The item.
+
+            Raises:
+                KeyError: If the item is not queued.
+            """
+            self._remove_at(self._position[item])
+
+        def _remove_at(self, i: int) -> None:
+            del self._position[self._items[i]]
+            item = self._items.pop()
+            priority = self._priorities.pop()
+            if i < len(self._items):
+                old = self._priorities[i]
+                self._move(i, item, priority)
+                if priority < old:
+                    self._up(i)
+                else:
+                    self._down(i)
+
+        def __getitem__(self, item: Hashable):
+            return self._priorities[self._position[item]]
+
+        def __contains__(self, item: Hashable) -> bool:
+            return item in self._position
+
+        def __len__(self) -> int:
+            return len(self._items)
+
+        def __bool__(self) -> bool:
+            return bool(self._items)
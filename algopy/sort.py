@@ -1,12 +1,81 @@
+import asyncio
+import functools
 import math
+import multiprocessing
+import operator
+import os
+import pickle
 import random
-import threading
+import re
+import sys
+import tempfile
 import time
-from heapq import heappush, heappop
+import tracemalloc
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from heapq import heappush, heappop, merge, nlargest, nsmallest
+from itertools import repeat
+from multiprocessing import shared_memory
+from typing import Callable, Iterable, Iterator
+
+from .heap import Heap
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def _keyed(func: Callable) -> Callable:
+    """
+    Adds key= and reverse= arguments to a comparison-based Sort algorithm.
+
+    Uses decorate-sort-undecorate: the key of every element is computed once and paired with the
+    element's index, the wrapped algorithm sorts those (key, index) pairs, and the elements are then
+    written back in that order. As ties are broken by index (negated for reverse, before the final
+    reversal), the keyed result is stable whatever the wrapped algorithm is. The reordered elements
+    are written back in the input's own type, so array.array and memoryview inputs stay typed.
+    Without key and reverse the algorithm runs on the elements directly.
+
+    Args:
+        func (Callable): The sorting function, taking the list as its first argument after cls.
+
+    Returns:
+        Callable: The wrapped sorting function.
+    """
+    position = 1 if func.__code__.co_varnames[:1] == ("cls",) else 0
+
+    @functools.wraps(func)
+    def wrapper(*args, key: Callable | None = None, reverse: bool = False, **kwargs):
+        if key is None and not reverse:
+            return func(*args, **kwargs)
+        arr = args[position]
+        keys = arr if key is None else map(key, arr)
+        sign = -1 if reverse else 1
+        decorated = [(k, sign * i) for i, k in enumerate(keys)]
+        decorated = func(*args[:position], decorated, *args[position + 1:], **kwargs)
+        if reverse:
+            decorated.reverse()
+        values = [arr[sign * i] for _, i in decorated]
+        if isinstance(arr, array):
+            arr[:] = array(arr.typecode, values)
+        elif isinstance(arr, memoryview):
+            arr[:] = array(arr.format, values)
+        else:
+            arr[:] = values
+        return arr
+
+    return wrapper
 
 
 class Sort:
     class String:
+        # Groups smaller than this are finished with list.sort instead of another radix pass.
+        _CUTOFF = 32
+        _DIGITS = re.compile(r"(\d+)")
+
         @classmethod
         def and_integer(
                 cls,
@@ -18,6 +87,9 @@ class Sort:
             """
             Splits a list into integers and strings, sorts them separately, and optionally reverses the order.
 
+            The list is partitioned in a single pass and the integers are sorted with the
+            non-recursive Sort.QuickSort.iterative.
+
             Args:
                 arr (list[int | str]): The list containing integers and strings.
                 reverse (bool): If True, reverses the order of the sorted lists.
@@ -27,34 +99,180 @@ class Sort:
             Returns:
                 tuple[list[int], list[str]]: A tuple containing the sorted integers and strings.
             """
-            str_list = [x for x in arr if isinstance(x, str)]
-            int_list = [x for x in arr if isinstance(x, int)]
+            int_list = []
+            str_list = []
+            add_int = int_list.append
+            add_str = str_list.append
+            for x in arr:
+                if isinstance(x, str):
+                    add_str(x)
+                elif isinstance(x, int):
+                    add_int(x)
             if sort_strings:
                 str_list = cls.alphabetically(str_list)
             if sort_integers:
-                int_list = Sort.QuickSort.default(int_list)
+                Sort.QuickSort.iterative(int_list)
             if reverse:
                 int_list.reverse()
                 str_list.reverse()
             return int_list, str_list
 
-        @staticmethod
-        def alphabetically(arr: list[str], reverse: bool = False) -> list[str]:
+        @classmethod
+        def natural_key(cls, text: str) -> tuple:
+            """
+            Computes a collation key ordering the digit runs of a string by their numeric value.
+
+            The key alternates text and integers, so "file2" sorts before "file10".
+
+            Args:
+                text (str): The string.
+
+            Returns:
+                tuple: The collation key.
+            """
+            parts = cls._DIGITS.split(text)
+            parts[1::2] = map(int, parts[1::2])
+            return tuple(parts)
+
+        @classmethod
+        def collation_key(cls, casefold: bool = False, natural: bool = False) -> Callable[[str], object] | None:
+            """
+            Returns the key function implementing the requested collation.
+
+            Args:
+                casefold (bool): If True, compares strings caselessly (str.casefold, which also
+                                 folds characters such as "ß" to "ss").
+                natural (bool): If True, compares digit runs by their numeric value.
+
+            Returns:
+                Callable[[str], object] | None: The key function, None for plain code point order.
+            """
+            if casefold and natural:
+                return lambda text: cls.natural_key(text.casefold())
+            if natural:
+                return cls.natural_key
+            if casefold:
+                return str.casefold
+            return None
+
+        @classmethod
+        def alphabetically(
+                cls,
+                arr: list[str],
+                reverse: bool = False,
+                casefold: bool = False,
+                natural: bool = False,
+        ) -> list[str]:
             """
             Sorts a list of strings alphabetically.
 
+            Items that are not strings are converted with str(). The collation key of every string
+            is computed once, and the sort is stable.
+
             Args:
                 arr (list[str]): The list of strings to sort.
                 reverse (bool): If True, sorts the list in reverse order.
+                casefold (bool): If True, ignores case.
+                natural (bool): If True, orders digit runs numerically ("file2" < "file10").
 
             Returns:
                 list[str]: The sorted list of strings.
             """
             if not arr:
                 return []
-            if reverse:
-                return sorted([str(item) for item in arr], reverse=True)
-            return sorted([str(item) for item in arr])
+            items = [item if type(item) is str else str(item) for item in arr]
+            items.sort(key=cls.collation_key(casefold, natural), reverse=reverse)
+            return items
+
+        @classmethod
+        def msd_radix(cls, arr: list[str]) -> list[str]:
+            """
+            Sorts a list of strings with a most significant digit first radix sort.
+
+            Strings are distributed into buckets by their character at the current depth, strings
+            that end at that depth come first, and each bucket is refined on the next character.
+            Shared prefixes are therefore read once per character instead of once per comparison.
+            Buckets smaller than String._CUTOFF are finished with list.sort. The sort is stable and
+            uses an explicit stack, so long common prefixes do not recurse.
+
+            Args:
+                arr (list[str]): The list of strings to sort, it is sorted in place.
+
+            Returns:
+                list[str]: The sorted list.
+            """
+            stack = [(0, len(arr), 0)]
+            while stack:
+                lo, hi, depth = stack.pop()
+                if hi - lo < cls._CUTOFF:
+                    if hi - lo > 1:
+                        arr[lo:hi] = sorted(arr[lo:hi])
+                    continue
+                ended = []
+                buckets = {}
+                for text in arr[lo:hi]:
+                    if len(text) <= depth:
+                        ended.append(text)
+                    else:
+                        char = text[depth]
+                        bucket = buckets.get(char)
+                        if bucket is None:
+                            buckets[char] = [text]
+                        else:
+                            bucket.append(text)
+                arr[lo:lo + len(ended)] = ended
+                start = lo + len(ended)
+                for char in sorted(buckets):
+                    bucket = buckets[char]
+                    arr[start:start + len(bucket)] = bucket
+                    if len(bucket) > 1:
+                        stack.append((start, start + len(bucket), depth + 1))
+                    start += len(bucket)
+            return arr
+
+        @classmethod
+        def multikey_quicksort(cls, arr: list[str]) -> list[str]:
+            """
+            Sorts a list of strings with the multikey (three-way radix) quicksort of Bentley and Sedgewick.
+
+            Each step partitions a range around the character at the current depth of a pivot
+            string into less, equal and greater; only the equal part moves on to the next
+            character, so common prefixes are compared character by character once. Ranges smaller
+            than String._CUTOFF are finished with list.sort. The sort is not stable.
+
+            Args:
+                arr (list[str]): The list of strings to sort, it is sorted in place.
+
+            Returns:
+                list[str]: The sorted list.
+            """
+            stack = [(0, len(arr), 0)]
+            while stack:
+                lo, hi, depth = stack.pop()
+                if hi - lo < cls._CUTOFF:
+                    if hi - lo > 1:
+                        arr[lo:hi] = sorted(arr[lo:hi])
+                    continue
+                pivot = arr[(lo + hi) // 2]
+                pivot_char = ord(pivot[depth]) if depth < len(pivot) else -1
+                lt, i, gt = lo, lo, hi - 1
+                while i <= gt:
+                    text = arr[i]
+                    char = ord(text[depth]) if depth < len(text) else -1
+                    if char < pivot_char:
+                        arr[lt], arr[i] = text, arr[lt]
+                        lt += 1
+                        i += 1
+                    elif char > pivot_char:
+                        arr[gt], arr[i] = text, arr[gt]
+                        gt -= 1
+                    else:
+                        i += 1
+                stack.append((lo, lt, depth))
+                stack.append((gt + 1, hi, depth))
+                if pivot_char >= 0:
+                    stack.append((lt, gt + 1, depth + 1))
+            return arr
 
     class BubbleSort:
         @staticmethod
@@ -146,12 +364,17 @@ class Sort:
             return arr
 
         @staticmethod
+        @_keyed
         def default(arr: list[int]) -> list[int]:
             """
             Sorts a list of integers using the default quicksort algorithm.
 
+            This sort is not stable.
+
             Args:
                 arr (list[int]): The list of integers to sort.
+                key (Callable | None): Computes the sort key of each element, once per element.
+                reverse (bool): If True, sorts in descending order.
 
             Returns:
                 list[int]: The sorted list of integers.
@@ -176,14 +399,140 @@ class Sort:
             quick_sort_recursive(0, len(arr) - 1)
             return arr
 
+        @staticmethod
+        def _median_of_three(arr: list[int], i: int, j: int, k: int) -> int:
+            """
+            Returns the index of the median of arr[i], arr[j] and arr[k].
+
+            Args:
+                arr (list[int]): The list of integers.
+                i (int): The first index.
+                j (int): The second index.
+                k (int): The third index.
+
+            Returns:
+                int: The index holding the median value.
+            """
+            a, b, c = arr[i], arr[j], arr[k]
+            if a < b:
+                if b < c:
+                    return j
+                return k if a < c else i
+            if a < c:
+                return i
+            return k if b < c else j
+
+        @classmethod
+        def _pivot(cls, arr: list[int], low: int, high: int) -> int:
+            """
+            Picks a pivot index for arr[low..high], using the median-of-three for small ranges
+            and Tukey's ninther (median of three medians) for large ones.
+
+            Args:
+                arr (list[int]): The list of integers.
+                low (int): The starting index of the range.
+                high (int): The ending index of the range.
+
+            Returns:
+                int: The index of the pivot element.
+            """
+            mid = (low + high) // 2
+            if high - low < 128:
+                return cls._median_of_three(arr, low, mid, high)
+            step = (high - low) // 8
+            return cls._median_of_three(
+                arr,
+                cls._median_of_three(arr, low, low + step, low + 2 * step),
+                cls._median_of_three(arr, mid - step, mid, mid + step),
+                cls._median_of_three(arr, high - 2 * step, high - step, high),
+            )
+
+        @staticmethod
+        def _partition3(arr: list[int], low: int, high: int, pivot: int) -> tuple[int, int]:
+            """
+            Dutch national flag partition of arr[low..high] around a pivot value.
+
+            Args:
+                arr (list[int]): The list of integers.
+                low (int): The starting index of the range.
+                high (int): The ending index of the range.
+                pivot (int): The pivot value.
+
+            Returns:
+                tuple[int, int]: The bounds (lt, gt) so that arr[low..lt-1] < pivot,
+                                 arr[lt..gt] == pivot and arr[gt+1..high] > pivot.
+            """
+            lt = i = low
+            gt = high
+            while i <= gt:
+                value = arr[i]
+                if value < pivot:
+                    arr[i] = arr[lt]
+                    arr[lt] = value
+                    lt += 1
+                    i += 1
+                elif pivot < value:
+                    arr[i] = arr[gt]
+                    arr[gt] = value
+                    gt -= 1
+                else:
+                    i += 1
+            return lt, gt
+
+        @classmethod
+        @_keyed
+        def iterative(cls, arr: list[int], cutoff: int = 16) -> list[int]:
+            """
+            Sorts a list of integers using a recursion-free quicksort.
+
+            Pivots are chosen by median-of-three (ninther on large ranges) and partitioning is
+            three-way, so sorted, reversed and all-equal inputs stay O(n log n). The smaller side
+            of every partition is sorted first and the larger one is pushed on an explicit stack,
+            which keeps the stack O(log n) deep. Ranges shorter than cutoff are insertion sorted.
+            The sort is not stable.
+
+            Args:
+                arr (list[int]): The list of integers to sort.
+                cutoff (int): The range length below which insertion sort is used.
+                key (Callable | None): Computes the sort key of each element, once per element.
+                reverse (bool): If True, sorts in descending order.
+
+            Returns:
+                list[int]: The sorted list of integers.
+            """
+            stack = [(0, len(arr) - 1)]
+            while stack:
+                low, high = stack.pop()
+                while high - low >= cutoff:
+                    lt, gt = cls._partition3(arr, low, high, arr[cls._pivot(arr, low, high)])
+                    if lt - low < high - gt:
+                        stack.append((gt + 1, high))
+                        high = lt - 1
+                    else:
+                        stack.append((low, lt - 1))
+                        low = gt + 1
+                for i in range(low + 1, high + 1):
+                    key = arr[i]
+                    j = i - 1
+                    while j >= low and key < arr[j]:
+                        arr[j + 1] = arr[j]
+                        j -= 1
+                    arr[j + 1] = key
+            return arr
+
     class MergeSort:
         @classmethod
+        @_keyed
         def way3(cls, arr: list[int]) -> list[int]:
             """
             Sorts a list of integers using the 3-way merge sort algorithm.
 
+            This sort is stable.
+
             Args:
                 arr (list[int]): The list of integers to sort.
+                key (Callable | None): Computes the sort key of each element, once per element.
+                reverse (bool): If True, sorts in descending order.
 
             Returns:
                 list[int]: The sorted list of integers.
@@ -191,35 +540,40 @@ class Sort:
 
             def _3way(left, middle, right):
                 result = []
-                while left or middle or right:
-                    min_val = min(
-                        left[0] if left else float("inf"),
-                        middle[0] if middle else float("inf"),
-                        right[0] if right else float("inf"),
-                    )
-                    if left and min_val == left[0]:
-                        result.append(left.pop(0))
-                    elif middle and min_val == middle[0]:
-                        result.append(middle.pop(0))
-                    else:
-                        result.append(right.pop(0))
+                runs = [run for run in (left, middle, right) if run]
+                heads = [0] * len(runs)
+                while runs:
+                    best = 0
+                    for r in range(1, len(runs)):
+                        if runs[r][heads[r]] < runs[best][heads[best]]:
+                            best = r
+                    result.append(runs[best][heads[best]])
+                    heads[best] += 1
+                    if heads[best] == len(runs[best]):
+                        del runs[best]
+                        del heads[best]
                 return result
 
             if len(arr) < 2:
                 return arr
-            third = len(arr) // 3
+            third = max(1, len(arr) // 3)
             left = cls.way3(arr[:third])
             middle = cls.way3(arr[third: 2 * third])
             right = cls.way3(arr[2 * third:])
             return _3way(left, middle, right)
 
         @classmethod
+        @_keyed
         def default(cls, arr: list[int]) -> list[int]:
             """
             Sorts a list of integers using the default merge sort algorithm.
 
+            This sort is stable.
+
             Args:
                 arr (list[int]): The list of integers to sort.
+                key (Callable | None): Computes the sort key of each element, once per element.
+                reverse (bool): If True, sorts in descending order.
 
             Returns:
                 list[int]: The sorted list of integers.
@@ -235,7 +589,7 @@ class Sort:
                 i = j = k = 0
 
                 while i < len(left_half) and j < len(right_half):
-                    if left_half[i] < right_half[j]:
+                    if not right_half[j] < left_half[i]:
                         arr[k] = left_half[i]
                         i += 1
                     else:
@@ -254,6 +608,88 @@ class Sort:
                     k += 1
             return arr
 
+        @staticmethod
+        @_keyed
+        def bottom_up(arr: list[int], min_run: int = 32) -> list[int]:
+            """
+            Sorts a list of integers using a bottom-up (natural) merge sort.
+
+            Existing ascending runs are detected (strictly descending runs are reversed in place)
+            and runs shorter than min_run are extended with insertion sort. Runs are then merged
+            pairwise, ping-ponging between the list and one auxiliary buffer allocated once, and a
+            merge is skipped whenever the left run already ends before the right run starts.
+            The sort is stable.
+
+            Args:
+                arr (list[int]): The list of integers to sort.
+                min_run (int): The minimum run length built with insertion sort.
+                key (Callable | None): Computes the sort key of each element, once per element.
+                reverse (bool): If True, sorts in descending order.
+
+            Returns:
+                list[int]: The sorted list of integers.
+            """
+            n = len(arr)
+            if n < 2:
+                return arr
+
+            bounds = [0]
+            start = 0
+            while start < n:
+                end = start + 1
+                if end < n and arr[end] < arr[start]:
+                    while end < n and arr[end] < arr[end - 1]:
+                        end += 1
+                    i, j = start, end - 1
+                    while i < j:
+                        arr[i], arr[j] = arr[j], arr[i]
+                        i += 1
+                        j -= 1
+                else:
+                    while end < n and arr[end - 1] <= arr[end]:
+                        end += 1
+                forced = min(start + min_run, n)
+                while end < forced:
+                    key = arr[end]
+                    j = end - 1
+                    while j >= start and key < arr[j]:
+                        arr[j + 1] = arr[j]
+                        j -= 1
+                    arr[j + 1] = key
+                    end += 1
+                bounds.append(end)
+                start = end
+
+            src, dst = arr, [None] * n
+            while len(bounds) > 2:
+                merged = [0]
+                for r in range(0, len(bounds) - 1, 2):
+                    lo, mid = bounds[r], bounds[r + 1]
+                    hi = bounds[r + 2] if r + 2 < len(bounds) else mid
+                    if mid == hi or not src[mid] < src[mid - 1]:
+                        dst[lo:hi] = src[lo:hi]
+                    else:
+                        i, j, k = lo, mid, lo
+                        while i < mid and j < hi:
+                            if src[j] < src[i]:
+                                dst[k] = src[j]
+                                j += 1
+                            else:
+                                dst[k] = src[i]
+                                i += 1
+                            k += 1
+                        if i < mid:
+                            dst[k:hi] = src[i:mid]
+                        else:
+                            dst[k:hi] = src[j:hi]
+                    merged.append(hi)
+                bounds = merged
+                src, dst = dst, src
+
+            if src is not arr:
+                arr[:] = src
+            return arr
+
     class BogoSort:
         @staticmethod
         def __is_sorted(arr: list[int]) -> bool:
@@ -300,17 +736,24 @@ class Sort:
                     random.shuffle(arr)
 
             for i in range(len(arr)):
-                if not cls.__is_sorted(arr[: i + 1]):
-                    bogosort(arr[: i + 1])
+                prefix = arr[: i + 1]
+                if not cls.__is_sorted(prefix):
+                    bogosort(prefix)
+                    arr[: i + 1] = prefix
             return arr
 
     @staticmethod
+    @_keyed
     def selection_sort(arr: list[int]) -> list[int]:
         """
         Sorts a list of integers using the selection sort algorithm.
 
+        This sort is not stable.
+
         Args:
             arr (list[int]): The list of integers to sort.
+            key (Callable | None): Computes the sort key of each element, once per element.
+            reverse (bool): If True, sorts in descending order.
 
         Returns:
             list[int]: The sorted list of integers.
@@ -325,12 +768,17 @@ class Sort:
         return arr
 
     @staticmethod
+    @_keyed
     def insertion_sort(arr: list[int]) -> list[int]:
         """
         Sorts a list of integers using the insertion sort algorithm.
 
+        This sort is stable.
+
         Args:
             arr (list[int]): The list of integers to sort.
+            key (Callable | None): Computes the sort key of each element, once per element.
+            reverse (bool): If True, sorts in descending order.
 
         Returns:
             list[int]: The sorted list of integers.
@@ -345,151 +793,305 @@ class Sort:
         return arr
 
     @staticmethod
+    @_keyed
     def heap_sort(arr: list[int]) -> list[int]:
         """
         Sorts a list of integers using the heap sort algorithm.
 
+        The list is turned into a binary max-heap in O(n) with Heap.heapify, then the maximum is
+        swapped to the end and the heap shrunk one element at a time with an iterative sift down.
+        This sort is not stable.
+
         Args:
             arr (list[int]): The list of integers to sort.
+            key (Callable | None): Computes the sort key of each element, once per element.
+            reverse (bool): If True, sorts in descending order.
 
         Returns:
             list[int]: The sorted list of integers.
         """
+        n = len(arr)
+        Heap.heapify(arr, reverse=True)
+        for end in range(n - 1, 0, -1):
+            arr[0], arr[end] = arr[end], arr[0]
+            Heap.sift_down(arr, 0, end, reverse=True)
+        return arr
 
-        def heapify(n, i):
-            largest = i
-            left = 2 * i + 1
-            right = 2 * i + 2
-
-            if left < n and arr[i] < arr[left]:
-                largest = left
+    # Lists shorter than this are not worth converting to a NumPy array.
+    _NUMPY_MIN_SIZE = 256
 
-            if right < n and arr[largest] < arr[right]:
-                largest = right
+    @classmethod
+    def _numpy_input(cls, arr, floats: bool = False):
+        """
+        Returns arr as a one-dimensional NumPy array when the NumPy backend can sort it.
 
-            if largest != i:
-                arr[i], arr[largest] = arr[largest], arr[i]
-                heapify(n, largest)
+        ndarrays of integers (and floats when allowed) are returned as they are, lists are
+        converted only when they are long enough and every element is an int (or every element
+        is a float when allowed).
 
-        n = len(arr)
-        for i in range(n // 2 - 1, -1, -1):
-            heapify(n, i)
+        Args:
+            arr: The input of a Sort algorithm.
+            floats (bool): If True, float input is accepted as well.
 
-        for i in range(n - 1, 0, -1):
-            arr[i], arr[0] = arr[0], arr[i]
-            heapify(i, 0)
-        return arr
+        Returns:
+            numpy.ndarray | None: The array to sort, or None to use the pure Python path.
+        """
+        if np is None:
+            return None
+        kinds = "iuf" if floats else "iu"
+        if isinstance(arr, np.ndarray):
+            return arr if arr.ndim == 1 and arr.dtype.kind in kinds else None
+        if not isinstance(arr, list) or len(arr) < cls._NUMPY_MIN_SIZE:
+            return None
+        if all(type(x) is int for x in arr):
+            try:
+                return np.array(arr, dtype=np.int64)
+            except OverflowError:
+                return None
+        if floats and all(type(x) is float for x in arr):
+            return np.array(arr, dtype=np.float64)
+        return None
 
     @staticmethod
-    def radix_sort(arr: list[int]) -> list[int]:
+    def _numpy_output(arr, result):
         """
-        Sorts a list of integers using the radix sort algorithm.
+        Writes a sorted NumPy array back into the original input and returns the input.
 
         Args:
-            arr (list[int]): The list of integers to sort.
+            arr: The original list or ndarray.
+            result (numpy.ndarray): The sorted values.
 
         Returns:
-            list[int]: The sorted list of integers.
+            The original input, now sorted.
         """
-        if not arr:
-            return arr
+        if isinstance(arr, np.ndarray):
+            arr[...] = result
+        else:
+            arr[:] = result.tolist()
+        return arr
 
-        def counting_sort(exp):
-            n = len(arr)
-            output = [0] * n
-            count = [0] * 10
+    # Default memory budget of the counting and pigeonhole histograms: 8 bytes per bucket.
+    COUNTING_MEMORY = 64 * 1024 * 1024
 
-            for i in range(n):
-                index = arr[i] // exp
-                count[index % 10] += 1
+    @classmethod
+    def _counting(cls, arr, max_memory: int):
+        """
+        Range-aware counting sort shared by counting_sort and pigeonhole_sort.
 
-            for i in range(1, 10):
-                count[i] += count[i - 1]
+        Values are offset by the minimum, so negative values are counted like any other. When the
+        histogram of max - min + 1 buckets (8 bytes each) would not fit in max_memory, the values
+        are counted sparsely in a Counter instead: with many duplicates only the distinct values
+        are sorted, otherwise the list goes to radix_sort when it fits in 64 bits.
 
-            i = n - 1
-            while i >= 0:
-                index = arr[i] // exp
-                output[count[index % 10] - 1] = arr[i]
-                count[index % 10] -= 1
-                i -= 1
+        Args:
+            arr (list[int] | numpy.ndarray): The integers to sort, sorted in place.
+            max_memory (int): The largest histogram allowed, in bytes.
 
-            for i in range(n):
-                arr[i] = output[i]
+        Returns:
+            list[int] | numpy.ndarray: The sorted input.
+
+        Raises:
+            ValueError: If max_memory is negative.
+        """
+        if max_memory < 0:
+            raise ValueError("max_memory must not be negative")
+        max_buckets = max_memory // 8
+        values = cls._numpy_input(arr)
+        if values is not None:
+            if len(values) == 0:
+                return arr
+            low, high = int(values.min()), int(values.max())
+            if high - low < max_buckets:
+                # Offsets are taken in the input dtype only when unsigned (where they cannot wrap)
+                # and widened to int64 for bincount; a small signed dtype is widened first.
+                if values.dtype.kind == "u":
+                    offsets = (values - values.min()).astype(np.int64)
+                else:
+                    offsets = values.astype(np.int64) - np.int64(low)
+                counts = np.bincount(offsets)
+                result = np.repeat(np.arange(low, low + len(counts), dtype=values.dtype), counts)
+                return cls._numpy_output(arr, result)
+            return cls.radix_sort(arr)
+
+        if not arr:
+            return arr
+        low, high = min(arr), max(arr)
+        if high - low < max_buckets:
+            counts = [0] * (high - low + 1)
+            for x in arr:
+                counts[x - low] += 1
+            pairs = ((low + offset, count) for offset, count in enumerate(counts) if count)
+        else:
+            counter = Counter(arr)
+            if 2 * len(counter) > len(arr) and -2 ** 63 <= low and high < 2 ** 63:
+                return cls.radix_sort(arr)
+            pairs = ((value, counter[value]) for value in sorted(counter))
 
-        max1 = max(arr)
-        exp = 1
-        while max1 // exp > 0:
-            counting_sort(exp)
-            exp *= 10
+        i = 0
+        for value, count in pairs:
+            arr[i:i + count] = [value] * count
+            i += count
         return arr
 
     @staticmethod
-    def counting_sort(arr: list[int]) -> list[int]:
+    def radix_sort(arr: list[int] | array | memoryview, digit_bits: int = 8) -> list[int] | array | memoryview:
         """
-        Sorts a list of integers using the counting sort algorithm.
+        Sorts a list, array.array or memoryview of 64-bit integers using LSD radix sort.
+
+        The values are copied once into an array("Q") with their sign bit flipped (which orders
+        negatives before positives), sorted with 8 or 16 bit digits while ping-ponging between two
+        typed buffers, and written back. Only the digits below the highest bit in which the
+        smallest and largest value differ are visited, and a pass is skipped when every value
+        shares the same digit. The sort is stable.
+
+        When NumPy is installed, integer ndarrays and long int lists run the same passes as stable
+        argsorts of each digit column, and ndarrays are sorted in place without a list conversion.
 
         Args:
-            arr (list[int]): The list of integers to sort.
+            arr (list[int] | array | memoryview | numpy.ndarray): The integers to sort, sorted in place.
+            digit_bits (int): The digit size, 8 (up to 8 passes) or 16 (up to 4 passes).
 
         Returns:
-            list[int]: The sorted list of integers.
+            list[int] | array | memoryview: The sorted integers.
+
+        Raises:
+            ValueError: If digit_bits is not 8 or 16.
+            OverflowError: If a value does not fit in a signed 64-bit integer.
         """
-        if not arr:
+        if digit_bits not in (8, 16):
+            raise ValueError("digit_bits must be 8 or 16")
+        n = len(arr)
+        if n < 2:
             return arr
-        max_val = max(arr)
-        m = max_val + 1
-        count = [0] * m
-
-        for a in arr:
-            count[a] += 1
 
-        i = 0
-        for a in range(m):
-            for _ in range(count[a]):
-                arr[i] = a
-                i += 1
+        values = Sort._numpy_input(arr)
+        if values is not None:
+            # Unsigned values already order as uint64; signed ones need their sign bit flipped.
+            signed = values.dtype.kind == "i"
+            bias = np.uint64(1 << 63 if signed else 0)
+            if signed:
+                keys = values.astype(np.int64).view(np.uint64) ^ bias
+            else:
+                keys = values.astype(np.uint64)
+            digit_type = np.uint8 if digit_bits == 8 else np.uint16
+            varying = int(keys.min() ^ keys.max()).bit_length()
+            for shift in range(0, varying, digit_bits):
+                digits = (keys >> np.uint64(shift)).astype(digit_type)
+                if (digits == digits[0]).all():
+                    continue
+                keys = keys[np.argsort(digits, kind="stable")]
+            keys ^= bias
+            return Sort._numpy_output(arr, (keys.view(np.int64) if signed else keys).astype(values.dtype))
+
+        bias = 1 << 63
+        src = array("Q", [x + bias for x in arr])
+        dst = array("Q", bytes(src.itemsize * n))
+        mask = (1 << digit_bits) - 1
+        radix = 1 << digit_bits
+
+        for shift in range(0, (min(src) ^ max(src)).bit_length(), digit_bits):
+            # The digit is recomputed in the scatter loop rather than stored, so a pass allocates
+            # nothing but the histogram.
+            count = [0] * radix
+            for key in src:
+                count[(key >> shift) & mask] += 1
+            if count[(src[0] >> shift) & mask] == n:
+                continue
+            total = 0
+            for digit in range(radix):
+                count[digit], total = total, total + count[digit]
+            for key in src:
+                digit = (key >> shift) & mask
+                dst[count[digit]] = key
+                count[digit] += 1
+            src, dst = dst, src
+
+        values = [key - bias for key in src]
+        if isinstance(arr, array):
+            arr[:] = array(arr.typecode, values)
+        elif isinstance(arr, memoryview):
+            arr[:] = array(arr.format, values)
+        else:
+            arr[:] = values
         return arr
 
     @classmethod
-    def bucket_sort(cls, arr: list[int]) -> list[int]:
+    def counting_sort(cls, arr: list[int], max_memory: int = COUNTING_MEMORY) -> list[int]:
         """
-        Sorts a list of integers using the bucket sort algorithm.
+        Sorts a list of integers using the counting sort algorithm.
+
+        The histogram is offset by the smallest value, so negative values are supported and its
+        size only depends on the range of the values. A range too wide for max_memory falls back
+        to a sparse Counter or to radix_sort instead of allocating the histogram.
+
+        When NumPy is installed, integer ndarrays and long int lists are counted with
+        numpy.bincount, and ndarrays are sorted in place without a list conversion.
 
         Args:
-            arr (list[int]): The list of integers to sort.
+            arr (list[int] | numpy.ndarray): The list of integers to sort.
+            max_memory (int): The largest histogram allowed, in bytes.
 
         Returns:
-            list[int]: The sorted list of integers.
-        """
-        if len(arr) == 0:
-            return arr
+            list[int] | numpy.ndarray: The sorted list of integers.
 
-        bucket_count = len(arr)
-        max_val = max(arr)
-        min_val = min(arr)
+        Raises:
+            ValueError: If max_memory is negative.
+        """
+        return cls._counting(arr, max_memory)
 
-        buckets = [[] for _ in range(bucket_count)]
+    @classmethod
+    def bucket_sort(cls, arr: list[int], workers: int = 1) -> list[int]:
+        """
+        Sorts a list of integers using the bucket sort algorithm.
 
-        for i in range(len(arr)):
-            idx = int(bucket_count * (arr[i] - min_val) / (max_val - min_val + 1))
-            buckets[idx].append(arr[i])
+        The bucket boundaries are quantiles of a random sample (see Sort.sample_sort) instead of
+        equal slices of the value range, so skewed data still spreads evenly over the buckets.
 
-        for i in range(bucket_count):
-            buckets[i] = cls.insertion_sort(buckets[i])
+        When NumPy is installed, numeric ndarrays and long int or float lists get their bucket
+        index from the sample quantiles with numpy.searchsorted, are grouped by bucket with a
+        stable argsort of the bucket ids and each bucket slice is sorted with numpy.sort; an
+        ndarray input gives an ndarray result.
 
-        result = []
-        for i in range(bucket_count):
-            result.extend(buckets[i])
+        Args:
+            arr (list[int] | numpy.ndarray): The list of integers to sort, it is left untouched.
+            workers (int): The number of processes sorting the buckets.
 
-        return result
+        Returns:
+            list[int] | numpy.ndarray: The sorted list of integers.
+        """
+        values = cls._numpy_input(arr, floats=True)
+        if values is not None:
+            if len(values) < 2:
+                return values.copy() if isinstance(arr, np.ndarray) else list(arr)
+            rng = np.random.default_rng(len(values))
+            sample = rng.choice(values, size=min(len(values), 8 * math.isqrt(len(values))), replace=False)
+            splitters = np.unique(np.quantile(sample, np.linspace(0, 1, math.isqrt(len(values)) + 1)[1:-1]))
+            buckets = np.searchsorted(splitters, values)
+            # Group by bucket with a stable argsort of the bucket ids (a linear radix sort once they
+            # fit in 16 bits), then sort each bucket slice on its own: every np.sort only sees about
+            # sqrt(n) values.
+            if len(splitters) < 1 << 16:
+                buckets = buckets.astype(np.uint16)
+            result = values[np.argsort(buckets, kind="stable")]
+            bounds = np.cumsum(np.bincount(buckets, minlength=len(splitters) + 1)).tolist()
+            for lo, hi in zip([0] + bounds, bounds):
+                if hi - lo > 1:
+                    result[lo:hi].sort()
+            return result if isinstance(arr, np.ndarray) else result.tolist()
+        return cls.sample_sort(list(arr), workers=workers)
 
     @staticmethod
+    @_keyed
     def shell_sort(arr: list[int]) -> list[int]:
         """
         Sorts a list of integers using the shell sort algorithm.
 
+        This sort is not stable.
+
         Args:
             arr (list[int]): The list of integers to sort.
+            key (Callable | None): Computes the sort key of each element, once per element.
+            reverse (bool): If True, sorts in descending order.
 
         Returns:
             list[int]: The sorted list of integers.
@@ -796,18 +1398,351 @@ class Sort:
             result = merge(result, sublist)
         return result
 
+    # Galloping starts after this many consecutive wins from one run (CPython's MIN_GALLOP).
+    _MIN_GALLOP = 7
+
+    @staticmethod
+    def _min_run(n: int) -> int:
+        """
+        Computes the Timsort minimum run length, between 32 and 64, for a list of length n.
+
+        n / minrun is then a power of two or just below one, which keeps the final merges balanced.
+
+        Args:
+            n (int): The length of the list.
+
+        Returns:
+            int: The minimum run length.
+        """
+        extra = 0
+        while n >= 64:
+            extra |= n & 1
+            n >>= 1
+        return n + extra
+
+    @staticmethod
+    def _binary_insertion(arr: list, lo: int, hi: int, start: int) -> None:
+        """
+        Extends the sorted slice arr[lo:start] to arr[lo:hi] with a stable binary insertion sort.
+
+        Args:
+            arr (list): The list to sort.
+            lo (int): The first index of the slice.
+            hi (int): The index after the last element of the slice.
+            start (int): The first index that is not sorted yet.
+        """
+        for i in range(max(start, lo + 1), hi):
+            pivot = arr[i]
+            pos = bisect_right(arr, pivot, lo, i)
+            if pos < i:
+                arr[pos + 1:i + 1] = arr[pos:i]
+                arr[pos] = pivot
+
     @staticmethod
-    def tim_sort(arr: list[int]) -> list[int]:
+    def _gallop(key, arr: list, lo: int, hi: int, right: bool, from_end: bool = False) -> int:
+        """
+        Finds where key goes in the sorted slice arr[lo:hi] by galloping, then binary searching.
+
+        Probes 1, 2, 4, 8... elements away from one end of the slice, so finding a position p
+        elements from that end costs O(log p) comparisons instead of O(log n).
+
+        Args:
+            key: The value to place.
+            arr (list): The list holding the slice.
+            lo (int): The first index of the slice.
+            hi (int): The index after the last element of the slice.
+            right (bool): If True, returns the position after values equal to key, else before.
+            from_end (bool): If True, gallops from hi downwards, else from lo upwards.
+
+        Returns:
+            int: The insertion index, between lo and hi.
+        """
+        if right:
+            def after(i):
+                return not key < arr[i]
+        else:
+            def after(i):
+                return arr[i] < key
+
+        offset = 1
+        if from_end:
+            last = hi
+            while offset <= hi - lo and not after(hi - offset):
+                last = hi - offset
+                offset <<= 1
+            lo = max(lo, hi - offset + 1)
+            hi = last
+        else:
+            first = lo
+            while offset <= hi - lo and after(lo + offset - 1):
+                first = lo + offset
+                offset <<= 1
+            hi = min(hi, lo + offset - 1)
+            lo = first
+        return bisect_right(arr, key, lo, hi) if right else bisect_left(arr, key, lo, hi)
+
+    @classmethod
+    def _merge_runs(cls, arr: list, base_a: int, len_a: int, len_b: int, state: list) -> None:
+        """
+        Merges the adjacent sorted runs arr[base_a:base_a + len_a] and the len_b elements after it.
+
+        Elements of the first run that are already in place and elements of the second run that
+        are already in place are skipped with two gallops. Only the shorter remaining run is copied
+        to a temporary list, merging from the front or from the back accordingly. After a run has
+        won _MIN_GALLOP times in a row the merge switches to galloping mode and copies whole slices;
+        state[0] holds the adaptive gallop threshold shared by all merges.
+
+        Args:
+            arr (list): The list holding the runs.
+            base_a (int): The first index of the first run.
+            len_a (int): The length of the first run.
+            len_b (int): The length of the second run.
+            state (list): A one-element list holding the current gallop threshold.
+        """
+        base_b = base_a + len_a
+        skip = cls._gallop(arr[base_b], arr, base_a, base_b, right=True) - base_a
+        base_a += skip
+        len_a -= skip
+        if len_a == 0:
+            return
+        len_b = cls._gallop(arr[base_b - 1], arr, base_b, base_b + len_b, right=False, from_end=True) - base_b
+        if len_b == 0:
+            return
+        if len_a <= len_b:
+            cls._merge_lo(arr, base_a, len_a, len_b, state)
+        else:
+            cls._merge_hi(arr, base_a, len_a, len_b, state)
+
+    @classmethod
+    def _merge_lo(cls, arr: list, base_a: int, len_a: int, len_b: int, state: list) -> None:
+        """
+        Merges two adjacent runs from the front, copying the first (shorter) run aside.
+
+        See Sort._merge_runs for the arguments.
+        """
+        tmp = arr[base_a:base_a + len_a]
+        i, j, k = 0, base_a + len_a, base_a
+        end_b = j + len_b
+        while True:
+            count_a = count_b = 0
+            while True:
+                if arr[j] < tmp[i]:
+                    arr[k] = arr[j]
+                    k += 1
+                    j += 1
+                    if j == end_b:
+                        arr[k:k + len_a - i] = tmp[i:]
+                        return
+                    count_b += 1
+                    count_a = 0
+                    if count_b >= state[0]:
+                        break
+                else:
+                    arr[k] = tmp[i]
+                    k += 1
+                    i += 1
+                    if i == len_a:
+                        return
+                    count_a += 1
+                    count_b = 0
+                    if count_a >= state[0]:
+                        break
+
+            while True:
+                state[0] -= state[0] > 1
+                p = cls._gallop(arr[j], tmp, i, len_a, right=True)
+                count_a = p - i
+                arr[k:k + count_a] = tmp[i:p]
+                k += count_a
+                i = p
+                if i == len_a:
+                    return
+                arr[k] = arr[j]
+                k += 1
+                j += 1
+                if j == end_b:
+                    arr[k:k + len_a - i] = tmp[i:]
+                    return
+
+                p = cls._gallop(tmp[i], arr, j, end_b, right=False)
+                count_b = p - j
+                arr[k:k + count_b] = arr[j:p]
+                k += count_b
+                j = p
+                if j == end_b:
+                    arr[k:k + len_a - i] = tmp[i:]
+                    return
+                arr[k] = tmp[i]
+                k += 1
+                i += 1
+                if i == len_a:
+                    return
+
+                if count_a < cls._MIN_GALLOP and count_b < cls._MIN_GALLOP:
+                    state[0] += 1
+                    break
+
+    @classmethod
+    def _merge_hi(cls, arr: list, base_a: int, len_a: int, len_b: int, state: list) -> None:
+        """
+        Merges two adjacent runs from the back, copying the second (shorter) run aside.
+
+        See Sort._merge_runs for the arguments.
+        """
+        base_b = base_a + len_a
+        tmp = arr[base_b:base_b + len_b]
+        i, j, k = len_b - 1, base_b - 1, base_b + len_b - 1
+        while True:
+            count_a = count_b = 0
+            while True:
+                if tmp[i] < arr[j]:
+                    arr[k] = arr[j]
+                    k -= 1
+                    j -= 1
+                    if j < base_a:
+                        arr[k - i:k + 1] = tmp[:i + 1]
+                        return
+                    count_a += 1
+                    count_b = 0
+                    if count_a >= state[0]:
+                        break
+                else:
+                    arr[k] = tmp[i]
+                    k -= 1
+                    i -= 1
+                    if i < 0:
+                        return
+                    count_b += 1
+                    count_a = 0
+                    if count_b >= state[0]:
+                        break
+
+            while True:
+                state[0] -= state[0] > 1
+                p = cls._gallop(tmp[i], arr, base_a, j + 1, right=True, from_end=True)
+                count_a = j + 1 - p
+                arr[k - count_a + 1:k + 1] = arr[p:j + 1]
+                k -= count_a
+                j = p - 1
+                if j < base_a:
+                    arr[k - i:k + 1] = tmp[:i + 1]
+                    return
+                arr[k] = tmp[i]
+                k -= 1
+                i -= 1
+                if i < 0:
+                    return
+
+                p = cls._gallop(arr[j], tmp, 0, i + 1, right=False, from_end=True)
+                count_b = i + 1 - p
+                arr[k - count_b + 1:k + 1] = tmp[p:i + 1]
+                k -= count_b
+                i = p - 1
+                if i < 0:
+                    return
+                arr[k] = arr[j]
+                k -= 1
+                j -= 1
+                if j < base_a:
+                    arr[k - i:k + 1] = tmp[:i + 1]
+                    return
+
+                if count_a < cls._MIN_GALLOP and count_b < cls._MIN_GALLOP:
+                    state[0] += 1
+                    break
+
+    @classmethod
+    @_keyed
+    def tim_sort(
+            cls,
+            arr: list[int],
+            min_run: int | None = None,
+            on_run: Callable[[int, int, bool], None] | None = None,
+    ) -> list[int]:
         """
         Sorts a list of integers using the tim sort algorithm.
 
+        The list is scanned for natural runs; strictly descending runs are reversed in place and
+        runs shorter than min_run are extended with binary insertion sort. The runs are pushed on
+        a stack whose lengths are kept growing faster than the Fibonacci numbers, which bounds the
+        stack to O(log n) runs and keeps merges balanced. Merges gallop once one run keeps winning,
+        so already sorted and nearly sorted input costs close to n comparisons. Only < is used to
+        compare elements.
+
+        Lists are sorted in place; array.array and memoryview buffers are sorted through one list
+        copy and written back. This sort is stable.
+
         Args:
-            arr (list[int]): The list of integers to sort.
+            arr (list[int] | array | memoryview): The list of integers to sort.
+            min_run (int | None): The minimum run length, by default computed from the length
+                                  (between 32 and 64) as in CPython.
+            on_run (Callable[[int, int, bool], None] | None): Called with the start, the length and
+                                                              whether it was descending for every
+                                                              natural run found.
+            key (Callable | None): Computes the sort key of each element, once per element.
+            reverse (bool): If True, sorts in descending order.
 
         Returns:
             list[int]: The sorted list of integers.
+
+        Raises:
+            ValueError: If min_run is less than 1.
         """
-        return sorted(arr)
+        if min_run is not None and min_run < 1:
+            raise ValueError("min_run must be at least 1")
+        data = arr if isinstance(arr, list) else list(arr)
+        n = len(data)
+        if n < 2:
+            return arr
+        min_run = min_run or cls._min_run(n)
+        state = [cls._MIN_GALLOP]
+        runs = []
+
+        lo = 0
+        while lo < n:
+            hi = lo + 1
+            descending = False
+            if hi < n:
+                if data[hi] < data[lo]:
+                    descending = True
+                    while hi + 1 < n and data[hi + 1] < data[hi]:
+                        hi += 1
+                    data[lo:hi + 1] = data[lo:hi + 1][::-1]
+                else:
+                    while hi + 1 < n and not data[hi + 1] < data[hi]:
+                        hi += 1
+                hi += 1
+            if on_run is not None:
+                on_run(lo, hi - lo, descending)
+            forced = min(n, lo + min_run)
+            if hi < forced:
+                cls._binary_insertion(data, lo, forced, hi)
+                hi = forced
+            runs.append((lo, hi - lo))
+            lo = hi
+
+            while len(runs) > 1:
+                i = len(runs) - 2
+                if (i > 0 and runs[i - 1][1] <= runs[i][1] + runs[i + 1][1]) or \
+                        (i > 1 and runs[i - 2][1] <= runs[i - 1][1] + runs[i][1]):
+                    if runs[i - 1][1] < runs[i + 1][1]:
+                        i -= 1
+                elif runs[i][1] > runs[i + 1][1]:
+                    break
+                cls._merge_runs(data, runs[i][0], runs[i][1], runs[i + 1][1], state)
+                runs[i:i + 2] = [(runs[i][0], runs[i][1] + runs[i + 1][1])]
+
+        while len(runs) > 1:
+            i = len(runs) - 2
+            if i > 0 and runs[i - 1][1] < runs[i + 1][1]:
+                i -= 1
+            cls._merge_runs(data, runs[i][0], runs[i][1], runs[i + 1][1], state)
+            runs[i:i + 2] = [(runs[i][0], runs[i][1] + runs[i + 1][1])]
+
+        if data is not arr:
+            for i, value in enumerate(data):
+                arr[i] = value
+        return arr
 
     @staticmethod
     def block_sort(arr: list[int]) -> list[int]:
@@ -824,9 +1759,11 @@ class Sort:
             return arr
         num_blocks = int(len(arr) ** 0.5)
         blocks = [[] for _ in range(num_blocks)]
+        min_val = min(arr)
+        span = max(arr) - min_val + 1
 
         for x in arr:
-            blocks[int(x * num_blocks / (max(arr) + 1))].append(x)
+            blocks[min(int((x - min_val) * num_blocks / span), num_blocks - 1)].append(x)
 
         for i in range(num_blocks):
             blocks[i].sort()
@@ -842,6 +1779,9 @@ class Sort:
         """
         Sorts a list of integers using the tournament sort algorithm.
 
+        The elements play in a binary Heap.DAry built in O(n): the winner is popped and the
+        tournament is replayed along a single path, O(log n) per element. The list is left untouched.
+
         Args:
             arr (list[int]): The list of integers to sort.
 
@@ -849,40 +1789,21 @@ class Sort:
             list[int]: The sorted list of integers.
         """
 
-        def play_tournament(arr):
-            """
-            Plays a tournament to find the smallest element in the array.
-
-            Args:
-                arr (list[int]): The list of integers.
-
-            Returns:
-                tuple[int, list[int]]: The smallest element and the remaining elements.
-            """
-            if len(arr) == 1:
-                return arr[0], []
-            mid = len(arr) // 2
-            left_winner, left_remaining = play_tournament(arr[:mid])
-            right_winner, right_remaining = play_tournament(arr[mid:])
-            if left_winner < right_winner:
-                return left_winner, right_remaining + [right_winner] + left_remaining
-            else:
-                return right_winner, left_remaining + [left_winner] + right_remaining
-
-        sorted_arr = []
-        remaining = arr
-        while remaining:
-            winner, remaining = play_tournament(remaining)
-            sorted_arr.append(winner)
-        return sorted_arr
+        players = Heap.DAry(arr, d=2)
+        return [players.pop() for _ in range(len(players))]
 
     @staticmethod
+    @_keyed
     def intro_sort(arr: list[int]) -> list[int]:
         """
         Sorts a list of integers using the introspective sort algorithm.
 
+        This sort is not stable.
+
         Args:
             arr (list[int]): The list of integers to sort.
+            key (Callable | None): Computes the sort key of each element, once per element.
+            reverse (bool): If True, sorts in descending order.
 
         Returns:
             list[int]: The sorted list of integers.
@@ -985,37 +1906,203 @@ class Sort:
 
         return result
 
-    @staticmethod
-    def sleep_sort(arr: list[int]) -> list[int]:
+    class TimerWheel:
+        """
+        A hierarchical timing wheel holding items until the tick they are due.
+
+        Level 0 has one slot per tick, and every higher level has slots spanning a whole turn of
+        the level below. An item is stored in the lowest level whose span covers its delay, and
+        when a lower wheel completes a turn, the next slot of the level above is cascaded down. So
+        scheduling is O(1), and advancing costs O(1) per tick plus O(levels) per item, however far
+        away the deadlines are. next_due finds the next tick with work in O(levels * slots), so empty
+        spans are jumped over rather than advanced through. Levels are added as needed.
+
+        Attributes:
+            slots (int): The number of slots of every level.
+            now (int): The current tick.
         """
-        Sorts a list of integers using the sleep sort algorithm.
 
-        Args:
-            arr (list[int]): The list of integers to sort.
+        def __init__(self, slots: int = 64) -> None:
+            """
+            Initializes an empty wheel at tick 0.
 
-        Returns:
-            list[int]: The sorted list of integers.
-        """
-        result = []
+            Args:
+                slots (int): The number of slots of every level.
 
-        def sleep_and_append(x):
+            Raises:
+                ValueError: If slots is less than 2.
             """
-            Sleeps for a duration equal to the value and appends the value to the result list.
+            if slots < 2:
+                raise ValueError("slots must be at least 2")
+            self.slots: int = slots
+            self.now: int = 0
+            self._levels: list[list[list]] = [[[] for _ in range(slots)]]
+            self._counts: list[int] = [0]
+            self._pending: int = 0
+
+        def schedule(self, tick: int, item) -> None:
+            """
+            Schedules an item for a tick, items already due fire on the next advance.
 
             Args:
-                x (int): The value to sleep for and append.
+                tick (int): The tick the item is due.
+                item: The item.
+            """
+            tick = max(tick, self.now)
+            delta = tick - self.now
+            level = 0
+            span = self.slots
+            while delta >= span:
+                level += 1
+                span *= self.slots
+            while len(self._levels) <= level:
+                self._levels.append([[] for _ in range(self.slots)])
+                self._counts.append(0)
+            self._levels[level][tick // (span // self.slots) % self.slots].append((tick, item))
+            self._counts[level] += 1
+            self._pending += 1
+
+        def advance(self) -> list:
+            """
+            Returns the items due at the current tick, in scheduling order, and moves to the next tick.
+
+            Returns:
+                list: The due items.
+            """
+            # Cascade every level whose lower wheel starts a new turn, the highest level first.
+            span = 1
+            boundaries = []
+            for level in range(1, len(self._levels)):
+                span *= self.slots
+                if self.now % span:
+                    break
+                boundaries.append((level, span))
+            for level, span in reversed(boundaries):
+                slot = self._levels[level][self.now // span % self.slots]
+                entries = slot[:]
+                slot.clear()
+                self._counts[level] -= len(entries)
+                self._pending -= len(entries)
+                for tick, item in entries:
+                    self.schedule(tick, item)
+
+            slot = self._levels[0][self.now % self.slots]
+            due = [item for _, item in slot]
+            slot.clear()
+            self._counts[0] -= len(due)
+            self._pending -= len(due)
+            self.now += 1
+            return due
+
+        def next_due(self) -> int | None:
+            """
+            Returns the first tick, from now on, at which advance can return items or cascade them.
+
+            Every entry of level L sits in a slot covering a block of slots ** L ticks that starts at
+            or after now and within one turn of that level, so the earliest block start of the non
+            empty slots of each level is found with at most one scan of its slots. All the ticks
+            before the returned one are empty: the wheel can jump there by assigning now, instead of
+            advancing one empty tick at a time.
+
+            Returns:
+                int | None: The tick, or None when nothing is scheduled.
             """
-            time.sleep(x)
-            result.append(x)
+            if not self._pending:
+                return None
+            best = None
+            unit = 1
+            for level, count in enumerate(self._counts):
+                if count:
+                    wheel = self._levels[level]
+                    first = -(-self.now // unit)
+                    for block in range(first, first + self.slots):
+                        if wheel[block % self.slots]:
+                            start = block * unit
+                            if best is None or start < best:
+                                best = start
+                            break
+                unit *= self.slots
+            return best
+
+        def __len__(self) -> int:
+            return self._pending
+
+    @classmethod
+    async def sleep_sort_async(
+            cls,
+            arr: list[int | float],
+            scale: float = 1.0,
+            resolution: float | None = None,
+    ) -> list[int | float]:
+        """
+        Sorts a list of non-negative numbers by waking each of them up after value * scale seconds.
+
+        Every element is scheduled on one Sort.TimerWheel driven by a single coroutine on the
+        running event loop, so no thread or task is created per element. Elements due at the same
+        tick are released in (value, index) order, which makes the result sorted and deterministic
+        whatever the scheduling jitter or tick resolution.
+
+        Args:
+            arr (list[int | float]): The numbers to sort.
+            scale (float): The seconds waited per unit of value, e.g. 1e-6 for a microsecond per unit.
+            resolution (float | None): The length of a wheel tick in seconds, defaults to scale.
 
-        threads = [threading.Thread(target=sleep_and_append, args=(x,)) for x in arr]
-        for thread in threads:
-            thread.start()
-        for thread in threads:
-            thread.join()
+        Returns:
+            list[int | float]: The sorted numbers.
 
+        Raises:
+            ValueError: If a value, scale or resolution is negative, or resolution is 0.
+        """
+        if scale < 0 or (resolution is not None and resolution <= 0):
+            raise ValueError("scale must not be negative and resolution must be positive")
+        if any(x < 0 for x in arr):
+            raise ValueError("sleep sort only sorts non-negative values")
+        resolution = resolution or scale or 1.0
+        wheel = cls.TimerWheel()
+        for index, x in enumerate(arr):
+            wheel.schedule(int(x * scale / resolution), (x, index))
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        result = []
+        while wheel:
+            # Jump over the empty ticks instead of spinning through them without yielding.
+            tick = wheel.now = wheel.next_due()
+            due = wheel.advance()
+            if due:
+                delay = start + tick * resolution - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                due.sort()
+                result.extend(x for x, _ in due)
         return result
 
+    @classmethod
+    def sleep_sort(
+            cls,
+            arr: list[int | float],
+            scale: float = 1.0,
+            resolution: float | None = None,
+    ) -> list[int | float]:
+        """
+        Sorts a list of integers using the sleep sort algorithm.
+
+        Runs Sort.sleep_sort_async on a new event loop, so it cannot be called from a running one;
+        await sleep_sort_async there instead. The list is left untouched.
+
+        Args:
+            arr (list[int | float]): The list of integers to sort.
+            scale (float): The seconds waited per unit of value.
+            resolution (float | None): The length of a wheel tick in seconds, defaults to scale.
+
+        Returns:
+            list[int | float]: The sorted list of integers.
+
+        Raises:
+            ValueError: If a value, scale or resolution is negative, or resolution is 0.
+        """
+        return asyncio.run(cls.sleep_sort_async(arr, scale, resolution))
+
     @staticmethod
     def stupid_sort(arr: list[int]) -> list[int]:
         """
@@ -1115,48 +2202,1827 @@ class Sort:
             n = new_n
         return arr
 
-    @staticmethod
-    def pigeonhole_sort(arr: list[int]) -> list[int]:
+    @classmethod
+    def pigeonhole_sort(cls, arr: list[int], max_memory: int = COUNTING_MEMORY) -> list[int]:
         """
         Sorts a list of integers using the pigeonhole sort algorithm.
 
+        One hole is used per value between the smallest and largest value. A range too wide for
+        max_memory falls back to a sparse Counter or to radix_sort instead of allocating the holes.
+
+        When NumPy is installed, integer ndarrays and long int lists are counted with
+        numpy.bincount, and ndarrays are sorted in place without a list conversion.
+
         Args:
-            arr (list[int]): The list of integers to sort.
+            arr (list[int] | numpy.ndarray): The list of integers to sort.
+            max_memory (int): The largest set of holes allowed, in bytes.
 
         Returns:
-            list[int]: The sorted list of integers.
-        """
-        if not arr:
-            return arr
-        min_val = min(arr)
-        max_val = max(arr)
-        size = max_val - min_val + 1
-
-        holes = [0] * size
-        for x in arr:
-            holes[x - min_val] += 1
+            list[int] | numpy.ndarray: The sorted list of integers.
 
-        i = 0
-        for count in range(size):
-            while holes[count] > 0:
-                arr[i] = count + min_val
-                i += 1
-                holes[count] -= 1
-        return arr
+        Raises:
+            ValueError: If max_memory is negative.
+        """
+        return cls._counting(arr, max_memory)
 
     @staticmethod
     def tag_sort(arr: list[int]) -> tuple[list[int], list[int]]:
         """
         Sorts a list of integers using the tag sort algorithm.
 
+        When NumPy is installed, numeric ndarrays and long int or float lists are tagged with a
+        stable numpy.argsort; an ndarray input gives ndarray results.
+
         Args:
-            arr (list[int]): The list of integers to sort.
+            arr (list[int] | numpy.ndarray): The list of integers to sort.
 
         Returns:
             tuple[list[int], list[int]]: A tuple containing the sorted list of integers and the original indices.
         """
+        values = Sort._numpy_input(arr, floats=True)
+        if values is not None:
+            indices = np.argsort(values, kind="stable")
+            if isinstance(arr, np.ndarray):
+                return values[indices], indices
+            return values[indices].tolist(), indices.tolist()
         tagged_arr = list(enumerate(arr))
         tagged_arr.sort(key=lambda x: x[1])
         sorted_arr = [x[1] for x in tagged_arr]
         original_arr = [x[0] for x in tagged_arr]
         return sorted_arr, original_arr
+
+    @staticmethod
+    def _resolve(name: str) -> Callable:
+        """
+        Resolves an algorithm name such as "heap_sort" or "QuickSort.default" to its Sort callable.
+
+        Args:
+            name (str): The dotted name of the algorithm inside Sort.
+
+        Returns:
+            Callable: The sorting function.
+        """
+        return functools.reduce(getattr, name.split("."), Sort)
+
+    @staticmethod
+    def plan(arr: list, sample_size: int = 256) -> dict:
+        """
+        Profiles a list and decides which Sort algorithm fits it best.
+
+        Presortedness and duplicates are estimated from a random sample of at most sample_size
+        adjacent pairs and values, the value range is read from the whole list only when every
+        element is an integer.
+
+        Args:
+            arr (list): The list to profile.
+            sample_size (int): The number of adjacent pairs and values to sample.
+
+        Returns:
+            dict: The profile (size, dtype, min, max, span, presorted, reversed, duplicates)
+                  and the chosen "algorithm". The algorithm is a Sort name, or "none" when the
+                  list is already sorted, "reverse" when it only has to be reversed and
+                  "builtin" for the C implementation of tim sort behind list.sort.
+        """
+        n = len(arr)
+        profile = {
+            "size": n,
+            "dtype": None,
+            "min": None,
+            "max": None,
+            "span": None,
+            "presorted": 1.0,
+            "reversed": 1.0,
+            "duplicates": 0.0,
+            "algorithm": "none",
+        }
+        if n < 2:
+            return profile
+
+        if n - 1 <= sample_size:
+            pairs = range(n - 1)
+            values = arr
+        else:
+            rng = random.Random(n)
+            pairs = rng.sample(range(n - 1), sample_size)
+            values = [arr[i] for i in rng.sample(range(n), sample_size)]
+
+        ascending = sum(1 for i in pairs if arr[i] <= arr[i + 1])
+        descending = sum(1 for i in pairs if arr[i] >= arr[i + 1])
+        profile["presorted"] = ascending / len(pairs)
+        profile["reversed"] = descending / len(pairs)
+        try:
+            profile["duplicates"] = 1 - len(set(values)) / len(values)
+        except TypeError:
+            profile["duplicates"] = 0.0
+
+        types = {type(x) for x in values}
+        if types == {int} and all(type(x) is int for x in arr):
+            profile["dtype"] = "int"
+            profile["min"] = min(arr)
+            profile["max"] = max(arr)
+            profile["span"] = profile["max"] - profile["min"] + 1
+        elif types <= {int, float}:
+            profile["dtype"] = "float"
+        elif types == {str}:
+            profile["dtype"] = "str"
+        else:
+            profile["dtype"] = "object"
+
+        if profile["presorted"] == 1.0 and all(arr[i] <= arr[i + 1] for i in range(n - 1)):
+            profile["algorithm"] = "none"
+        elif profile["reversed"] == 1.0 and all(arr[i] > arr[i + 1] for i in range(n - 1)):
+            profile["algorithm"] = "reverse"
+        elif n <= 32:
+            profile["algorithm"] = "insertion_sort"
+        elif profile["dtype"] == "int" and profile["span"] <= 4 * n:
+            profile["algorithm"] = "pigeonhole_sort"
+        elif profile["presorted"] >= 0.9 and n <= 1024:
+            profile["algorithm"] = "insertion_sort"
+        else:
+            profile["algorithm"] = "builtin"
+        return profile
+
+    @classmethod
+    @_keyed
+    def auto(cls, arr: list, on_plan: Callable[[dict], None] | None = None) -> list:
+        """
+        Sorts a list with the algorithm Sort.plan picks for it.
+
+        Tiny or nearly sorted lists go to insertion sort, integers with a narrow range go to
+        pigeonhole sort, already sorted and strictly descending lists are handled in O(n), and
+        everything else goes to list.sort (the C tim sort, Sort.tim_sort being its pure Python
+        counterpart). Stability depends on the chosen algorithm, so it is only
+        guaranteed when key or reverse is given.
+
+        Args:
+            arr (list): The list to sort, it is sorted in place.
+            on_plan (Callable[[dict], None] | None): Called with the profile from Sort.plan before
+                                                     sorting, use it to log the dispatch decision.
+            key (Callable | None): Computes the sort key of each element, once per element.
+            reverse (bool): If True, sorts in descending order.
+
+        Returns:
+            list: The sorted list.
+        """
+        profile = cls.plan(arr)
+        if on_plan is not None:
+            on_plan(profile)
+        algorithm = profile["algorithm"]
+        if algorithm == "none":
+            return arr
+        if algorithm == "reverse":
+            arr.reverse()
+            return arr
+        if algorithm == "builtin":
+            arr.sort()
+            return arr
+        result = cls._resolve(algorithm)(arr)
+        if result is not arr:
+            arr[:] = result
+        return arr
+
+    @staticmethod
+    def _parallel_chunk(name: str, typecode: str, lo: int, hi: int, algorithm: str | None) -> None:
+        """
+        Worker for Sort.parallel, sorts one slice of a shared memory buffer in place.
+
+        Args:
+            name (str): The name of the shared memory block.
+            typecode (str): The array typecode of the stored numbers.
+            lo (int): The first index of the slice.
+            hi (int): The index after the last element of the slice.
+            algorithm (str | None): The Sort algorithm to use, None lets Sort.auto decide.
+        """
+        shm = shared_memory.SharedMemory(name=name)
+        view = shm.buf.cast(typecode)
+        try:
+            chunk = view[lo:hi].tolist()
+            if algorithm is None:
+                Sort.auto(chunk)
+            else:
+                chunk = Sort._resolve(algorithm)(chunk)
+            view[lo:hi] = array(typecode, chunk)
+        finally:
+            view.release()
+            shm.close()
+
+    @classmethod
+    def parallel(
+            cls,
+            arr: list[int | float],
+            workers: int | None = None,
+            min_size: int = 100_000,
+            algorithm: str | None = None,
+    ) -> list[int | float]:
+        """
+        Sorts a large list of numbers on several processes.
+
+        The numbers are copied once into a shared memory buffer, each worker sorts its own chunk
+        of that buffer in place (nothing is pickled but the chunk bounds), and the sorted chunks
+        are combined with a k-way heap merge. Lists shorter than min_size, lists that are not all
+        int or all float and ints outside the 64-bit range are sorted with Sort.auto instead.
+
+        Args:
+            arr (list[int | float]): The list of numbers to sort, it is sorted in place.
+            workers (int | None): The number of processes, defaults to the CPU count.
+            min_size (int): The length below which the list is sorted in this process.
+            algorithm (str | None): The Sort algorithm used on each chunk, None lets Sort.auto decide.
+
+        Returns:
+            list[int | float]: The sorted list.
+        """
+        n = len(arr)
+        workers = workers or os.cpu_count() or 1
+        if n < min_size or workers < 2:
+            return cls.auto(arr)
+        if all(type(x) is int for x in arr):
+            typecode = "q"
+        elif all(type(x) is float for x in arr):
+            typecode = "d"
+        else:
+            return cls.auto(arr)
+        try:
+            data = array(typecode, arr)
+        except OverflowError:
+            return cls.auto(arr)
+
+        bounds = [n * i // workers for i in range(workers + 1)]
+        shm = shared_memory.SharedMemory(create=True, size=n * data.itemsize)
+        view = shm.buf.cast(typecode)
+        # Every slice exports the shared buffer and must be released before shm.close(), even when
+        # a worker or the merge fails, or close() raises BufferError over the original error.
+        runs = [view[lo:hi] for lo, hi in zip(bounds, bounds[1:])]
+        try:
+            view[:n] = data
+            del data
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [
+                    pool.submit(cls._parallel_chunk, shm.name, typecode, lo, hi, algorithm)
+                    for lo, hi in zip(bounds, bounds[1:])
+                    if lo < hi
+                ]
+                for future in futures:
+                    future.result()
+            arr[:] = merge(*runs)
+        finally:
+            for run in runs:
+                run.release()
+            view.release()
+            shm.close()
+            shm.unlink()
+        return arr
+
+    @staticmethod
+    def _sample_bucket(bucket: list, algorithm: str | None) -> list:
+        """
+        Worker for Sort.sample_sort, sorts one bucket.
+
+        Args:
+            bucket (list): The bucket to sort.
+            algorithm (str | None): The Sort algorithm to use, None lets Sort.auto decide.
+
+        Returns:
+            list: The sorted bucket.
+        """
+        if algorithm is None:
+            return Sort.auto(bucket)
+        return Sort._resolve(algorithm)(bucket)
+
+    @classmethod
+    def sample_sort(
+            cls,
+            arr: list,
+            buckets: int | None = None,
+            oversample: int = 8,
+            workers: int = 1,
+            algorithm: str | None = None,
+            seed: int | None = None,
+    ) -> list:
+        """
+        Sorts a list by distributing it over buckets bounded by splitters drawn from a random sample.
+
+        oversample * buckets elements are sampled and sorted, and every oversample-th of them
+        becomes a splitter, so the splitters sit at the quantiles of the data and the buckets hold
+        about the same number of elements however skewed the values are. Each element finds its
+        bucket with a binary search over the splitters. Elements equal to a splitter go to a bucket
+        of their own that needs no sorting, so heavily repeated values never pile up in one bucket.
+        The other buckets are sorted with Sort.auto (or the named algorithm), on several processes
+        when workers is more than 1, and concatenated.
+
+        Args:
+            arr (list): The list to sort, it is sorted in place.
+            buckets (int | None): The number of buckets, defaults to the square root of the length.
+            oversample (int): The number of sampled elements per bucket.
+            workers (int): The number of processes sorting the buckets.
+            algorithm (str | None): The Sort algorithm used on each bucket, None lets Sort.auto decide.
+            seed (int | None): The seed of the sampling, defaults to the length of the list.
+
+        Returns:
+            list: The sorted list.
+
+        Raises:
+            ValueError: If buckets or oversample is less than 1.
+        """
+        if (buckets is not None and buckets < 1) or oversample < 1:
+            raise ValueError("buckets and oversample must be at least 1")
+        n = len(arr)
+        buckets = buckets or max(1, math.isqrt(n))
+        if n < 64 or buckets == 1:
+            return cls._sample_bucket(arr, algorithm) if n else arr
+
+        rng = random.Random(n if seed is None else seed)
+        sample = sorted(rng.sample(arr, min(n, buckets * oversample)))
+        step = len(sample) / buckets
+        splitters = sorted(set(sample[int(step * i)] for i in range(1, buckets)))
+
+        # Bucket 2i holds the values between splitters i-1 and i, bucket 2i+1 the values equal to splitter i.
+        parts = [[] for _ in range(2 * len(splitters) + 1)]
+        last = len(splitters)
+        for x in arr:
+            i = bisect_left(splitters, x)
+            parts[2 * i + 1 if i < last and splitters[i] == x else 2 * i].append(x)
+
+        unsorted = parts[::2]
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                parts[::2] = pool.map(cls._sample_bucket, unsorted, repeat(algorithm))
+        else:
+            parts[::2] = [cls._sample_bucket(part, algorithm) for part in unsorted]
+
+        i = 0
+        for part in parts:
+            arr[i:i + len(part)] = part
+            i += len(part)
+        return arr
+
+    @classmethod
+    def external(
+            cls,
+            source: str | Iterable,
+            output: str | None = None,
+            chunk_size: int = 100_000,
+            algorithm: str | None = None,
+            fan_in: int = 256,
+            temp_dir: str | None = None,
+            encoding: str = "utf-8",
+            key: Callable | None = None,
+            reverse: bool = False,
+    ) -> Iterator | str:
+        """
+        Sorts more records than fit in memory with an external merge sort.
+
+        Records are read in chunks of chunk_size, every chunk is sorted in memory and spilled to a
+        temporary file as a sorted run, and the runs are k-way merged lazily. When there are more
+        than fan_in runs they are merged in several passes so the number of open files stays
+        bounded. Only one chunk (plus one small read buffer per run) is held in memory at a time.
+        The sort is stable when key or reverse is given or the chunk algorithm is stable.
+
+        Args:
+            source (str | Iterable): A path to a text file (one record per line, without the line
+                                     break) or any iterable of picklable, comparable records.
+            output (str | None): A path to write the sorted records to, one per line. When None,
+                                 a generator over the sorted records is returned instead.
+            chunk_size (int): The number of records sorted in memory at once.
+            algorithm (str | None): The Sort algorithm used on each chunk, None lets Sort.auto decide.
+            fan_in (int): The maximum number of runs merged at once.
+            temp_dir (str | None): The directory for the temporary run files.
+            encoding (str): The encoding of the source and output files.
+            key (Callable | None): Computes the sort key of each record, the chunk algorithm must
+                                   accept key= (see Sort.auto).
+            reverse (bool): If True, sorts in descending order.
+
+        Returns:
+            Iterator | str: A generator over the sorted records, or the output path.
+        """
+        if chunk_size < 1 or fan_in < 2:
+            raise ValueError("chunk_size must be at least 1 and fan_in at least 2")
+        records = cls._external_merge(
+            source, chunk_size, algorithm, fan_in, temp_dir, encoding, key, reverse
+        )
+        if output is None:
+            return records
+        with open(output, "w", encoding=encoding) as file:
+            for record in records:
+                file.write(f"{record}\n")
+        return output
+
+    @classmethod
+    def _external_merge(
+            cls,
+            source: str | Iterable,
+            chunk_size: int,
+            algorithm: str | None,
+            fan_in: int,
+            temp_dir: str | None,
+            encoding: str,
+            key: Callable | None,
+            reverse: bool,
+    ) -> Iterator:
+        """
+        Generator behind Sort.external, yields the records of source in sorted order.
+
+        Args:
+            source (str | Iterable): A path to a text file or an iterable of records.
+            chunk_size (int): The number of records sorted in memory at once.
+            algorithm (str | None): The Sort algorithm used on each chunk.
+            fan_in (int): The maximum number of runs merged at once.
+            temp_dir (str | None): The directory for the temporary run files.
+            encoding (str): The encoding of the source file.
+            key (Callable | None): Computes the sort key of each record.
+            reverse (bool): If True, sorts in descending order.
+
+        Yields:
+            The records in sorted order.
+        """
+
+        options = {"key": key, "reverse": reverse} if key is not None or reverse else {}
+
+        def sort_chunk(chunk):
+            if algorithm is None:
+                cls.auto(chunk, **options)
+            else:
+                result = cls._resolve(algorithm)(chunk, **options)
+                if result is not chunk:
+                    chunk[:] = result
+
+        def spill(records):
+            run = tempfile.TemporaryFile(dir=temp_dir)
+            block = []
+            for record in records:
+                block.append(record)
+                if len(block) == 1024:
+                    pickle.dump(block, run, pickle.HIGHEST_PROTOCOL)
+                    block = []
+            if block:
+                pickle.dump(block, run, pickle.HIGHEST_PROTOCOL)
+            run.seek(0)
+            return run
+
+        def read(run):
+            while True:
+                try:
+                    block = pickle.load(run)
+                except EOFError:
+                    return
+                yield from block
+
+        def lines(path):
+            with open(path, encoding=encoding) as file:
+                for line in file:
+                    yield line.rstrip("\n")
+
+        records = lines(source) if isinstance(source, str) else iter(source)
+        runs = []
+        try:
+            chunk = []
+            for record in records:
+                chunk.append(record)
+                if len(chunk) == chunk_size:
+                    sort_chunk(chunk)
+                    runs.append(spill(chunk))
+                    chunk = []
+            sort_chunk(chunk)
+            if not runs:
+                yield from chunk
+                return
+            if chunk:
+                runs.append(spill(chunk))
+            del chunk
+
+            while len(runs) > fan_in:
+                group, runs = runs[:fan_in], runs[fan_in:]
+                runs.append(spill(merge(*(read(run) for run in group), key=key, reverse=reverse)))
+                for run in group:
+                    run.close()
+            yield from merge(*(read(run) for run in runs), key=key, reverse=reverse)
+        finally:
+            for run in runs:
+                run.close()
+
+    @classmethod
+    def select(cls, arr: list[int], k: int) -> int:
+        """
+        Finds the k-th smallest element (0-based) using introselect, in expected O(n).
+
+        Like C++'s nth_element, the list is partially reordered in place: afterwards arr[k] holds
+        the value it would hold if the list were sorted, no element before it is larger and no
+        element after it is smaller. Quickselect with ninther pivots and three-way partitioning is
+        used, and if it fails to shrink the window within 2 * log2(n) rounds the rest of the window
+        is heap sorted, which bounds the worst case at O(n log n).
+
+        Args:
+            arr (list[int]): The list to select from, it is reordered in place.
+            k (int): The 0-based rank of the element to find.
+
+        Returns:
+            int: The k-th smallest element.
+
+        Raises:
+            IndexError: If k is not a valid index of arr.
+        """
+        n = len(arr)
+        if not 0 <= k < n:
+            raise IndexError("k is out of range")
+        low, high = 0, n - 1
+        depth = 2 * n.bit_length()
+        while high - low >= 16:
+            if depth == 0:
+                window = arr[low: high + 1]
+                cls.heap_sort(window)
+                arr[low: high + 1] = window
+                return arr[k]
+            depth -= 1
+            pivot = arr[cls.QuickSort._pivot(arr, low, high)]
+            lt, gt = cls.QuickSort._partition3(arr, low, high, pivot)
+            if k < lt:
+                high = lt - 1
+            elif k > gt:
+                low = gt + 1
+            else:
+                return arr[k]
+        for i in range(low + 1, high + 1):
+            key = arr[i]
+            j = i - 1
+            while j >= low and key < arr[j]:
+                arr[j + 1] = arr[j]
+                j -= 1
+            arr[j + 1] = key
+        return arr[k]
+
+    @classmethod
+    def partial(cls, arr: list[int], k: int) -> list[int]:
+        """
+        Partially sorts a list so that its first k elements are the k smallest, in order.
+
+        Sort.select moves the k smallest elements to the front in expected O(n), and only those
+        are then sorted, for O(n + k log k) in total. The order of the remaining elements is
+        unspecified.
+
+        Args:
+            arr (list[int]): The list to partially sort, it is reordered in place.
+            k (int): The number of smallest elements to place in order at the front.
+
+        Returns:
+            list[int]: The partially sorted list.
+        """
+        if k <= 0:
+            return arr
+        if k >= len(arr):
+            return cls.QuickSort.iterative(arr)
+        cls.select(arr, k - 1)
+        head = arr[: k - 1]
+        cls.QuickSort.iterative(head)
+        arr[: k - 1] = head
+        return arr
+
+    @staticmethod
+    def top_k(iterable: Iterable, k: int, largest: bool = True, key: Callable | None = None) -> list:
+        """
+        Returns the k largest (or smallest) items of any iterable, best first.
+
+        The items are streamed through a heap that never holds more than k items, so iterators
+        of any length use O(k) memory and O(n log k) time. Ties keep their input order.
+
+        Args:
+            iterable (Iterable): The items to scan, consumed once.
+            k (int): The number of items to keep.
+            largest (bool): If True, keeps the largest items, otherwise the smallest.
+            key (Callable | None): Computes the value each item is ranked by.
+
+        Returns:
+            list: The k best items, sorted best first.
+        """
+        if largest:
+            return nlargest(k, iterable, key=key)
+        return nsmallest(k, iterable, key=key)
+
+    class _Tracked:
+        """
+        Wraps an element and counts every comparison made against it into a Sort.Stats.
+
+        Attributes:
+            value: The wrapped element.
+            stats (Sort.Stats): The statistics to count into.
+        """
+
+        __slots__ = ("value", "stats")
+
+        def __init__(self, value, stats) -> None:
+            self.value = value
+            self.stats = stats
+
+        def __lt__(self, other) -> bool:
+            self.stats.comparisons += 1
+            return self.value < (other.value if type(other) is Sort._Tracked else other)
+
+        def __le__(self, other) -> bool:
+            self.stats.comparisons += 1
+            return self.value <= (other.value if type(other) is Sort._Tracked else other)
+
+        def __gt__(self, other) -> bool:
+            self.stats.comparisons += 1
+            return self.value > (other.value if type(other) is Sort._Tracked else other)
+
+        def __ge__(self, other) -> bool:
+            self.stats.comparisons += 1
+            return self.value >= (other.value if type(other) is Sort._Tracked else other)
+
+        def __eq__(self, other) -> bool:
+            self.stats.comparisons += 1
+            return self.value == (other.value if type(other) is Sort._Tracked else other)
+
+        def __hash__(self) -> int:
+            return hash(self.value)
+
+        def __repr__(self) -> str:
+            return repr(self.value)
+
+    class _TrackedList(list):
+        """
+        A list that counts every element written into it into a Sort.Stats.
+        """
+
+        __slots__ = ("stats",)
+
+        def __init__(self, iterable, stats) -> None:
+            super().__init__(iterable)
+            self.stats = stats
+
+        def __setitem__(self, index, value) -> None:
+            if isinstance(index, slice):
+                value = list(value)
+                self.stats.writes += len(value)
+            else:
+                self.stats.writes += 1
+            super().__setitem__(index, value)
+
+    class Stats:
+        """
+        Opt-in instrumentation that reports the work done by any Sort algorithm.
+
+        Use it as a context manager to time a block, trace its auxiliary memory and its call depth,
+        and pass the list through Stats.track to also count comparisons and writes, or let
+        Stats.run do all of it. Nothing is patched in the algorithms themselves, so there is no
+        overhead at all when instrumentation is not used.
+
+            stats = sort.Stats()
+            stats.run(sort.heap_sort, arr)
+            print(stats.as_dict())
+
+        Attributes:
+            comparisons (int | None): The comparisons made between tracked elements, None when the
+                                      algorithm could not run on tracked elements.
+            writes (int | None): The elements written into the tracked list (swaps count twice).
+                                 Writes into temporary lists made by the algorithm are not counted.
+            memory (int | None): The peak auxiliary memory allocated inside the block, in bytes.
+            max_depth (int): The deepest Python call nesting reached inside the block.
+            seconds (float): The wall time spent inside the block.
+        """
+
+        def __init__(self, memory: bool = True, depth: bool = True) -> None:
+            """
+            Initializes empty statistics.
+
+            Args:
+                memory (bool): If True, traces auxiliary memory with tracemalloc.
+                depth (bool): If True, tracks the call depth with a profile hook.
+            """
+            self.trace_memory: bool = memory
+            self.trace_depth: bool = depth
+            self.comparisons: int | None = 0
+            self.writes: int | None = 0
+            self.memory: int | None = None
+            self.max_depth: int = 0
+            self.seconds: float = 0.0
+            self._depth: int = 0
+            self._start: float = 0.0
+            self._baseline: int = 0
+            self._owns_tracemalloc: bool = False
+            self._previous_profile = None
+            self._ignored = {
+                method.__code__
+                for method in (
+                    Sort._Tracked.__lt__,
+                    Sort._Tracked.__le__,
+                    Sort._Tracked.__gt__,
+                    Sort._Tracked.__ge__,
+                    Sort._Tracked.__eq__,
+                    Sort._Tracked.__hash__,
+                    Sort._TrackedList.__setitem__,
+                    Sort.Stats.__exit__,
+                )
+            }
+
+        def track(self, arr: list) -> list:
+            """
+            Copies a list into a tracked list whose comparisons and writes are counted.
+
+            Args:
+                arr (list): The list to track.
+
+            Returns:
+                list: The tracked copy, pass it to the algorithm instead of arr.
+            """
+            return Sort._TrackedList((Sort._Tracked(x, self) for x in arr), self)
+
+        @staticmethod
+        def untrack(arr) -> list:
+            """
+            Unwraps the elements of a tracked list (or of any list holding tracked elements).
+
+            Args:
+                arr: The list to unwrap.
+
+            Returns:
+                list: A plain list of the original elements.
+            """
+            return [x.value if type(x) is Sort._Tracked else x for x in arr]
+
+        def _profile(self, frame, event, arg) -> None:
+            """
+            Profile hook keeping track of the call depth, ignoring the counting wrappers.
+            """
+            if event == "call":
+                if frame.f_code not in self._ignored:
+                    self._depth += 1
+                    if self._depth > self.max_depth:
+                        self.max_depth = self._depth
+            elif event == "return":
+                if frame.f_code not in self._ignored:
+                    self._depth -= 1
+
+        def __enter__(self):
+            if self.trace_memory:
+                self._owns_tracemalloc = not tracemalloc.is_tracing()
+                if self._owns_tracemalloc:
+                    tracemalloc.start()
+                else:
+                    tracemalloc.reset_peak()
+                self._baseline = tracemalloc.get_traced_memory()[0]
+            if self.trace_depth:
+                # The hook sees this __enter__ return, which brings the depth back to 0.
+                self._depth = 1
+                self._previous_profile = sys.getprofile()
+                sys.setprofile(self._profile)
+            self._start = time.perf_counter()
+            return self
+
+        def __exit__(self, exc_type, exc_value, traceback) -> None:
+            self.seconds += time.perf_counter() - self._start
+            if self.trace_depth:
+                sys.setprofile(self._previous_profile)
+            if self.trace_memory:
+                self.memory = max(self.memory or 0, tracemalloc.get_traced_memory()[1] - self._baseline)
+                if self._owns_tracemalloc:
+                    tracemalloc.stop()
+
+        def run(self, func: Callable, arr: list, *args, **kwargs):
+            """
+            Runs a Sort algorithm on a tracked copy of arr and records its statistics.
+
+            The sorted elements are written back into arr, so in-place algorithms behave as usual.
+            Algorithms that do arithmetic on the elements (counting, radix, pigeonhole sort...)
+            cannot run on tracked elements; they are run on arr directly and report None for
+            comparisons and writes, with the time, depth and memory of the failed tracked run
+            discarded. Only a TypeError naming the tracked element type triggers that fallback,
+            any other TypeError is a bug of the algorithm and propagates.
+
+            Args:
+                func (Callable): The Sort algorithm.
+                arr (list): The list to sort.
+                *args: Extra positional arguments for the algorithm.
+                **kwargs: Extra keyword arguments for the algorithm.
+
+            Returns:
+                The algorithm's result, with the elements unwrapped.
+            """
+            tracked = self.track(arr)
+            before = (self.seconds, self.max_depth, self.memory)
+            try:
+                with self:
+                    result = func(tracked, *args, **kwargs)
+            except TypeError as error:
+                if Sort._Tracked.__name__ not in str(error):
+                    raise
+                self.comparisons = self.writes = None
+                self.seconds, self.max_depth, self.memory = before
+                with self:
+                    return func(arr, *args, **kwargs)
+            arr[:] = self.untrack(tracked)
+            if result is tracked:
+                return arr
+            if isinstance(result, tuple):
+                return tuple(self.untrack(part) if isinstance(part, list) else part for part in result)
+            if isinstance(result, list):
+                return self.untrack(result)
+            return result
+
+        def as_dict(self) -> dict:
+            """
+            Returns the statistics as a dictionary, handy for logging.
+
+            Returns:
+                dict: The comparisons, writes, memory, max_depth and seconds.
+            """
+            return {
+                "comparisons": self.comparisons,
+                "writes": self.writes,
+                "memory": self.memory,
+                "max_depth": self.max_depth,
+                "seconds": self.seconds,
+            }
+
+    class Timeout(TimeoutError):
+        """
+        Raised when a bounded sort exceeds one of its limits, reporting how far it got.
+
+        Attributes:
+            reason (str): The exceeded limit: "comparisons", "seconds", "depth", or "killed" when
+                          the subprocess had to be terminated.
+            comparisons (int | None): The comparisons made before stopping.
+            elapsed (float): The seconds spent before stopping.
+            max_depth (int): The deepest call nesting reached.
+            inversions (int | None): The pairs still out of order in the partially sorted list.
+            total_inversions (int | None): The pairs out of order in the input.
+            partial (list | None): The list as the algorithm left it.
+        """
+
+        def __init__(
+                self,
+                reason: str,
+                comparisons: int | None = None,
+                elapsed: float = 0.0,
+                max_depth: int = 0,
+                inversions: int | None = None,
+                total_inversions: int | None = None,
+                partial: list | None = None,
+        ) -> None:
+            super().__init__(f"sort stopped: {reason} limit exceeded after {elapsed:.3f}s")
+            self.reason: str = reason
+            self.comparisons: int | None = comparisons
+            self.elapsed: float = elapsed
+            self.max_depth: int = max_depth
+            self.inversions: int | None = inversions
+            self.total_inversions: int | None = total_inversions
+            self.partial: list | None = partial
+
+        @property
+        def progress(self) -> float | None:
+            """
+            The share of the input inversions already fixed, between 0 and 1, None when unknown.
+            """
+            if self.inversions is None or self.total_inversions is None:
+                return None
+            if self.total_inversions == 0:
+                return 1.0
+            return max(0.0, 1 - self.inversions / self.total_inversions)
+
+        def as_dict(self) -> dict:
+            """
+            Returns the report as a dictionary, handy for logging or sending between processes.
+
+            Returns:
+                dict: The reason, comparisons, elapsed, max_depth, inversions, total_inversions and partial list.
+            """
+            return {
+                "reason": self.reason,
+                "comparisons": self.comparisons,
+                "elapsed": self.elapsed,
+                "max_depth": self.max_depth,
+                "inversions": self.inversions,
+                "total_inversions": self.total_inversions,
+                "partial": self.partial,
+            }
+
+    @staticmethod
+    def inversions(arr: list) -> int:
+        """
+        Counts the pairs i < j with arr[j] < arr[i] with a merge sort, in O(n log n).
+
+        Args:
+            arr (list): The list, left untouched.
+
+        Returns:
+            int: The number of inversions, 0 for a sorted list.
+        """
+        width = 1
+        src = list(arr)
+        n = len(src)
+        dst = [None] * n
+        total = 0
+        while width < n:
+            for lo in range(0, n, 2 * width):
+                mid = min(lo + width, n)
+                hi = min(lo + 2 * width, n)
+                i, j, k = lo, mid, lo
+                while i < mid and j < hi:
+                    if src[j] < src[i]:
+                        dst[k] = src[j]
+                        total += mid - i
+                        j += 1
+                    else:
+                        dst[k] = src[i]
+                        i += 1
+                    k += 1
+                dst[k:hi] = src[i:mid] if i < mid else src[j:hi]
+            src, dst = dst, src
+            width *= 2
+        return total
+
+    class Bounded(Stats):
+        """
+        Sort.Stats that stops the algorithm once it exceeds a number of comparisons, a time or a depth.
+
+        The limits are checked from the instrumentation hooks: every comparison of a tracked
+        element and every Python call made while the algorithm runs, so algorithms that loop
+        forever (bogo sort) or recurse too deeply (stooge and slow sort) are interrupted with a
+        Sort.Timeout reporting their progress. Use Sort.bounded with subprocess=True when the
+        algorithm could also block outside these hooks.
+
+            try:
+                Sort.Bounded(max_seconds=1).run(Sort.BogoSort.default, arr)
+            except Sort.Timeout as timeout:
+                print(timeout.reason, timeout.inversions)
+
+        Attributes:
+            max_comparisons (int | None): The comparison budget, the iteration count of these sorts.
+            max_seconds (float | None): The time budget.
+            limit_depth (int | None): The deepest call nesting allowed.
+        """
+
+        def __init__(
+                self,
+                max_comparisons: int | None = None,
+                max_seconds: float | None = None,
+                max_depth: int | None = None,
+                memory: bool = False,
+        ) -> None:
+            """
+            Initializes the limits, None disables a limit.
+
+            Args:
+                max_comparisons (int | None): The comparison budget.
+                max_seconds (float | None): The time budget.
+                max_depth (int | None): The deepest call nesting allowed.
+                memory (bool): If True, traces auxiliary memory like Sort.Stats.
+            """
+            self.max_comparisons: int | None = max_comparisons
+            self.max_seconds: float | None = max_seconds
+            self.limit_depth: int | None = max_depth
+            self._deadline: float = math.inf
+            self._tracked: list | None = None
+            super().__init__(memory=memory, depth=True)
+            self._ignored.add(Sort.Bounded.comparisons.fset.__code__)
+
+        @property
+        def comparisons(self) -> int | None:
+            return self._comparisons
+
+        @comparisons.setter
+        def comparisons(self, value: int | None) -> None:
+            self._comparisons = value
+            if value is None:
+                return
+            if self.max_comparisons is not None and value > self.max_comparisons:
+                self._stop("comparisons")
+            if time.perf_counter() > self._deadline:
+                self._stop("seconds")
+
+        def _stop(self, reason: str) -> None:
+            """
+            Raises the Sort.Timeout for an exceeded limit.
+            """
+            raise Sort.Timeout(
+                reason,
+                comparisons=self._comparisons,
+                elapsed=time.perf_counter() - self._start,
+                max_depth=self.max_depth,
+            )
+
+        def _profile(self, frame, event, arg) -> None:
+            super()._profile(frame, event, arg)
+            if event == "call":
+                if self.limit_depth is not None and self._depth > self.limit_depth:
+                    self._stop("depth")
+                if time.perf_counter() > self._deadline:
+                    self._stop("seconds")
+
+        def __enter__(self):
+            super().__enter__()
+            if self.max_seconds is not None:
+                self._deadline = self._start + self.max_seconds
+            return self
+
+        def track(self, arr: list) -> list:
+            self._tracked = super().track(arr)
+            return self._tracked
+
+        def run(self, func: Callable, arr: list, *args, **kwargs):
+            """
+            Runs a Sort algorithm within the limits, see Sort.Stats.run.
+
+            Args:
+                func (Callable): The Sort algorithm.
+                arr (list): The list to sort, it is only modified when the algorithm finishes.
+                *args: Extra positional arguments for the algorithm.
+                **kwargs: Extra keyword arguments for the algorithm.
+
+            Returns:
+                The algorithm's result, with the elements unwrapped.
+
+            Raises:
+                Sort.Timeout: If a limit is exceeded, with the inversions left in the partial list.
+            """
+            original = list(arr)
+            try:
+                return super().run(func, arr, *args, **kwargs)
+            except Sort.Timeout as timeout:
+                timeout.partial = self.untrack(self._tracked) if self._tracked is not None else original
+                arr[:] = original
+                try:
+                    timeout.inversions = Sort.inversions(timeout.partial)
+                    timeout.total_inversions = Sort.inversions(original)
+                except TypeError:
+                    pass
+                raise
+
+    @staticmethod
+    def _bounded_worker(connection, algorithm, arr: list, limits: dict, args: tuple, kwargs: dict) -> None:
+        """
+        Subprocess entry point of Sort.bounded, sends back ("ok", result, arr), ("timeout", report)
+        or ("error", exception).
+        """
+        try:
+            func = Sort._resolve(algorithm) if isinstance(algorithm, str) else algorithm
+            result = Sort.Bounded(**limits).run(func, arr, *args, **kwargs)
+            connection.send(("ok", result, arr))
+        except Sort.Timeout as timeout:
+            connection.send(("timeout", timeout.as_dict()))
+        except Exception as error:
+            connection.send(("error", error))
+        finally:
+            connection.close()
+
+    @classmethod
+    def bounded(
+            cls,
+            algorithm: str | Callable,
+            arr: list,
+            *args,
+            max_comparisons: int | None = None,
+            max_seconds: float | None = None,
+            max_depth: int | None = None,
+            subprocess: bool = False,
+            grace: float = 1.0,
+            **kwargs,
+    ):
+        """
+        Runs a Sort algorithm under Sort.Bounded limits, optionally in a subprocess that can be killed.
+
+        In subprocess mode the algorithm runs in its own process with the same limits, and the
+        process is terminated if it has not answered grace seconds after max_seconds, so even an
+        algorithm stuck outside the instrumentation hooks cannot hang the caller.
+
+        Args:
+            algorithm (str | Callable): A Sort name such as "BogoSort.default", or the algorithm
+                                        itself (a picklable one in subprocess mode).
+            arr (list): The list to sort, it is only modified when the algorithm finishes.
+            *args: Extra positional arguments for the algorithm.
+            max_comparisons (int | None): The comparison budget.
+            max_seconds (float | None): The time budget.
+            max_depth (int | None): The deepest call nesting allowed.
+            subprocess (bool): If True, runs the algorithm in a separate process.
+            grace (float): The seconds allowed after max_seconds before the process is terminated.
+            **kwargs: Extra keyword arguments for the algorithm.
+
+        Returns:
+            The algorithm's result.
+
+        Raises:
+            Sort.Timeout: If a limit is exceeded or the subprocess had to be terminated.
+        """
+        limits = {"max_comparisons": max_comparisons, "max_seconds": max_seconds, "max_depth": max_depth}
+        if not subprocess:
+            func = cls._resolve(algorithm) if isinstance(algorithm, str) else algorithm
+            return cls.Bounded(**limits).run(func, arr, *args, **kwargs)
+
+        receiver, sender = multiprocessing.Pipe(duplex=False)
+        process = multiprocessing.Process(
+            target=cls._bounded_worker, args=(sender, algorithm, list(arr), limits, args, kwargs), daemon=True
+        )
+        start = time.perf_counter()
+        process.start()
+        sender.close()
+        try:
+            wait = None if max_seconds is None else max_seconds + grace
+            if not receiver.poll(wait):
+                process.terminate()
+                process.join()
+                try:
+                    total = cls.inversions(arr)
+                except TypeError:
+                    total = None
+                raise cls.Timeout(
+                    "killed",
+                    elapsed=time.perf_counter() - start,
+                    inversions=total,
+                    total_inversions=total,
+                )
+            message = receiver.recv()
+        finally:
+            receiver.close()
+            process.join(grace)
+            if process.is_alive():
+                process.terminate()
+        if message[0] == "timeout":
+            raise cls.Timeout(**message[1])
+        if message[0] == "error":
+            raise message[1]
+        _, result, sorted_arr = message
+        arr[:] = sorted_arr
+        return result
+
+    class SortedList:
+        """
+        A list that keeps itself sorted as values are added and removed.
+
+        Values are stored in a list of sorted blocks of at most 2 * load elements with the largest
+        value of every block kept alongside, so finding the block of a value is a binary search over
+        the block maxima and inserting into it only shifts one short block. A Fenwick tree over the
+        block lengths maps positions to blocks, which makes indexing and rank queries logarithmic
+        as well. Use tuples such as (score, name) to order records.
+
+            board = sort.SortedList([30, 10])
+            board.add(20)
+            board[0], board[-1], list(board.irange(15, 30))  # 10, 30, [20, 30]
+
+        Attributes:
+            load (int): The target block size.
+        """
+
+        def __init__(self, iterable: Iterable = (), load: int = 1000) -> None:
+            """
+            Initializes the list with the values of an iterable.
+
+            Args:
+                iterable (Iterable): The initial values, in any order.
+                load (int): The target block size, blocks are split at twice this length.
+
+            Raises:
+                ValueError: If load is less than 1.
+            """
+            if load < 1:
+                raise ValueError("load must be at least 1")
+            self.load: int = load
+            self._lists: list[list] = []
+            self._maxes: list = []
+            self._tree: list[int] | None = None
+            self._len: int = 0
+            self.add_many(iterable)
+
+        def _build(self, values: list) -> None:
+            """
+            Replaces the contents with an already sorted list of values.
+            """
+            self._lists = [values[i:i + self.load] for i in range(0, len(values), self.load)]
+            self._maxes = [block[-1] for block in self._lists]
+            self._tree = None
+            self._len = len(values)
+
+        def _fenwick(self) -> list[int]:
+            """
+            Returns the Fenwick tree of the block lengths, building it in O(blocks) when needed.
+            """
+            if self._tree is None:
+                tree = [0] + [len(block) for block in self._lists]
+                for i in range(1, len(tree)):
+                    parent = i + (i & -i)
+                    if parent < len(tree):
+                        tree[parent] += tree[i]
+                self._tree = tree
+            return self._tree
+
+        def _update(self, pos: int, delta: int) -> None:
+            """
+            Adds delta to the length of block pos in the Fenwick tree.
+            """
+            if self._tree is not None:
+                i = pos + 1
+                while i < len(self._tree):
+                    self._tree[i] += delta
+                    i += i & -i
+
+        def _offset(self, pos: int) -> int:
+            """
+            Returns the number of values stored before block pos.
+            """
+            tree = self._fenwick()
+            total = 0
+            while pos > 0:
+                total += tree[pos]
+                pos -= pos & -pos
+            return total
+
+        def _locate(self, index: int) -> tuple[int, int]:
+            """
+            Maps a position to the block holding it and the position inside that block.
+
+            Raises:
+                IndexError: If the index is out of range.
+            """
+            if index < 0:
+                index += self._len
+            if not 0 <= index < self._len:
+                raise IndexError("SortedList index out of range")
+            tree = self._fenwick()
+            pos = 0
+            step = 1 << (len(tree) - 1).bit_length()
+            while step:
+                nxt = pos + step
+                if nxt < len(tree) and tree[nxt] <= index:
+                    pos = nxt
+                    index -= tree[nxt]
+                step >>= 1
+            return pos, index
+
+        def add(self, value) -> None:
+            """
+            Adds a value, after any equal values already in the list.
+
+            Args:
+                value: The value to add.
+            """
+            if not self._maxes:
+                self._lists.append([value])
+                self._maxes.append(value)
+                self._tree = None
+                self._len = 1
+                return
+            pos = bisect_right(self._maxes, value)
+            if pos == len(self._maxes):
+                pos -= 1
+                self._lists[pos].append(value)
+                self._maxes[pos] = value
+            else:
+                insort(self._lists[pos], value)
+            self._len += 1
+            self._update(pos, 1)
+            if len(self._lists[pos]) > 2 * self.load:
+                block = self._lists[pos]
+                self._lists[pos:pos + 1] = [block[:self.load], block[self.load:]]
+                self._maxes[pos:pos + 1] = [block[self.load - 1], block[-1]]
+                self._tree = None
+
+        def add_many(self, iterable: Iterable) -> None:
+            """
+            Adds every value of an iterable.
+
+            A batch that is large compared to the list is sorted once and merged with the current
+            values in linear time instead of being inserted one by one.
+
+            Args:
+                iterable (Iterable): The values to add, in any order.
+            """
+            values = sorted(iterable)
+            if len(values) * 8 >= self._len:
+                self._build(list(merge(self, values)))
+            else:
+                for value in values:
+                    self.add(value)
+
+        def _delete(self, pos: int, idx: int):
+            """
+            Removes and returns the value at position idx of block pos.
+            """
+            block = self._lists[pos]
+            value = block.pop(idx)
+            self._len -= 1
+            if not block:
+                del self._lists[pos]
+                del self._maxes[pos]
+                self._tree = None
+                return value
+            self._maxes[pos] = block[-1]
+            self._update(pos, -1)
+            if len(block) < self.load // 2 and len(self._lists) > 1:
+                # Merge short blocks into a neighbour so the number of blocks stays proportional to n.
+                left = pos - 1 if pos else pos
+                self._lists[left:left + 2] = [self._lists[left] + self._lists[left + 1]]
+                self._maxes[left:left + 2] = [self._maxes[left + 1]]
+                self._tree = None
+                merged = self._lists[left]
+                if len(merged) > 2 * self.load:
+                    half = len(merged) // 2
+                    self._lists[left:left + 1] = [merged[:half], merged[half:]]
+                    self._maxes[left:left + 1] = [merged[half - 1], merged[-1]]
+            return value
+
+        def _find(self, value) -> tuple[int, int] | None:
+            """
+            Returns the block and in-block positions of the first occurrence of value, or None.
+            """
+            pos = bisect_left(self._maxes, value)
+            if pos == len(self._maxes):
+                return None
+            idx = bisect_left(self._lists[pos], value)
+            if self._lists[pos][idx] != value:
+                return None
+            return pos, idx
+
+        def remove(self, value) -> None:
+            """
+            Removes one occurrence of a value.
+
+            Args:
+                value: The value to remove.
+
+            Raises:
+                ValueError: If the value is not in the list.
+            """
+            found = self._find(value)
+            if found is None:
+                raise ValueError(f"{value!r} not in SortedList")
+            self._delete(*found)
+
+        def discard(self, value) -> None:
+            """
+            Removes one occurrence of a value if it is in the list.
+
+            Args:
+                value: The value to remove.
+            """
+            found = self._find(value)
+            if found is not None:
+                self._delete(*found)
+
+        def pop(self, index: int = -1):
+            """
+            Removes and returns the value at a position, the largest value by default.
+
+            Args:
+                index (int): The position, negative positions count from the end.
+
+            Returns:
+                The removed value.
+
+            Raises:
+                IndexError: If the list is empty or the index is out of range.
+            """
+            return self._delete(*self._locate(index))
+
+        def bisect_left(self, value) -> int:
+            """
+            Returns the position where value would be inserted before any equal values.
+
+            Args:
+                value: The value to look up.
+
+            Returns:
+                int: The insertion position.
+            """
+            pos = bisect_left(self._maxes, value)
+            if pos == len(self._maxes):
+                return self._len
+            return self._offset(pos) + bisect_left(self._lists[pos], value)
+
+        def bisect_right(self, value) -> int:
+            """
+            Returns the position where value would be inserted after any equal values.
+
+            Args:
+                value: The value to look up.
+
+            Returns:
+                int: The insertion position.
+            """
+            pos = bisect_right(self._maxes, value)
+            if pos == len(self._maxes):
+                return self._len
+            return self._offset(pos) + bisect_right(self._lists[pos], value)
+
+        def index(self, value) -> int:
+            """
+            Returns the position of the first occurrence of a value.
+
+            Args:
+                value: The value to look up.
+
+            Returns:
+                int: Its position.
+
+            Raises:
+                ValueError: If the value is not in the list.
+            """
+            found = self._find(value)
+            if found is None:
+                raise ValueError(f"{value!r} not in SortedList")
+            return self._offset(found[0]) + found[1]
+
+        def count(self, value) -> int:
+            """
+            Returns the number of occurrences of a value.
+
+            Args:
+                value: The value to count.
+
+            Returns:
+                int: The number of equal values in the list.
+            """
+            return self.bisect_right(value) - self.bisect_left(value)
+
+        def irange(self, minimum=None, maximum=None, inclusive: tuple[bool, bool] = (True, True)) -> Iterator:
+            """
+            Iterates lazily over the values between minimum and maximum, in order.
+
+            Args:
+                minimum: The lower bound, None for no lower bound.
+                maximum: The upper bound, None for no upper bound.
+                inclusive (tuple[bool, bool]): Whether each bound is included.
+
+            Returns:
+                Iterator: The values in range.
+            """
+            if minimum is None:
+                start = 0
+            else:
+                start = self.bisect_left(minimum) if inclusive[0] else self.bisect_right(minimum)
+            if maximum is None:
+                stop = self._len
+            else:
+                stop = self.bisect_right(maximum) if inclusive[1] else self.bisect_left(maximum)
+            if start >= stop:
+                return
+            pos, idx = self._locate(start)
+            remaining = stop - start
+            while remaining:
+                block = self._lists[pos]
+                chunk = block[idx:idx + remaining]
+                yield from chunk
+                remaining -= len(chunk)
+                pos, idx = pos + 1, 0
+
+        def __getitem__(self, index: int | slice):
+            if isinstance(index, slice):
+                return [self[i] for i in range(*index.indices(self._len))]
+            pos, idx = self._locate(index)
+            return self._lists[pos][idx]
+
+        def __delitem__(self, index: int) -> None:
+            self._delete(*self._locate(index))
+
+        def __len__(self) -> int:
+            return self._len
+
+        def __iter__(self) -> Iterator:
+            for block in self._lists:
+                yield from block
+
+        def __reversed__(self) -> Iterator:
+            for block in reversed(self._lists):
+                yield from reversed(block)
+
+        def __contains__(self, value) -> bool:
+            return self._find(value) is not None
+
+        def __repr__(self) -> str:
+            return f"SortedList({list(self)!r})"
+
+    class Records:
+        """
+        A mutable sequence view of fixed-width records stored back to back in a writable buffer.
+
+        Reading a record copies its bytes, writing one stores them back in the buffer, so
+        Sort.InPlace can sort the records of a bytearray or of a memory-mapped file without
+        loading the file. Records are ordered by the bytes of their key field, which is the whole
+        record unless key_offset and key_size narrow it; store numbers big-endian (and unsigned)
+        for their byte order to match their numeric order.
+
+            with open(path, "r+b") as file, mmap.mmap(file.fileno(), 0) as mapped:
+                Sort.InPlace.quick(Sort.Records(mapped, width=16, key_size=8))
+
+        Attributes:
+            width (int): The size of one record in bytes.
+            key_offset (int): The offset of the key field inside a record.
+            key_size (int): The size of the key field in bytes.
+        """
+
+        def __init__(self, buffer, width: int, key_offset: int = 0, key_size: int | None = None) -> None:
+            """
+            Initializes the view over a writable buffer.
+
+            Args:
+                buffer: A writable bytes-like object (bytearray, mmap, memoryview...).
+                width (int): The size of one record in bytes.
+                key_offset (int): The offset of the key field inside a record.
+                key_size (int | None): The size of the key field, defaults to the rest of the record.
+
+            Raises:
+                ValueError: If the buffer length is not a multiple of width or the key field does not
+                            fit in a record.
+            """
+            view = memoryview(buffer).cast("B")
+            if width < 1 or len(view) % width:
+                view.release()
+                raise ValueError("the buffer length must be a multiple of a positive width")
+            key_size = width - key_offset if key_size is None else key_size
+            if key_offset < 0 or key_size < 1 or key_offset + key_size > width:
+                view.release()
+                raise ValueError("the key field must fit inside a record")
+            self._view = view
+            self.width: int = width
+            self.key_offset: int = key_offset
+            self.key_size: int = key_size
+
+        def key(self, record: bytes) -> bytes:
+            """
+            Returns the key field of a record.
+
+            Args:
+                record (bytes): A record read from this view.
+
+            Returns:
+                bytes: Its key bytes.
+            """
+            return record[self.key_offset:self.key_offset + self.key_size]
+
+        def release(self) -> None:
+            """
+            Releases the underlying buffer, needed before closing an mmap.
+            """
+            self._view.release()
+
+        def __len__(self) -> int:
+            return len(self._view) // self.width
+
+        def __getitem__(self, index: int) -> bytes:
+            start = index * self.width
+            return self._view[start:start + self.width].tobytes()
+
+        def __setitem__(self, index: int, record: bytes) -> None:
+            start = index * self.width
+            self._view[start:start + self.width] = record
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, exc_type, exc_value, traceback) -> None:
+            self.release()
+
+    class InPlace:
+        """
+        Sorts that work on any mutable sequence through indexing alone, without copying the data.
+
+        Every method accepts a list, an array.array, a bytearray, a one-dimensional memoryview
+        (for example memoryview(mapped_file).cast("q")) or a Sort.Records view, and only keeps a
+        few elements and O(log n) indexes aside. key is evaluated at every comparison instead of
+        once per element, since caching the keys would copy the data; a Sort.Records view is
+        compared on its key field by default.
+        """
+
+        # Ranges smaller than this are finished with insertion sort.
+        _CUTOFF = 16
+        _SHELL_GAPS = (1, 4, 10, 23, 57, 132, 301, 701, 1750)
+
+        @staticmethod
+        def _less(arr, key: Callable | None) -> Callable:
+            """
+            Returns the comparison used on the elements of arr.
+            """
+            if key is None and isinstance(arr, Sort.Records):
+                key = arr.key
+            if key is None:
+                return operator.lt
+            return lambda a, b: key(a) < key(b)
+
+        @staticmethod
+        def _insertion(arr, lo: int, hi: int, less: Callable) -> None:
+            """
+            Insertion sort of arr[lo:hi].
+            """
+            for i in range(lo + 1, hi):
+                value = arr[i]
+                j = i - 1
+                while j >= lo and less(value, arr[j]):
+                    arr[j + 1] = arr[j]
+                    j -= 1
+                arr[j + 1] = value
+
+        @classmethod
+        def insertion(cls, arr, key: Callable | None = None):
+            """
+            Sorts a mutable sequence in place with insertion sort. This sort is stable.
+
+            Args:
+                arr: The sequence to sort.
+                key (Callable | None): Computes the sort key of an element, at every comparison.
+
+            Returns:
+                The sorted sequence.
+            """
+            cls._insertion(arr, 0, len(arr), cls._less(arr, key))
+            return arr
+
+        @classmethod
+        def shell(cls, arr, key: Callable | None = None):
+            """
+            Sorts a mutable sequence in place with shell sort and Ciura's gap sequence. This sort is not stable.
+
+            Args:
+                arr: The sequence to sort.
+                key (Callable | None): Computes the sort key of an element, at every comparison.
+
+            Returns:
+                The sorted sequence.
+            """
+            less = cls._less(arr, key)
+            n = len(arr)
+            gaps = list(cls._SHELL_GAPS)
+            while gaps[-1] * 9 // 4 < n:
+                gaps.append(gaps[-1] * 9 // 4)
+            for gap in reversed(gaps):
+                for i in range(gap, n):
+                    value = arr[i]
+                    j = i
+                    while j >= gap and less(value, arr[j - gap]):
+                        arr[j] = arr[j - gap]
+                        j -= gap
+                    arr[j] = value
+            return arr
+
+        @classmethod
+        def _sift_down(cls, arr, lo: int, start: int, end: int, less: Callable) -> None:
+            """
+            Moves arr[lo + start] down the max-heap stored in arr[lo:lo + end].
+            """
+            value = arr[lo + start]
+            i = start
+            child = 2 * i + 1
+            while child < end:
+                if child + 1 < end and less(arr[lo + child], arr[lo + child + 1]):
+                    child += 1
+                if not less(value, arr[lo + child]):
+                    break
+                arr[lo + i] = arr[lo + child]
+                i = child
+                child = 2 * i + 1
+            arr[lo + i] = value
+
+        @classmethod
+        def _heap(cls, arr, lo: int, hi: int, less: Callable) -> None:
+            """
+            Heap sort of arr[lo:hi].
+            """
+            n = hi - lo
+            for start in range(n // 2 - 1, -1, -1):
+                cls._sift_down(arr, lo, start, n, less)
+            for end in range(n - 1, 0, -1):
+                arr[lo], arr[lo + end] = arr[lo + end], arr[lo]
+                cls._sift_down(arr, lo, 0, end, less)
+
+        @classmethod
+        def heap(cls, arr, key: Callable | None = None):
+            """
+            Sorts a mutable sequence in place with an iterative heap sort. This sort is not stable.
+
+            Args:
+                arr: The sequence to sort.
+                key (Callable | None): Computes the sort key of an element, at every comparison.
+
+            Returns:
+                The sorted sequence.
+            """
+            cls._heap(arr, 0, len(arr), cls._less(arr, key))
+            return arr
+
+        @classmethod
+        def quick(cls, arr, key: Callable | None = None):
+            """
+            Sorts a mutable sequence in place with an iterative introsort.
+
+            Ranges are partitioned around a median of three with Hoare's scheme, the larger side is
+            pushed on an explicit stack so it holds O(log n) ranges, small ranges are finished with
+            insertion sort and ranges that keep partitioning badly switch to heap sort.
+            This sort is not stable.
+
+            Args:
+                arr: The sequence to sort.
+                key (Callable | None): Computes the sort key of an element, at every comparison.
+
+            Returns:
+                The sorted sequence.
+            """
+            less = cls._less(arr, key)
+            stack = [(0, len(arr), 2 * max(len(arr), 1).bit_length())]
+            while stack:
+                lo, hi, budget = stack.pop()
+                while hi - lo > cls._CUTOFF:
+                    if budget == 0:
+                        cls._heap(arr, lo, hi, less)
+                        break
+                    budget -= 1
+                    mid = (lo + hi) // 2
+                    if less(arr[mid], arr[lo]):
+                        arr[lo], arr[mid] = arr[mid], arr[lo]
+                    if less(arr[hi - 1], arr[lo]):
+                        arr[lo], arr[hi - 1] = arr[hi - 1], arr[lo]
+                    if less(arr[hi - 1], arr[mid]):
+                        arr[mid], arr[hi - 1] = arr[hi - 1], arr[mid]
+                    pivot = arr[mid]
+                    i, j = lo - 1, hi
+                    while True:
+                        i += 1
+                        while less(arr[i], pivot):
+                            i += 1
+                        j -= 1
+                        while less(pivot, arr[j]):
+                            j -= 1
+                        if i >= j:
+                            break
+                        arr[i], arr[j] = arr[j], arr[i]
+                    if j + 1 - lo < hi - j - 1:
+                        stack.append((j + 1, hi, budget))
+                        hi = j + 1
+                    else:
+                        stack.append((lo, j + 1, budget))
+                        lo = j + 1
+                else:
+                    cls._insertion(arr, lo, hi, less)
+            return arr
+
+        @classmethod
+        def radix(cls, arr):
+            """
+            Sorts integers or records in place with an MSD American flag radix sort.
+
+            Each pass counts the byte values of the current digit in a range, then permutes the
+            elements into their buckets by following swap cycles, so no output buffer is needed;
+            the buckets are then refined on the next byte. Ranges smaller than InPlace._CUTOFF are
+            finished with insertion sort. Integers are read as two's complement of the item size
+            of arr, so negative values order correctly; records are ordered on their key bytes.
+            This sort is not stable.
+
+            Args:
+                arr (array | bytearray | memoryview | Sort.Records): The integers or records to sort.
+
+            Returns:
+                The sorted sequence.
+
+            Raises:
+                TypeError: If arr does not hold integers of a known size or records.
+            """
+            if isinstance(arr, Sort.Records):
+                levels = arr.key_size
+                offset = arr.key_offset
+
+                def digit(value, level):
+                    return value[offset + level]
+            else:
+                if isinstance(arr, (bytes, bytearray)):
+                    code = "B"
+                else:
+                    code = getattr(arr, "typecode", None) or getattr(arr, "format", "")
+                if len(code) != 1 or code not in "bBhHiIlLqQ":
+                    raise TypeError("InPlace.radix sorts integer buffers or Sort.Records")
+                levels = array(code).itemsize
+                top = 8 * (levels - 1)
+                sign = 0x80 if code.islower() else 0
+
+                def digit(value, level):
+                    shift = top - 8 * level
+                    return ((value >> shift) & 0xFF) ^ (sign if level == 0 else 0)
+
+            less = cls._less(arr, None)
+            stack = [(0, len(arr), 0)]
+            while stack:
+                lo, hi, level = stack.pop()
+                if hi - lo <= cls._CUTOFF:
+                    cls._insertion(arr, lo, hi, less)
+                    continue
+                counts = [0] * 256
+                for i in range(lo, hi):
+                    counts[digit(arr[i], level)] += 1
+                heads = [0] * 256
+                tails = [0] * 256
+                position = lo
+                for b in range(256):
+                    heads[b] = position
+                    position += counts[b]
+                    tails[b] = position
+                starts = heads[:]
+                for b in range(256):
+                    while heads[b] < tails[b]:
+                        value = arr[heads[b]]
+                        d = digit(value, level)
+                        while d != b:
+                            displaced = arr[heads[d]]
+                            arr[heads[d]] = value
+                            heads[d] += 1
+                            value = displaced
+                            d = digit(value, level)
+                        arr[heads[b]] = value
+                        heads[b] += 1
+                if level + 1 < levels:
+                    for b in range(256):
+                        if counts[b] > 1:
+                            stack.append((starts[b], tails[b], level + 1))
+            return arr
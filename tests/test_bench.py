@@ -0,0 +1,68 @@
+import csv
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from algopy.bench import Bench
+
+
+class TestBench(unittest.TestCase):
+    def test_generate_distributions(self):
+        for distribution in Bench.DISTRIBUTIONS:
+            data = Bench.generate(distribution, 50)
+            self.assertEqual(len(data), 50)
+        self.assertEqual(Bench.generate("sorted", 5), [0, 1, 2, 3, 4])
+        self.assertEqual(Bench.generate("organ_pipe", 5), [0, 1, 3, 2, 1])
+
+    def test_generate_unknown_distribution(self):
+        with self.assertRaises(ValueError):
+            Bench.generate("gaussian", 10)
+
+    def test_sort_reports_counters(self):
+        rows = Bench.sort(sizes=(10, 50), distributions=("random",), algorithms=("heap_sort", "counting_sort"))
+        self.assertEqual(len(rows), 4)
+        self.assertTrue(all(row["status"] == "ok" and row["correct"] for row in rows))
+        heap_row = rows[1]
+        self.assertGreater(heap_row["comparisons"], 0)
+        self.assertGreater(heap_row["writes"], 0)
+        self.assertIsNotNone(heap_row["peak_memory"])
+        self.assertIsNone(rows[3]["comparisons"])
+
+    def test_sort_skips_capped_and_over_budget_sizes(self):
+        rows = Bench.sort(sizes=(10,), distributions=("random",), algorithms=("sleep_sort",))
+        self.assertEqual(rows[0]["status"], "skipped: size cap")
+        rows = Bench.sort(sizes=(10, 10_000), distributions=("reversed",), algorithms=("BubbleSort.default",),
+                          budget=0.0)
+        self.assertEqual(rows[1]["status"], "skipped: budget")
+
+    def test_write_json_and_csv(self):
+        for output_format in ("json", "csv"):
+            rows = Bench.sort(sizes=(10,), distributions=("sorted",), algorithms=("tim_sort",))
+            buffer = io.StringIO()
+            Bench.write(rows, buffer, output_format)
+            if output_format == "json":
+                self.assertEqual(json.loads(buffer.getvalue())[0]["algorithm"], "tim_sort")
+            else:
+                self.assertTrue(buffer.getvalue().startswith(",".join(Bench.FIELDS)))
+
+    def test_main_writes_json_and_csv(self):
+        with tempfile.TemporaryDirectory() as directory:
+            for output_format in ("json", "csv"):
+                path = os.path.join(directory, f"bench.{output_format}")
+                code = Bench.main([
+                    "sort", "--sizes", "10", "20", "--distributions", "sorted", "--algorithms", "tim_sort",
+                    "--format", output_format, "--output", path,
+                ])
+                self.assertEqual(code, 0)
+                with open(path, newline="", encoding="utf-8") as file:
+                    rows = json.load(file) if output_format == "json" else list(csv.DictReader(file))
+                self.assertEqual([row["size"] for row in rows], [10, 20] if output_format == "json" else ["10", "20"])
+                self.assertEqual({row["algorithm"] for row in rows}, {"tim_sort"})
+
+    def test_predict_extrapolates_measured_growth(self):
+        self.assertAlmostEqual(Bench._predict([(100, 0.01)], 1000), 0.1)
+        self.assertAlmostEqual(Bench._predict([(100, 0.01), (1000, 1.0)], 10_000), 100.0)
+        self.assertAlmostEqual(Bench._predict([(100, 0.01), (1000, 0.05)], 10_000), 0.5)
+        self.assertAlmostEqual(Bench._predict([(10, 1e-6), (100, 1.0)], 1000), 1000.0)
@@ -1,3 +1,6 @@
+import math
+import random
+import threading
 import unittest
 
 from algopy import bt
@@ -62,7 +65,7 @@ class TestBinaryTree(unittest.TestCase):
         expected_traversal = [
             "Level 0: 10",
             "Level 1: 5 6 7",
-            "Level 1: 12 17 20 30",
+            "Level 1: 10 12 17 20 30",
         ]
         self.assertEqual(tree.traverse(), expected_traversal)
 
@@ -97,3 +100,278 @@ class TestBinaryTree(unittest.TestCase):
         arr = [10, 20, 5, 6, 12, 30, 7, 17]
         bted_arr = tree.tree_sort(arr)
         self.assertEqual(bted_arr, [5, 6, 7, 10, 12, 17, 20, 30])
+
+    def test_trees_are_independent_instances(self):
+        first, second = bt.Degenerate(), bt.Degenerate()
+        first.insert(1)
+        second.insert(2)
+        self.assertEqual(first.traverse(), "1 -> None")
+        self.assertEqual(second.traverse(), "2 -> None")
+
+        red, black = bt.RedBlackTree(), bt.RedBlackTree()
+        red.insert(5)
+        self.assertEqual(str(black), "[]")
+        self.assertEqual(str(red), "[5]")
+
+        small, large = bt.BPlusTree(t=2), bt.BPlusTree(t=3)
+        for key in range(10):
+            small.insert(key)
+        self.assertEqual(small.t, 2)
+        self.assertEqual(large.traverse(), ["Level 0: "])
+
+        left, right = bt.SegmentTree([1, 2]), bt.SegmentTree([10, 20, 30])
+        self.assertEqual((left.n, left.query(0, 1)), (2, 3))
+        self.assertEqual((right.n, right.query(0, 2)), (3, 60))
+
+        self.assertEqual(bt.Perfect(2).nodes, [None] * 3)
+        self.assertEqual(bt.Perfect(1).nodes, [None])
+
+    def test_locked_trees_survive_concurrent_inserts(self):
+        shared = threading.Lock()
+        trees = [bt.RedBlackTree(lock=True), bt.BPlusTree(t=2, lock=shared), bt.Degenerate(lock=True)]
+
+        def work(offset):
+            for key in range(offset, 400, 4):
+                for tree in trees:
+                    tree.insert(key)
+
+        threads = [threading.Thread(target=work, args=(offset,)) for offset in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(str(trees[0]), str(list(range(400))))
+        self.assertTrue(all(trees[1].search(key) for key in range(400)))
+        self.assertEqual(sorted(int(key) for key in trees[2].traverse().split(" -> ")[:-1]), list(range(400)))
+
+    def test_segment_tree_shares_a_lock(self):
+        lock = threading.RLock()
+        left, right = bt.SegmentTree([1, 2, 3], lock=lock), bt.SegmentTree([4, 5], lock=lock)
+        with lock:
+            left.update(0, 7)
+            self.assertEqual(right.query(0, 1), 9)
+        self.assertEqual(left.query(0, 2), 12)
+        with self.assertRaises(TypeError):
+            bt.Degenerate(lock=object())
+
+    def test_nodes_use_slots(self):
+        for node in (bt._Node(1), bt._AVLNode(1), bt._RBNode(1), bt._BPlusTreeNode()):
+            self.assertFalse(hasattr(node, "__dict__"))
+        node = bt._Node(4)
+        node.key = 5
+        self.assertEqual((node.value, node.key), (5, 5))
+        red = bt._RBNode(1)
+        self.assertEqual((red.red, red.color), (True, "red"))
+        red.color = "black"
+        self.assertFalse(red.red)
+        with self.assertRaises(ValueError):
+            red.color = "blue"
+
+    def test_avl_arena_matches_avl(self):
+        keys = [10, 20, 30, 40, 50, 25]
+        tree = bt.AVLArena(keys)
+        self.assertEqual(tree.pre_order(), "30 20 10 25 40 50")
+        self.assertTrue(tree.delete(40))
+        self.assertFalse(tree.delete(40))
+        self.assertEqual(tree.pre_order(), "30 20 10 25 50")
+        self.assertEqual((list(tree), len(tree)), ([10, 20, 25, 30, 50], 5))
+        self.assertIn(25, tree)
+        self.assertNotIn(40, tree)
+
+    def test_avl_arena_stays_balanced(self):
+        rng = random.Random(5)
+        keys = [rng.randrange(-1000, 1000) for _ in range(2000)]
+        tree = bt.AVLArena(keys)
+        for key in keys[::2]:
+            self.assertTrue(tree.delete(key))
+        remaining = sorted(keys[1::2])
+        self.assertEqual(list(tree), remaining)
+        self.assertLessEqual(tree.height, 1.45 * math.log2(len(remaining) + 2))
+        self.assertLess(tree.arena.nbytes, 30 * len(keys))
+        with self.assertRaises(OverflowError):
+            tree.insert(2 ** 63)
+
+    def test_red_black_arena_keeps_invariants(self):
+        rng = random.Random(6)
+        keys = [rng.randrange(500) for _ in range(3000)]
+        tree = bt.RedBlackArena(keys)
+        self.assertEqual(list(tree), sorted(set(keys)))
+        self.assertEqual(len(tree), len(set(keys)))
+        self.assertEqual(str(bt.RedBlackArena([10, 20, 30, 40, 50, 25])), "[10, 20, 25, 30, 40, 50]")
+        arena = tree.arena
+
+        def black_height(node):
+            if not node:
+                return 1
+            if arena.meta[node]:
+                self.assertFalse(arena.meta[arena.left[node]] or arena.meta[arena.right[node]])
+            left, right = black_height(arena.left[node]), black_height(arena.right[node])
+            self.assertEqual(left, right)
+            return left + (not arena.meta[node])
+
+        self.assertFalse(arena.meta[tree.root])
+        black_height(tree.root)
+        self.assertIn(keys[0], tree)
+        self.assertNotIn(500, tree)
+
+    def test_red_black_arena_deletes_and_rebalances(self):
+        rng = random.Random(10)
+        tree = bt.RedBlackArena()
+        reference = set()
+        arena = tree.arena
+
+        def black_height(node):
+            if not node:
+                return 1
+            if arena.meta[node]:
+                self.assertFalse(arena.meta[arena.left[node]] or arena.meta[arena.right[node]])
+            left, right = black_height(arena.left[node]), black_height(arena.right[node])
+            self.assertEqual(left, right)
+            return left + (not arena.meta[node])
+
+        for step in range(4000):
+            key = rng.randrange(400)
+            if rng.random() < 0.55:
+                tree.insert(key)
+                reference.add(key)
+            else:
+                self.assertEqual(tree.delete(key), key in reference)
+                reference.discard(key)
+            if step % 200 == 0:
+                self.assertFalse(arena.meta[tree.root])
+                black_height(tree.root)
+        self.assertEqual((list(tree), len(tree)), (sorted(reference), len(reference)))
+        black_height(tree.root)
+        for key in list(reference):
+            self.assertTrue(tree.delete(key))
+        self.assertEqual((tree.root, len(tree), arena.meta[0]), (0, 0, 0))
+
+    def test_avl_handles_duplicates_and_missing_keys(self):
+        root = None
+        for key in [5, 5, 5, 3, 5, 3, 8, 5]:
+            root = bt.AVL.insert(root, key)
+        self.assertEqual(bt.AVL.in_order(root), [3, 3, 5, 5, 5, 5, 5, 8])
+        root = bt.AVL.delete(root, 4)
+        root = bt.AVL.delete(root, 5)
+        self.assertEqual(bt.AVL.in_order(root), [3, 3, 5, 5, 5, 5, 8])
+        self.assertIsNone(bt.AVL.delete(None, 1))
+        self.assertIsNone(bt.AVL.delete(bt.AVL.insert(None, 1), 1))
+
+    def test_avl_from_sorted_is_balanced(self):
+        root = bt.AVL.from_sorted(range(1, 8))
+        self.assertEqual(bt.AVL.pre_order(root), "4 2 1 3 6 5 7")
+        self.assertEqual(root.height, 3)
+        root = bt.AVL.from_sorted(range(1000))
+        self.assertEqual(root.height, 10)
+        self.assertIsNone(bt.AVL.from_sorted([]))
+        with self.assertRaises(ValueError):
+            bt.AVL.from_sorted([2, 1])
+
+    def test_avl_bulk_insert_merges(self):
+        rng = random.Random(7)
+        keys = [rng.randrange(10_000) for _ in range(3000)]
+        root = bt.AVL.bulk_insert(None, keys[:1000])
+        root = bt.AVL.bulk_insert(root, keys[1000:])
+        root = bt.AVL.bulk_insert(root, [42])
+        self.assertEqual(bt.AVL.in_order(root), sorted(keys + [42]))
+
+        def height(node):
+            if not node:
+                return 0
+            left, right = height(node.left), height(node.right)
+            self.assertLessEqual(abs(left - right), 1)
+            self.assertEqual(node.height, 1 + max(left, right))
+            return node.height
+
+        height(root)
+
+    def test_red_black_tree_is_an_ordered_map(self):
+        tree = bt.RedBlackTree()
+        for key in [10, 20, 30, 40, 50, 25]:
+            tree.insert(key, str(key))
+        tree.insert(20, "twenty")
+        self.assertEqual((len(tree), tree.min(), tree.max()), (6, 10, 50))
+        self.assertEqual(tree.get(20), "twenty")
+        self.assertIsNone(tree.get(21))
+        self.assertTrue(tree.search(25))
+        self.assertNotIn(26, tree)
+        self.assertEqual((tree.floor(26), tree.ceiling(26)), (25, 30))
+        self.assertEqual((tree.floor(5), tree.ceiling(55)), (None, None))
+        self.assertEqual(list(tree.range(20, 40)), [20, 25, 30, 40])
+        self.assertEqual(list(tree.range(20, 40, inclusive=(False, False))), [25, 30])
+        self.assertEqual(list(tree.items(45)), [(50, "50")])
+
+    def test_red_black_tree_deletes_and_rebalances(self):
+        rng = random.Random(8)
+        tree = bt.RedBlackTree()
+        reference = set()
+        for _ in range(3000):
+            key = rng.randrange(300)
+            if rng.random() < 0.6:
+                tree.insert(key)
+                reference.add(key)
+            else:
+                self.assertEqual(tree.delete(key), key in reference)
+                reference.discard(key)
+        self.assertEqual(list(tree), sorted(reference))
+        self.assertEqual((len(tree), tree.min(), tree.max()), (len(reference), min(reference), max(reference)))
+
+        def black_height(node):
+            if node is tree.NIL:
+                return 1
+            if node.red:
+                self.assertFalse(node.left.red or node.right.red)
+            left, right = black_height(node.left), black_height(node.right)
+            self.assertEqual(left, right)
+            return left + (not node.red)
+
+        self.assertFalse(tree.root.red)
+        black_height(tree.root)
+        for key in sorted(reference):
+            tree.delete(key)
+        self.assertEqual((len(tree), str(tree)), (0, "[]"))
+        with self.assertRaises(ValueError):
+            tree.min()
+
+    def test_bplus_tree_is_an_ordered_map(self):
+        tree = bt.BPlusTree(fanout=4)
+        for key in [10, 20, 5, 6, 12, 30, 7, 17]:
+            tree.insert(key, key * 10)
+        tree.insert(6, "six")
+        self.assertEqual(len(tree), 8)
+        self.assertEqual((tree.get(6), tree.get(30), tree.get(8, "none")), ("six", 300, "none"))
+        self.assertIn(17, tree)
+        self.assertEqual(list(tree.range(6, 17)), [6, 7, 10, 12, 17])
+        self.assertEqual(list(tree.range(6, 17, inclusive=(False, False), reverse=True)), [12, 10, 7])
+        self.assertEqual(list(tree.items(20)), [(20, 200), (30, 300)])
+        with self.assertRaises(ValueError):
+            bt.BPlusTree(fanout=3)
+
+    def test_bplus_tree_deletes_with_borrow_and_merge(self):
+        rng = random.Random(9)
+        tree = bt.BPlusTree(t=2)
+        keys = rng.sample(range(1000), 500)
+        for key in keys:
+            tree.insert(key)
+        for key in keys[:400]:
+            self.assertTrue(tree.delete(key))
+        self.assertFalse(tree.delete(keys[0]))
+        remaining = sorted(keys[400:])
+        self.assertEqual((list(tree), len(tree)), (remaining, 100))
+        self.assertEqual(list(tree.range(reverse=True)), remaining[::-1])
+        for key in remaining:
+            tree.delete(key)
+        self.assertEqual((tree.traverse(), len(tree)), (["Level 0: "], 0))
+
+    def test_bplus_tree_bulk_loads(self):
+        tree = bt.BPlusTree.bulk_load(range(0, 200, 2), [str(k) for k in range(0, 200, 2)], fanout=8)
+        self.assertEqual(list(tree), list(range(0, 200, 2)))
+        self.assertEqual(tree.get(42), "42")
+        levels = {line.split(":")[0] for line in tree.traverse()}
+        self.assertEqual(levels, {"Level 0", "Level 1", "Level 2"})
+        tree.insert(41)
+        tree.delete(40)
+        self.assertEqual(list(tree.range(38, 44)), [38, 41, 42, 44])
+        with self.assertRaises(ValueError):
+            bt.BPlusTree.bulk_load([1, 1])
+        self.assertEqual(len(bt.BPlusTree.bulk_load([])), 0)
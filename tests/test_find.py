@@ -14,6 +14,9 @@ class TestFind(unittest.TestCase):
         with self.assertRaises(Exception):
             find.InArray.largest_number(None)
 
+    def test_largest_number_ignores_non_numbers(self):
+        self.assertEqual(find.InArray.largest_number([1, "9", 2.5, None, 2]), 2.5)
+
     def test_smallest_number_in_array(self):
         self.assertEqual(find.InArray.smallest_number([1, 2, 3, 4, 5]), 1)
 
@@ -24,6 +27,9 @@ class TestFind(unittest.TestCase):
         with self.assertRaises(Exception):
             find.InArray.smallest_number(None)
 
+    def test_smallest_number_converts_whole_floats(self):
+        self.assertEqual(find.InArray.smallest_number([3.0, "1", 7]), 3)
+
     def test_index_all_occurrences(self):
         self.assertEqual(find.InArray.Objects.index_all([1, 2, 3, 2, 4], 2), [1, 3])
 
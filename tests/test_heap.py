@@ -0,0 +1,77 @@
+import heapq
+import random
+import unittest
+
+from algopy import heap
+
+
+class TestHeap(unittest.TestCase):
+    def test_heapify_builds_d_ary_heaps(self):
+        for d in (2, 3, 4, 8):
+            arr = [random.randint(0, 100) for _ in range(300)]
+            heap.heapify(arr, d)
+            for i in range(1, len(arr)):
+                self.assertLessEqual(arr[(i - 1) // d], arr[i])
+            heap.heapify(arr, d, reverse=True)
+            for i in range(1, len(arr)):
+                self.assertGreaterEqual(arr[(i - 1) // d], arr[i])
+        self.assertRaises(ValueError, heap.heapify, [], 1)
+
+    def test_dary_pops_in_order(self):
+        arr = [random.randint(-50, 50) for _ in range(500)]
+        queue = heap.DAry(arr)
+        self.assertEqual([queue.pop() for _ in range(len(arr))], sorted(arr))
+        queue = heap.DAry(arr, d=3, reverse=True)
+        self.assertEqual([queue.pop() for _ in range(len(arr))], sorted(arr, reverse=True))
+        self.assertRaises(IndexError, queue.pop)
+
+    def test_dary_key_keeps_insertion_order_and_push_helpers(self):
+        queue = heap.DAry([(1, "a"), (0, "b"), (1, "c"), (0, "d")], key=lambda item: item[0])
+        self.assertEqual([queue.pop() for _ in range(4)], [(0, "b"), (0, "d"), (1, "a"), (1, "c")])
+        queue = heap.DAry([5, 1, 3])
+        self.assertEqual(queue.pushpop(0), 0)
+        self.assertEqual(queue.replace(10), 1)
+        self.assertEqual(queue.peek(), 3)
+        queue.push(2)
+        self.assertEqual(len(queue), 4)
+        self.assertEqual(queue.pop(), 2)
+
+    def test_indexed_updates_priorities_in_place(self):
+        queue = heap.Indexed([("a", 5), ("b", 3), ("c", 8)])
+        queue.decrease_key("c", 1)
+        queue.update("b", 9)
+        queue.push("d", 4)
+        self.assertEqual(queue["b"], 9)
+        self.assertIn("a", queue)
+        self.assertRaises(ValueError, queue.decrease_key, "a", 7)
+        queue.remove("a")
+        self.assertEqual([queue.pop() for _ in range(len(queue))], [("c", 1), ("d", 4), ("b", 9)])
+        self.assertRaises(IndexError, queue.pop)
+        self.assertRaises(KeyError, queue.update, "zzz", 1)
+
+    def test_indexed_matches_a_dictionary(self):
+        queue = heap.Indexed(d=3)
+        expected = {}
+        for _ in range(2000):
+            item = random.randrange(100)
+            if random.random() < 0.6:
+                priority = random.randint(0, 1000)
+                queue.push(item, priority)
+                expected[item] = priority
+            elif expected:
+                item, priority = queue.pop()
+                self.assertEqual(priority, min(expected.values()))
+                self.assertEqual(expected.pop(item), priority)
+        self.assertEqual(len(queue), len(expected))
+
+    def test_merge_is_stable_and_lazy(self):
+        runs = [sorted((random.randint(0, 5), i) for _ in range(20)) for i in range(6)]
+        key = lambda record: record[0]
+        self.assertEqual(list(heap.merge(*runs, key=key)), list(heapq.merge(*runs, key=key)))
+        runs = [sorted(run, key=key, reverse=True) for run in runs]
+        self.assertEqual(
+            list(heap.merge(*runs, key=key, reverse=True)), list(heapq.merge(*runs, key=key, reverse=True))
+        )
+        self.assertEqual(list(heap.merge()), [])
+        self.assertEqual(next(heap.merge(iter([1, 3]), iter(range(2, 10**9)))), 1)
+
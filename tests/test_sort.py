@@ -1,7 +1,21 @@
+import asyncio
+import bisect
+import mmap
+import os
+import random
+import tempfile
+import time
 import unittest
+from array import array
+from unittest import mock
 
 from algopy import sort
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 
 class TestSortingAlgorithms(unittest.TestCase):
     def test_bubble_sort_sorts_correctly(self):
@@ -34,6 +48,24 @@ class TestSortingAlgorithms(unittest.TestCase):
         sorted_arr = sort.QuickSort.default(arr)
         self.assertEqual(sorted_arr, [])
 
+    def test_quick_sort_iterative_sorts_correctly(self):
+        arr = [3, 6, 8, 10, 1, 2, 1]
+        sorted_arr = sort.QuickSort.iterative(arr)
+        self.assertEqual(sorted_arr, [1, 1, 2, 3, 6, 8, 10])
+
+    def test_quick_sort_iterative_empty_list(self):
+        arr = []
+        sorted_arr = sort.QuickSort.iterative(arr)
+        self.assertEqual(sorted_arr, [])
+
+    def test_quick_sort_iterative_handles_adversarial_inputs(self):
+        for arr in (list(range(50000)), list(range(50000, 0, -1)), [7] * 50000):
+            self.assertEqual(sort.QuickSort.iterative(arr[:]), sorted(arr))
+
+    def test_quick_sort_iterative_random_with_duplicates(self):
+        arr = [random.randint(0, 100) for _ in range(5000)]
+        self.assertEqual(sort.QuickSort.iterative(arr[:]), sorted(arr))
+
     def test_merge_sort_sorts_correctly(self):
         arr = [3, 6, 8, 10, 1, 2, 1]
         sorted_arr = sort.MergeSort.default(arr)
@@ -44,6 +76,24 @@ class TestSortingAlgorithms(unittest.TestCase):
         sorted_arr = sort.MergeSort.default(arr)
         self.assertEqual(sorted_arr, [])
 
+    def test_merge_sort_bottom_up_sorts_correctly(self):
+        arr = [3, 6, 8, 10, 1, 2, 1]
+        sorted_arr = sort.MergeSort.bottom_up(arr)
+        self.assertEqual(sorted_arr, [1, 1, 2, 3, 6, 8, 10])
+
+    def test_merge_sort_bottom_up_empty_list(self):
+        arr = []
+        sorted_arr = sort.MergeSort.bottom_up(arr)
+        self.assertEqual(sorted_arr, [])
+
+    def test_merge_sort_bottom_up_handles_runs(self):
+        arr = list(range(500)) + list(range(1000, 500, -1)) + [random.randint(0, 99) for _ in range(500)]
+        self.assertEqual(sort.MergeSort.bottom_up(arr[:]), sorted(arr))
+
+    def test_merge_sort_way3_sorts_correctly(self):
+        for arr in ([2, 1], [3, 6, 8, 10, 1, 2, 1], [random.randint(0, 9) for _ in range(300)]):
+            self.assertEqual(sort.MergeSort.way3(arr[:]), sorted(arr))
+
     def test_bogo_sort_sorts_correctly(self):
         arr = [3, 6, 8, 10, 1, 2, 1]
         sorted_arr = sort.BogoSort.default(arr)
@@ -94,6 +144,23 @@ class TestSortingAlgorithms(unittest.TestCase):
         sorted_arr = sort.radix_sort(arr)
         self.assertEqual(sorted_arr, [])
 
+    def test_radix_sort_handles_negative_and_wide_values(self):
+        for digit_bits in (8, 16):
+            arr = [random.randint(-2**63, 2**63 - 1) for _ in range(1000)] + [0, -1, 1]
+            self.assertEqual(sort.radix_sort(arr[:], digit_bits), sorted(arr))
+
+    def test_radix_sort_sorts_typed_buffers_in_place(self):
+        arr = array("q", [3, -6, 8, 10, -1, 2, 1])
+        sort.radix_sort(arr)
+        self.assertEqual(arr.tolist(), [-6, -1, 1, 2, 3, 8, 10])
+        view = memoryview(array("i", [3, -6, 8]))
+        sort.radix_sort(view)
+        self.assertEqual(view.tolist(), [-6, 3, 8])
+
+    def test_radix_sort_rejects_invalid_digit_bits(self):
+        with self.assertRaises(ValueError):
+            sort.radix_sort([2, 1], digit_bits=4)
+
     def test_counting_sort_sorts_correctly(self):
         arr = [3, 6, 8, 10, 1, 2, 1]
         sorted_arr = sort.counting_sort(arr)
@@ -104,6 +171,18 @@ class TestSortingAlgorithms(unittest.TestCase):
         sorted_arr = sort.counting_sort(arr)
         self.assertEqual(sorted_arr, [])
 
+    def test_counting_sort_negative_and_outlier_values(self):
+        arr = [3, -2, 10**12, -2, 0, 7]
+        self.assertEqual(sort.counting_sort(arr[:]), sorted(arr))
+        arr = [random.randint(-10**15, 10**15) for _ in range(200)]
+        self.assertEqual(sort.counting_sort(arr[:]), sorted(arr))
+
+    def test_counting_sort_memory_budget_falls_back(self):
+        arr = [random.choice([5, -1, 2**70]) for _ in range(50)]
+        self.assertEqual(sort.counting_sort(arr[:], max_memory=0), sorted(arr))
+        self.assertEqual(sort.counting_sort([3, 1, 2], max_memory=0), [1, 2, 3])
+        self.assertRaises(ValueError, sort.counting_sort, [1], max_memory=-1)
+
     def test_bucket_sort_sorts_correctly(self):
         arr = [3, 6, 8, 10, 1, 2, 1]
         sorted_arr = sort.bucket_sort(arr)
@@ -114,6 +193,23 @@ class TestSortingAlgorithms(unittest.TestCase):
         sorted_arr = sort.bucket_sort(arr)
         self.assertEqual(sorted_arr, [])
 
+    def test_bucket_sort_skewed_floats(self):
+        arr = [random.paretovariate(0.5) for _ in range(3000)]
+        self.assertEqual(sort.bucket_sort(arr), sorted(arr))
+
+    def test_sample_sort_sorts_in_place(self):
+        arr = [random.choice([0, 0, 0, 1, random.randint(-10**6, 10**6)]) for _ in range(5000)]
+        expected = sorted(arr)
+        self.assertIs(sort.sample_sort(arr), arr)
+        self.assertEqual(arr, expected)
+
+    def test_sample_sort_parallel_with_named_algorithm(self):
+        arr = [random.expovariate(1) ** 4 for _ in range(5000)]
+        self.assertEqual(sort.sample_sort(arr[:], workers=2, algorithm="heap_sort"), sorted(arr))
+
+    def test_sample_sort_invalid_buckets(self):
+        self.assertRaises(ValueError, sort.sample_sort, [1, 2], buckets=0)
+
     def test_shell_sort_sorts_correctly(self):
         arr = [3, 6, 8, 10, 1, 2, 1]
         sorted_arr = sort.shell_sort(arr)
@@ -214,6 +310,47 @@ class TestSortingAlgorithms(unittest.TestCase):
         sorted_arr = sort.tim_sort(arr)
         self.assertEqual(sorted_arr, [])
 
+    def test_tim_sort_reports_runs_and_merges_them(self):
+        runs = []
+        arr = list(range(100)) + list(range(50, 0, -1)) + [random.randint(100, 200) for _ in range(300)]
+        expected = sorted(arr)
+        self.assertIs(sort.tim_sort(arr, on_run=lambda *run: runs.append(run)), arr)
+        self.assertEqual(arr, expected)
+        self.assertEqual(runs[:2], [(0, 100, False), (100, 50, True)])
+
+    def test_tim_sort_gallops_on_nearly_sorted_input(self):
+        arr = list(range(0, 20000, 2)) + list(range(1, 200, 2))
+        stats = sort.Stats(memory=False, depth=False)
+        self.assertEqual(stats.run(sort.tim_sort, arr[:]), sorted(arr))
+        self.assertLess(stats.comparisons, 2 * len(arr))
+
+    def test_tim_sort_small_min_run_and_buffers(self):
+        arr = [random.randint(0, 50) for _ in range(1000)]
+        self.assertEqual(sort.tim_sort(arr[:], min_run=1), sorted(arr))
+        buffer = array("q", arr)
+        sort.tim_sort(buffer)
+        self.assertEqual(buffer.tolist(), sorted(arr))
+        self.assertRaises(ValueError, sort.tim_sort, arr, min_run=0)
+
+    def test_tim_sort_key_and_reverse_on_buffers(self):
+        values = [3, 1, 2, -5, 7, 1]
+        buffer = array("i", values)
+        self.assertIs(sort.tim_sort(buffer, key=lambda x: -x), buffer)
+        self.assertEqual(buffer.tolist(), sorted(values, key=lambda x: -x))
+        buffer = array("i", values)
+        sort.tim_sort(buffer, reverse=True)
+        self.assertEqual(buffer.tolist(), sorted(values, reverse=True))
+
+        backing = array("q", values)
+        view = memoryview(backing)
+        sort.tim_sort(view, key=abs)
+        self.assertEqual(backing.tolist(), sorted(values, key=abs))
+        backing = array("q", values)
+        view = memoryview(backing)
+        sort.tim_sort(view, key=abs, reverse=True)
+        self.assertEqual(backing.tolist(), sorted(values, key=abs, reverse=True))
+        view.release()
+
     def test_block_sort_sorts_correctly(self):
         arr = [3, 6, 8, 10, 1, 2, 1]
         sorted_arr = sort.block_sort(arr)
@@ -224,6 +361,10 @@ class TestSortingAlgorithms(unittest.TestCase):
         sorted_arr = sort.block_sort(arr)
         self.assertEqual(sorted_arr, [])
 
+    def test_block_sort_negative_values(self):
+        arr = [5, -3, 0, -10, 7, 2, -3]
+        self.assertEqual(sort.block_sort(arr), sorted(arr))
+
     def test_tournament_sort_sorts_correctly(self):
         arr = [3, 6, 8, 10, 1, 2, 1]
         sorted_arr = sort.tournament_sort(arr)
@@ -264,6 +405,49 @@ class TestSortingAlgorithms(unittest.TestCase):
         sorted_arr = sort.sleep_sort(arr)
         self.assertEqual(sorted_arr, [])
 
+    def test_sleep_sort_scaled_on_one_event_loop(self):
+        arr = [random.randint(0, 500) for _ in range(3000)]
+        self.assertEqual(sort.sleep_sort(arr, scale=1e-4), sorted(arr))
+        arr = [random.random() for _ in range(500)]
+        self.assertEqual(sort.sleep_sort(arr, scale=0.01, resolution=0.002), sorted(arr))
+        self.assertEqual(asyncio.run(sort.sleep_sort_async([2, 1, 1.5], scale=0)), [1, 1.5, 2])
+        self.assertRaises(ValueError, sort.sleep_sort, [1, -1])
+
+    def test_timer_wheel_cascades_in_tick_order(self):
+        wheel = sort.TimerWheel(slots=4)
+        ticks = [random.randint(0, 1000) for _ in range(300)]
+        for tick in ticks:
+            wheel.schedule(tick, tick)
+        fired = []
+        while wheel:
+            now = wheel.now
+            due = wheel.advance()
+            self.assertTrue(all(tick == now for tick in due))
+            fired.extend(due)
+        self.assertEqual(fired, sorted(ticks))
+
+    def test_timer_wheel_jumps_to_the_next_due_tick(self):
+        wheel = sort.TimerWheel(slots=4)
+        self.assertIsNone(wheel.next_due())
+        ticks = [random.randint(0, 10**6) for _ in range(50)] + [3, 3]
+        for tick in ticks:
+            wheel.schedule(tick, tick)
+        fired, steps = [], 0
+        while wheel:
+            wheel.now = wheel.next_due()
+            now = wheel.now
+            due = wheel.advance()
+            self.assertTrue(all(tick == now for tick in due))
+            fired.extend(due)
+            steps += 1
+        self.assertEqual(fired, sorted(ticks))
+        self.assertLess(steps, 50 * 4 * 10)
+
+    def test_sleep_sort_skips_sparse_gaps(self):
+        start = time.perf_counter()
+        self.assertEqual(sort.sleep_sort([2_000_000, 0], scale=1e-7), [0, 2_000_000])
+        self.assertLess(time.perf_counter() - start, 0.6)
+
     def test_stupid_sort_sorts_correctly(self):
         arr = [3, 6, 8, 10, 1, 2, 1]
         sorted_arr = sort.stupid_sort(arr)
@@ -314,6 +498,10 @@ class TestSortingAlgorithms(unittest.TestCase):
         sorted_arr = sort.pigeonhole_sort(arr)
         self.assertEqual(sorted_arr, [])
 
+    def test_pigeonhole_sort_wide_range(self):
+        arr = [10**18, -10**18, 0, 42, 42]
+        self.assertEqual(sort.pigeonhole_sort(arr[:]), sorted(arr))
+
     def test_tag_sort_sorts_correctly(self):
         arr = [3, 6, 8, 10, 1, 2, 1]
         sorted_arr, original_indices = sort.tag_sort(arr)
@@ -344,6 +532,24 @@ class TestsortingString(unittest.TestCase):
         sorted_arr = sort.String.alphabetically(arr)
         self.assertEqual(sorted_arr, [])
 
+    def test_alphabetically_natural_and_casefold(self):
+        arr = ["file10", "File2", "file1"]
+        self.assertEqual(sort.String.alphabetically(arr, natural=True), ["File2", "file1", "file10"])
+        self.assertEqual(sort.String.alphabetically(arr, natural=True, casefold=True), ["file1", "File2", "file10"])
+        self.assertEqual(sort.String.alphabetically(["b", "A", "a"], casefold=True), ["A", "a", "b"])
+        self.assertEqual(sort.String.natural_key("v1.10"), ("v", 1, ".", 10, ""))
+
+    def test_msd_radix_and_multikey_quicksort(self):
+        prefixes = ["https://example.com/", "https://example.org/a/", "/usr/lib/"]
+        arr = [random.choice(prefixes) + "".join(random.choices("abZé/1", k=random.randint(0, 8))) for _ in range(2000)]
+        expected = sorted(arr)
+        for func in (sort.String.msd_radix, sort.String.multikey_quicksort):
+            with self.subTest(func=func.__name__):
+                work = arr[:]
+                self.assertIs(func(work), work)
+                self.assertEqual(work, expected)
+                self.assertEqual(func([]), [])
+
     # Empty Splits
     def test_split_empty(self):
         arr = []
@@ -441,3 +647,425 @@ class TestsortingString(unittest.TestCase):
             arr, reverse=True, sort_integers=False, sort_strings=False
         )
         self.assertEqual(sorted_arr, ([2, 3, 1], ["cherry", "apple", "banana"]))
+
+
+class TestSortAuto(unittest.TestCase):
+    def test_auto_sorts_correctly(self):
+        arr = [random.randint(-10**9, 10**9) for _ in range(2000)]
+        expected = sorted(arr)
+        self.assertEqual(sort.auto(arr), expected)
+
+    def test_auto_empty_list(self):
+        self.assertEqual(sort.auto([]), [])
+
+    def test_auto_reports_plan(self):
+        plans = []
+        sort.auto([3, 6, 8, 10, 1, 2, 1], on_plan=plans.append)
+        self.assertEqual(plans[0]["algorithm"], "insertion_sort")
+
+    def test_plan_picks_pigeonhole_for_narrow_integers(self):
+        arr = [random.randint(-50, 50) for _ in range(1000)]
+        self.assertEqual(sort.plan(arr)["algorithm"], "pigeonhole_sort")
+
+    def test_plan_detects_sorted_and_reversed(self):
+        self.assertEqual(sort.plan(list(range(1000)))["algorithm"], "none")
+        self.assertEqual(sort.plan(list(range(1000, 0, -1)))["algorithm"], "reverse")
+        self.assertEqual(sort.auto(list(range(1000, 0, -1))), list(range(1, 1001)))
+
+    def test_auto_sorts_strings(self):
+        arr = [str(random.random()) for _ in range(500)]
+        self.assertEqual(sort.auto(arr[:]), sorted(arr))
+
+
+class TestSortParallel(unittest.TestCase):
+    def test_parallel_sorts_integers(self):
+        arr = [random.randint(-10**12, 10**12) for _ in range(10000)]
+        expected = sorted(arr)
+        self.assertEqual(sort.parallel(arr, workers=2, min_size=100), expected)
+
+    def test_parallel_sorts_floats_with_named_algorithm(self):
+        arr = [random.random() for _ in range(10000)]
+        expected = sorted(arr)
+        self.assertEqual(sort.parallel(arr, workers=3, min_size=100, algorithm="heap_sort"), expected)
+
+    def test_parallel_failures_keep_the_original_error(self):
+        arr = list(range(300, 0, -1))
+        with self.assertRaises(AttributeError):
+            sort.parallel(arr[:], workers=2, min_size=10, algorithm="no_such_sort")
+        with mock.patch("algopy.sort.merge", side_effect=RuntimeError("merge failed")):
+            with self.assertRaisesRegex(RuntimeError, "merge failed"):
+                sort.parallel(arr[:], workers=2, min_size=10)
+
+    def test_parallel_small_or_mixed_lists_fall_back(self):
+        self.assertEqual(sort.parallel([3, 1, 2]), [1, 2, 3])
+        self.assertEqual(sort.parallel([3, 1.5, 2] * 100, workers=2, min_size=10), sorted([3, 1.5, 2] * 100))
+
+    def test_parallel_empty_list(self):
+        self.assertEqual(sort.parallel([]), [])
+
+
+@unittest.skipUnless(np, "NumPy is not installed")
+class TestSortNumpy(unittest.TestCase):
+    def test_integer_sorts_keep_ndarray_in_place(self):
+        data = np.random.default_rng(0).integers(-10**9, 10**9, 5000)
+        for func in (sort.counting_sort, sort.pigeonhole_sort, sort.radix_sort):
+            arr = np.random.default_rng(0).integers(-1000, 1000, 5000) if func is not sort.radix_sort else data.copy()
+            expected = np.sort(arr)
+            self.assertIs(func(arr), arr)
+            self.assertTrue((arr == expected).all())
+
+    def test_counting_sorts_narrow_and_unsigned_dtypes(self):
+        arr = np.array([-100, 100, 2] * 100, dtype=np.int8)
+        expected = np.sort(arr)
+        self.assertTrue((sort.counting_sort(arr) == expected).all())
+        self.assertEqual(arr.dtype, np.int8)
+        arr = np.array([2 ** 64 - 1, 2 ** 63 + 5, 2 ** 64 - 3, 2 ** 63 + 5], dtype=np.uint64)
+        self.assertEqual(sort.pigeonhole_sort(arr).tolist(), [2 ** 63 + 5, 2 ** 63 + 5, 2 ** 64 - 3, 2 ** 64 - 1])
+
+    def test_radix_sorts_uint64_above_the_signed_range(self):
+        values = [2 ** 63 + 5, 3, 2 ** 64 - 1, 2 ** 63 - 1, 0]
+        for func in (sort.radix_sort, sort.counting_sort):
+            arr = np.array(values, dtype=np.uint64)
+            self.assertEqual(func(arr).tolist(), sorted(values))
+        arr = np.random.default_rng(2).integers(0, 2 ** 64 - 1, 2000, dtype=np.uint64, endpoint=True)
+        expected = np.sort(arr)
+        self.assertTrue((sort.radix_sort(arr, digit_bits=16) == expected).all())
+        arr = np.array([-5, 7, -128, 127, 0] * 60, dtype=np.int8)
+        self.assertTrue((sort.radix_sort(arr) == np.sort(arr)).all())
+
+    def test_long_int_lists_use_the_numpy_path(self):
+        arr = [random.randint(-2**63, 2**63 - 1) for _ in range(1000)]
+        self.assertEqual(sort.radix_sort(arr[:]), sorted(arr))
+        arr = [random.randint(-500, 500) for _ in range(1000)]
+        self.assertEqual(sort.counting_sort(arr[:]), sorted(arr))
+        self.assertEqual(sort.bucket_sort(arr), sorted(arr))
+
+    def test_bucket_and_tag_sort_floats(self):
+        arr = np.random.default_rng(1).random(3000)
+        self.assertTrue((sort.bucket_sort(arr) == np.sort(arr)).all())
+        values, indices = sort.tag_sort(arr)
+        self.assertTrue((values == np.sort(arr)).all())
+        self.assertTrue((arr[indices] == values).all())
+
+    def test_bucket_sort_skewed_ndarray(self):
+        rng = np.random.default_rng(4)
+        arr = np.concatenate([rng.zipf(1.5, 4000) % 1000, np.full(1000, 7), rng.integers(-50, 0, 500)])
+        self.assertTrue((sort.bucket_sort(arr) == np.sort(arr)).all())
+
+    def test_overflowing_lists_fall_back(self):
+        arr = [random.randint(0, 2**70) for _ in range(300)]
+        self.assertEqual(sort.bucket_sort(arr), sorted(arr))
+        self.assertRaises(OverflowError, sort.radix_sort, arr)
+
+
+class TestSortExternal(unittest.TestCase):
+    def test_external_sorts_iterable_across_runs(self):
+        arr = [random.randint(0, 10**6) for _ in range(5000)]
+        self.assertEqual(list(sort.external(iter(arr), chunk_size=100, fan_in=4)), sorted(arr))
+
+    def test_external_sorts_in_memory_when_one_chunk(self):
+        arr = [3, 6, 8, 10, 1, 2, 1]
+        self.assertEqual(list(sort.external(arr)), [1, 1, 2, 3, 6, 8, 10])
+
+    def test_external_empty_input(self):
+        self.assertEqual(list(sort.external([])), [])
+
+    def test_external_sorts_file_to_file(self):
+        words = [str(random.random()) for _ in range(1000)]
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, "in.txt")
+            output = os.path.join(directory, "out.txt")
+            with open(source, "w", encoding="utf-8") as file:
+                file.write("\n".join(words) + "\n")
+            self.assertEqual(sort.external(source, output, chunk_size=64), output)
+            with open(output, encoding="utf-8") as file:
+                self.assertEqual(file.read().splitlines(), sorted(words))
+
+    def test_external_rejects_invalid_chunk_size(self):
+        with self.assertRaises(ValueError):
+            sort.external([1, 2], chunk_size=0)
+
+
+class _Record:
+    def __init__(self, score, tag):
+        self.score = score
+        self.tag = tag
+
+    def __lt__(self, other):
+        return self.score < other.score
+
+    def __gt__(self, other):
+        return self.score > other.score
+
+    def __le__(self, other):
+        return self.score <= other.score
+
+    def __ge__(self, other):
+        return self.score >= other.score
+
+
+class TestSortKeys(unittest.TestCase):
+    KEYED = (
+        sort.QuickSort.default,
+        sort.QuickSort.iterative,
+        sort.MergeSort.default,
+        sort.MergeSort.way3,
+        sort.MergeSort.bottom_up,
+        sort.selection_sort,
+        sort.insertion_sort,
+        sort.heap_sort,
+        sort.shell_sort,
+        sort.intro_sort,
+        sort.tim_sort,
+        sort.auto,
+    )
+    STABLE = (
+        sort.MergeSort.default,
+        sort.MergeSort.way3,
+        sort.MergeSort.bottom_up,
+        sort.insertion_sort,
+        sort.tim_sort,
+    )
+
+    def setUp(self):
+        self.records = [{"id": i, "score": random.randint(0, 20)} for i in range(400)]
+
+    def test_key_sorts_records_stably(self):
+        expected = sorted(self.records, key=lambda r: r["score"])
+        for algorithm in self.KEYED:
+            with self.subTest(algorithm=algorithm.__qualname__):
+                self.assertEqual(algorithm(self.records[:], key=lambda r: r["score"]), expected)
+
+    def test_reverse_sorts_records_stably(self):
+        expected = sorted(self.records, key=lambda r: r["score"], reverse=True)
+        for algorithm in self.KEYED:
+            with self.subTest(algorithm=algorithm.__qualname__):
+                self.assertEqual(algorithm(self.records[:], key=lambda r: r["score"], reverse=True), expected)
+
+    def test_key_is_computed_once_per_element(self):
+        calls = []
+
+        def score(record):
+            calls.append(record["id"])
+            return record["score"]
+
+        sort.heap_sort(self.records[:], key=score)
+        self.assertEqual(len(calls), len(self.records))
+
+    def test_stable_algorithms_keep_order_of_equal_elements(self):
+        arr = [_Record(random.randint(0, 5), i) for i in range(200)]
+        expected = [r.tag for r in sorted(arr, key=lambda r: r.score)]
+        for algorithm in self.STABLE:
+            with self.subTest(algorithm=algorithm.__qualname__):
+                self.assertEqual([r.tag for r in algorithm(arr[:])], expected)
+
+    def test_external_accepts_key_and_reverse(self):
+        expected = sorted(self.records, key=lambda r: r["score"], reverse=True)
+        result = sort.external(iter(self.records), chunk_size=50, key=lambda r: r["score"], reverse=True)
+        self.assertEqual(list(result), expected)
+
+
+class TestSortSelection(unittest.TestCase):
+    def test_select_finds_kth_smallest(self):
+        arr = [random.randint(0, 1000) for _ in range(3000)]
+        expected = sorted(arr)
+        for k in (0, 1, 1500, 2999):
+            work = arr[:]
+            self.assertEqual(sort.select(work, k), expected[k])
+            self.assertTrue(all(x <= work[k] for x in work[:k]))
+            self.assertTrue(all(x >= work[k] for x in work[k + 1:]))
+
+    def test_select_handles_sorted_and_equal_inputs(self):
+        self.assertEqual(sort.select(list(range(10000)), 1234), 1234)
+        self.assertEqual(sort.select([5] * 10000, 9999), 5)
+
+    def test_select_rejects_out_of_range(self):
+        with self.assertRaises(IndexError):
+            sort.select([1, 2, 3], 3)
+
+    def test_partial_sorts_k_smallest(self):
+        arr = [random.randint(-500, 500) for _ in range(2000)]
+        result = sort.partial(arr[:], 100)
+        self.assertEqual(result[:100], sorted(arr)[:100])
+        self.assertEqual(sorted(result), sorted(arr))
+
+    def test_partial_edge_cases(self):
+        self.assertEqual(sort.partial([], 3), [])
+        self.assertEqual(sort.partial([3, 1, 2], 5), [1, 2, 3])
+        self.assertEqual(sort.partial([3, 1, 2], 0), [3, 1, 2])
+
+    def test_top_k_streams_iterators(self):
+        scores = [random.random() for _ in range(5000)]
+        self.assertEqual(sort.top_k(iter(scores), 10), sorted(scores, reverse=True)[:10])
+        self.assertEqual(sort.top_k(iter(scores), 10, largest=False), sorted(scores)[:10])
+        self.assertEqual(sort.top_k(["bb", "a", "ccc"], 1, key=len), ["ccc"])
+
+
+class TestSortStats(unittest.TestCase):
+    def test_run_counts_comparisons_and_writes(self):
+        arr = [3, 6, 8, 10, 1, 2, 1]
+        stats = sort.Stats()
+        result = stats.run(sort.insertion_sort, arr)
+        self.assertEqual(result, [1, 1, 2, 3, 6, 8, 10])
+        self.assertEqual(arr, [1, 1, 2, 3, 6, 8, 10])
+        self.assertGreater(stats.comparisons, 0)
+        self.assertGreater(stats.writes, 0)
+        self.assertIsNotNone(stats.memory)
+        self.assertGreater(stats.seconds, 0)
+
+    def test_run_reports_recursion_depth(self):
+        shallow, deep = sort.Stats(), sort.Stats()
+        shallow.run(sort.QuickSort.iterative, list(range(200)))
+        deep.run(sort.QuickSort.default, list(range(200)))
+        self.assertGreater(deep.max_depth, 100)
+        self.assertLess(shallow.max_depth, 10)
+
+    def test_run_falls_back_for_arithmetic_sorts(self):
+        stats = sort.Stats()
+        self.assertEqual(stats.run(sort.counting_sort, [3, 1, 2]), [1, 2, 3])
+        self.assertIsNone(stats.comparisons)
+
+    def test_run_only_falls_back_when_tracking_fails(self):
+        def broken(arr):
+            raise TypeError("broken algorithm")
+
+        with self.assertRaisesRegex(TypeError, "broken algorithm"):
+            sort.Stats().run(broken, [3, 1, 2])
+
+        def slow_arithmetic(arr):
+            time.sleep(0.2)
+            return sorted(x + 0 for x in arr)
+
+        stats = sort.Stats(memory=False, depth=False)
+        self.assertEqual(stats.run(slow_arithmetic, [3, 1, 2]), [1, 2, 3])
+        self.assertIsNone(stats.comparisons)
+        self.assertLess(stats.seconds, 0.35)
+
+    def test_context_manager_with_track(self):
+        stats = sort.Stats(memory=False, depth=False)
+        with stats:
+            tracked = sort.heap_sort(stats.track([5, 4, 3, 2, 1]))
+        self.assertEqual(stats.untrack(tracked), [1, 2, 3, 4, 5])
+        self.assertEqual(stats.as_dict()["comparisons"], stats.comparisons)
+        self.assertIsNone(stats.memory)
+
+
+class TestSortedList(unittest.TestCase):
+    def test_add_remove_and_index_match_a_sorted_list(self):
+        values = sort.SortedList(load=4)
+        expected = []
+        for _ in range(500):
+            value = random.randint(0, 100)
+            values.add(value)
+            expected.append(value)
+        expected.sort()
+        for value in expected[::3]:
+            values.remove(value)
+        for value in expected[::3]:
+            expected.remove(value)
+        self.assertEqual(list(values), expected)
+        self.assertEqual(len(values), len(expected))
+        self.assertEqual([values[i] for i in range(len(values))], expected)
+        self.assertEqual(values[-1], expected[-1])
+        self.assertEqual(values.bisect_left(50), bisect.bisect_left(expected, 50))
+        self.assertEqual(values.bisect_right(50), bisect.bisect_right(expected, 50))
+
+    def test_add_many_and_irange(self):
+        values = sort.SortedList([5, 1, 3])
+        values.add_many([4, 2, 6, 0])
+        self.assertEqual(list(values), [0, 1, 2, 3, 4, 5, 6])
+        self.assertEqual(list(values.irange(2, 5)), [2, 3, 4, 5])
+        self.assertEqual(list(values.irange(2, 5, inclusive=(False, False))), [3, 4])
+        self.assertEqual(list(values.irange(maximum=1)), [0, 1])
+
+    def test_pop_discard_and_errors(self):
+        values = sort.SortedList([3, 1, 2, 2], load=1)
+        self.assertEqual(values.pop(), 3)
+        self.assertEqual(values.pop(0), 1)
+        values.discard(42)
+        self.assertEqual(values.count(2), 2)
+        self.assertIn(2, values)
+        self.assertEqual(values.index(2), 0)
+        self.assertRaises(ValueError, values.remove, 42)
+        self.assertRaises(IndexError, values.__getitem__, 5)
+        self.assertRaises(ValueError, sort.SortedList, load=0)
+
+
+class TestSortInPlace(unittest.TestCase):
+    def test_algorithms_sort_typed_buffers_in_place(self):
+        values = [random.randint(-2**31, 2**31 - 1) for _ in range(500)]
+        for func in (sort.InPlace.quick, sort.InPlace.heap, sort.InPlace.shell,
+                     sort.InPlace.insertion, sort.InPlace.radix):
+            with self.subTest(func=func.__name__):
+                buffer = array("i", values)
+                view = memoryview(buffer)
+                self.assertIs(func(view), view)
+                self.assertEqual(buffer.tolist(), sorted(values))
+
+    def test_radix_sorts_bytearray_and_unsigned(self):
+        data = bytearray(os.urandom(2000))
+        expected = sorted(data)
+        sort.InPlace.radix(data)
+        self.assertEqual(list(data), expected)
+        values = array("Q", [random.getrandbits(64) for _ in range(300)])
+        self.assertEqual(sort.InPlace.radix(values).tolist(), sorted(values))
+        self.assertRaises(TypeError, sort.InPlace.radix, array("d", [1.0, 0.5] * 20))
+
+    def test_records_in_a_memory_mapped_file(self):
+        records = [os.urandom(12) for _ in range(1000)]
+        with tempfile.TemporaryFile() as file:
+            file.write(b"".join(records))
+            file.flush()
+            with mmap.mmap(file.fileno(), 0) as mapped:
+                for func in (sort.InPlace.quick, sort.InPlace.radix):
+                    mapped[:] = b"".join(records)
+                    with sort.Records(mapped, width=12, key_size=4) as view:
+                        func(view)
+                        keys = [view[i][:4] for i in range(len(view))]
+                    self.assertEqual(keys, sorted(record[:4] for record in records))
+                    self.assertEqual(sorted(mapped[i:i + 12] for i in range(0, 12000, 12)), sorted(records))
+
+    def test_records_validation_and_key(self):
+        self.assertRaises(ValueError, sort.Records, bytearray(10), width=3)
+        self.assertRaises(ValueError, sort.Records, bytearray(12), width=4, key_offset=2, key_size=3)
+        self.assertEqual(sort.InPlace.quick(["b", "A", "a"], key=str.lower), ["A", "a", "b"])
+
+
+class TestSortBounded(unittest.TestCase):
+    def test_comparison_budget_reports_progress(self):
+        arr = list(range(10, 0, -1))
+        with self.assertRaises(sort.Timeout) as caught:
+            sort.bounded("BogoSort.default", arr, max_comparisons=500)
+        timeout = caught.exception
+        self.assertEqual(timeout.reason, "comparisons")
+        self.assertEqual(timeout.comparisons, 501)
+        self.assertEqual(timeout.total_inversions, 45)
+        self.assertEqual(sorted(timeout.partial), sorted(arr))
+        self.assertIsNotNone(timeout.progress)
+        self.assertEqual(arr, list(range(10, 0, -1)))
+        self.assertIsInstance(timeout, TimeoutError)
+
+    def test_time_and_depth_limits(self):
+        with self.assertRaises(sort.Timeout) as caught:
+            sort.bounded("slow_sort", list(range(100, 0, -1)), max_seconds=0.1)
+        self.assertEqual(caught.exception.reason, "seconds")
+        with self.assertRaises(sort.Timeout) as caught:
+            sort.bounded("stooge_sort", list(range(100, 0, -1)), max_depth=5)
+        self.assertEqual(caught.exception.reason, "depth")
+
+    def test_finishing_within_limits(self):
+        arr = [3, 1, 2]
+        self.assertEqual(sort.bounded("BogoSort.duo", arr, max_seconds=5), [1, 2, 3])
+        self.assertEqual(arr, [1, 2, 3])
+        self.assertEqual(sort.inversions([3, 1, 2]), 2)
+
+    def test_subprocess_mode(self):
+        arr = [5, 4, 3]
+        self.assertEqual(sort.bounded("stooge_sort", arr, max_seconds=5, subprocess=True), [3, 4, 5])
+        self.assertEqual(arr, [3, 4, 5])
+        with self.assertRaises(sort.Timeout) as caught:
+            sort.bounded("BogoSort.default", list(range(12, 0, -1)), max_seconds=0.2, subprocess=True)
+        self.assertEqual(caught.exception.reason, "seconds")
+        with self.assertRaises(sort.Timeout) as caught:
+            sort.bounded("sleep_sort", [10], max_seconds=0.1, subprocess=True, grace=0.1)
+        self.assertEqual(caught.exception.reason, "killed")